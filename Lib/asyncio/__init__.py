@@ -16,6 +16,7 @@ from .queues import *
 from .streams import *
 from .subprocess import *
 from .tasks import *
+from .taskgroups import *
 from .transports import *
 
 __all__ = (base_events.__all__ +
@@ -29,6 +30,7 @@ __all__ = (base_events.__all__ +
            streams.__all__ +
            subprocess.__all__ +
            tasks.__all__ +
+           taskgroups.__all__ +
            transports.__all__)
 
 if sys.platform == 'win32':  # pragma: no cover
@@ -37,3 +39,11 @@ if sys.platform == 'win32':  # pragma: no cover
 else:
     from .unix_events import *  # pragma: no cover
     __all__ += unix_events.__all__
+    if sys.platform.startswith('linux'):
+        try:
+            from .uring_events import *
+        except ImportError:
+            # The kernel headers or the kernel are too old for io_uring
+            pass
+        else:
+            __all__ += uring_events.__all__
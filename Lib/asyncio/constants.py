@@ -1,3 +1,5 @@
+import enum
+
 # After the connection is lost, log warnings after this many write()s.
 LOG_THRESHOLD_FOR_CONNLOST_WRITES = 5
 
@@ -8,3 +10,15 @@ ACCEPT_RETRY_DELAY = 1
 # The larger the number, the slower the operation in debug mode
 # (see extract_stack() in format_helpers.py).
 DEBUG_STACK_DEPTH = 10
+
+# Size of the buffer used by the read()/write() fallback of loop.sendfile()
+# and loop.sock_sendfile().
+SENDFILE_FALLBACK_READBUFFER_SIZE = 1024 * 256
+
+
+# The enum should be here to break circular dependencies between
+# base_events and sslproto
+class _SendfileMode(enum.Enum):
+    UNSUPPORTED = enum.auto()
+    TRY_NATIVE = enum.auto()
+    FALLBACK = enum.auto()
@@ -9,6 +9,8 @@ __all__ = (
     'get_child_watcher', 'set_child_watcher',
     '_set_running_loop', 'get_running_loop',
     '_get_running_loop',
+    'SendfileNotAvailableError',
+    'EventLoopInstrument', 'EventLoopStats',
 )
 
 import os
@@ -21,6 +23,14 @@ from . import constants
 from . import format_helpers
 
 
+class SendfileNotAvailableError(RuntimeError):
+    """Sendfile syscall is not available.
+
+    Raised if OS does not support sendfile syscall for given socket or
+    file type.
+    """
+
+
 class Handle:
     """Object returned by callback registration methods."""
 
@@ -145,6 +155,101 @@ class TimerHandle(Handle):
         super().cancel()
 
 
+class EventLoopInstrument:
+    """Base class for event loop instruments.
+
+    An instrument is registered with AbstractEventLoop.add_instrument()
+    and is notified about the activity of the event loop.  All methods
+    are called from the thread running the loop and do nothing by
+    default; subclasses override the ones they are interested in.
+
+    Durations are in seconds, as measured by the loop's time() method.
+    Instruments run inline with the event loop, so they should be cheap.
+    """
+
+    def loop_started(self, loop):
+        """Called when run_forever() starts running the loop."""
+
+    def loop_stopped(self, loop):
+        """Called when run_forever() stops running the loop."""
+
+    def select_started(self, loop, timeout):
+        """Called before polling for I/O events.
+
+        timeout is the poll timeout, or None if the poll may block
+        forever.
+        """
+
+    def select_finished(self, loop, duration, nevents):
+        """Called after polling for I/O events.
+
+        duration is the time spent waiting and nevents the number of
+        I/O events returned.
+        """
+
+    def callbacks_started(self, loop, ntodo):
+        """Called before running the ready callbacks.
+
+        ntodo is the depth of the ready queue for this iteration.
+        """
+
+    def callback_finished(self, loop, handle, duration):
+        """Called after running the callback of a handle."""
+
+    def callbacks_finished(self, loop, duration):
+        """Called after running all ready callbacks of an iteration."""
+
+
+class EventLoopStats(EventLoopInstrument):
+    """Instrument keeping cumulative counters about an event loop.
+
+    Attributes:
+
+    - iterations: number of loop iterations
+    - select_time: total time spent polling for I/O events
+    - callback_time: total time spent running callbacks
+    - callbacks: number of callbacks run
+    - ready: depth of the ready queue in the last iteration
+    - max_ready: maximum depth of the ready queue
+    - max_callback_time: duration of the slowest callback
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__} iterations={self.iterations} '
+                f'callbacks={self.callbacks} '
+                f'select_time={self.select_time:.3f} '
+                f'callback_time={self.callback_time:.3f} '
+                f'max_ready={self.max_ready}>')
+
+    def reset(self):
+        """Reset all counters to zero."""
+        self.iterations = 0
+        self.select_time = 0.0
+        self.callback_time = 0.0
+        self.callbacks = 0
+        self.ready = 0
+        self.max_ready = 0
+        self.max_callback_time = 0.0
+
+    def select_finished(self, loop, duration, nevents):
+        self.iterations += 1
+        self.select_time += duration
+
+    def callbacks_started(self, loop, ntodo):
+        self.ready = ntodo
+        if ntodo > self.max_ready:
+            self.max_ready = ntodo
+
+    def callback_finished(self, loop, handle, duration):
+        self.callbacks += 1
+        self.callback_time += duration
+        if duration > self.max_callback_time:
+            self.max_callback_time = duration
+
+
 class AbstractServer:
     """Abstract server returned by create_server()."""
 
@@ -358,6 +463,24 @@ class AbstractEventLoop:
         """
         raise NotImplementedError
 
+    async def sendfile(self, transport, file, offset=0, count=None,
+                       *, fallback=True):
+        """Send a file through a transport.
+
+        Return an amount of sent bytes.
+        """
+        raise NotImplementedError
+
+    async def start_tls(self, transport, protocol, sslcontext, *,
+                        server_side=False,
+                        server_hostname=None):
+        """Upgrade a transport to TLS.
+
+        Return a new transport that *protocol* should start using
+        immediately.
+        """
+        raise NotImplementedError
+
     # Pipes and subprocesses.
 
     async def connect_read_pipe(self, protocol_factory, pipe):
@@ -434,6 +557,10 @@ class AbstractEventLoop:
     async def sock_accept(self, sock):
         raise NotImplementedError
 
+    async def sock_sendfile(self, sock, file, offset=0, count=None,
+                            *, fallback=None):
+        raise NotImplementedError
+
     # Signal handling.
 
     def add_signal_handler(self, sig, callback, *args):
@@ -472,6 +599,14 @@ class AbstractEventLoop:
     def set_debug(self, enabled):
         raise NotImplementedError
 
+    # Instrumentation.
+
+    def add_instrument(self, instrument):
+        raise NotImplementedError
+
+    def remove_instrument(self, instrument):
+        raise NotImplementedError
+
 
 class AbstractEventLoopPolicy:
     """Abstract policy for accessing the event loop."""
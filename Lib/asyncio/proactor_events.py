@@ -1,17 +1,19 @@
 """Event loop using a proactor and related classes.
 
-A proactor is a "notify-on-completion" multiplexer.  Currently a
-proactor is only implemented on Windows with IOCP.
+A proactor is a "notify-on-completion" multiplexer.  A proactor is
+implemented on Windows with IOCP and on Linux with io_uring.
 """
 
 __all__ = 'BaseProactorEventLoop',
 
+import errno
 import socket
 import warnings
 
 from . import base_events
 from . import constants
 from . import futures
+from . import protocols
 from . import sslproto
 from . import transports
 from .log import logger
@@ -127,7 +129,12 @@ class _ProactorBasePipeTransport(transports._FlowControlMixin,
             # just close our end.  First calling shutdown() seems to
             # cure it, but maybe using DisconnectEx() would be better.
             if hasattr(self._sock, 'shutdown'):
-                self._sock.shutdown(socket.SHUT_RDWR)
+                try:
+                    self._sock.shutdown(socket.SHUT_RDWR)
+                except OSError as exc:
+                    # On Unix, fails if the peer already reset the connection
+                    if exc.errno != errno.ENOTCONN:
+                        raise
             self._sock.close()
             self._sock = None
             server = self._server
@@ -152,6 +159,9 @@ class _ProactorReadPipeTransport(_ProactorBasePipeTransport,
         self._paused = False
         self._loop.call_soon(self._loop_reading)
 
+    def is_reading(self):
+        return not self._paused and not self._closing
+
     def pause_reading(self):
         if self._closing:
             raise RuntimeError('Cannot pause_reading() when closing')
@@ -167,7 +177,10 @@ class _ProactorReadPipeTransport(_ProactorBasePipeTransport,
         self._paused = False
         if self._closing:
             return
-        self._loop.call_soon(self._loop_reading, self._read_fut)
+        # If the read is still pending, _loop_reading() is already
+        # registered as its done callback.
+        if self._read_fut is None or self._read_fut.done():
+            self._loop.call_soon(self._loop_reading, self._read_fut)
         if self._loop.get_debug():
             logger.debug("%r resumes reading", self)
 
@@ -211,7 +224,12 @@ class _ProactorReadPipeTransport(_ProactorBasePipeTransport,
             self._read_fut.add_done_callback(self._loop_reading)
         finally:
             if data:
-                self._protocol.data_received(data)
+                if (isinstance(self._protocol, protocols.BufferedProtocol) and
+                        not isinstance(self._protocol, protocols.Protocol)):
+                    protocols._feed_data_to_buffered_proto(
+                        self._protocol, data)
+                else:
+                    self._protocol.data_received(data)
             elif data is not None:
                 if self._loop.get_debug():
                     logger.debug("%r received EOF", self)
@@ -344,6 +362,9 @@ class _ProactorSocketTransport(_ProactorReadPipeTransport,
                                transports.Transport):
     """Transport for connected sockets."""
 
+    _start_tls_compatible = True
+    _sendfile_compatible = constants._SendfileMode.FALLBACK
+
     def _set_extra(self, sock):
         self._extra['socket'] = sock
 
@@ -9,6 +9,7 @@ __all__ = 'BaseSelectorEventLoop',
 import collections
 import errno
 import functools
+import itertools
 import selectors
 import socket
 import warnings
@@ -22,6 +23,7 @@ from . import base_events
 from . import constants
 from . import events
 from . import futures
+from . import protocols
 from . import transports
 from . import sslproto
 from .log import logger
@@ -546,6 +548,20 @@ class BaseSelectorEventLoop(base_events.BaseEventLoop):
         self._remove_reader(sock.fileno())
         sock.close()
 
+    async def _sendfile_native(self, transp, file, offset, count):
+        del self._transports[transp._sock_fd]
+        resume_reading = transp.is_reading()
+        transp.pause_reading()
+        await transp._make_empty_waiter()
+        try:
+            return await self.sock_sendfile(transp._sock, file, offset, count,
+                                            fallback=False)
+        finally:
+            transp._reset_empty_waiter()
+            if resume_reading:
+                transp.resume_reading()
+            self._transports[transp._sock_fd] = transp
+
 
 class _SelectorTransport(transports._FlowControlMixin,
                          transports.Transport):
@@ -570,8 +586,8 @@ class _SelectorTransport(transports._FlowControlMixin,
                 self._extra['peername'] = None
         self._sock = sock
         self._sock_fd = sock.fileno()
-        self._protocol = protocol
         self._protocol_connected = True
+        self.set_protocol(protocol)
         self._server = server
         self._buffer = self._buffer_factory()
         self._conn_lost = 0  # Set when call to connection_lost scheduled.
@@ -682,11 +698,16 @@ class _SelectorTransport(transports._FlowControlMixin,
 
 class _SelectorSocketTransport(_SelectorTransport):
 
+    _start_tls_compatible = True
+    _sendfile_compatible = constants._SendfileMode.TRY_NATIVE
+
     def __init__(self, loop, sock, protocol, waiter=None,
                  extra=None, server=None):
+        self._read_ready_cb = None
         super().__init__(loop, sock, protocol, extra, server)
         self._eof = False
         self._paused = False
+        self._empty_waiter = None
 
         # Disable the Nagle algorithm -- small writes will be
         # sent without waiting for the TCP ACK.  This generally
@@ -702,6 +723,9 @@ class _SelectorSocketTransport(_SelectorTransport):
             self._loop.call_soon(futures._set_result_unless_cancelled,
                                  waiter, None)
 
+    def is_reading(self):
+        return not self._paused and not self._closing
+
     def pause_reading(self):
         if self._closing:
             raise RuntimeError('Cannot pause_reading() when closing')
@@ -722,29 +746,77 @@ class _SelectorSocketTransport(_SelectorTransport):
         if self._loop.get_debug():
             logger.debug("%r resumes reading", self)
 
+    def set_protocol(self, protocol):
+        if isinstance(protocol, protocols.BufferedProtocol):
+            self._read_ready_cb = self._read_ready__get_buffer
+        else:
+            self._read_ready_cb = self._read_ready__data_received
+
+        super().set_protocol(protocol)
+
     def _read_ready(self):
+        self._read_ready_cb()
+
+    def _read_ready__get_buffer(self):
+        if self._conn_lost:
+            return
+
+        try:
+            buf = self._protocol.get_buffer(-1)
+            if not len(buf):
+                raise RuntimeError('get_buffer() returned an empty buffer')
+        except Exception as exc:
+            self._fatal_error(
+                exc, 'Fatal error: protocol.get_buffer() call failed.')
+            return
+
+        try:
+            nbytes = self._sock.recv_into(buf)
+        except (BlockingIOError, InterruptedError):
+            return
+        except Exception as exc:
+            self._fatal_error(exc, 'Fatal read error on socket transport')
+            return
+
+        if not nbytes:
+            self._read_ready__on_eof()
+            return
+
+        try:
+            self._protocol.buffer_updated(nbytes)
+        except Exception as exc:
+            self._fatal_error(
+                exc, 'Fatal error: protocol.buffer_updated() call failed.')
+
+    def _read_ready__data_received(self):
         if self._conn_lost:
             return
         try:
             data = self._sock.recv(self.max_size)
         except (BlockingIOError, InterruptedError):
-            pass
+            return
         except Exception as exc:
             self._fatal_error(exc, 'Fatal read error on socket transport')
+            return
+
+        if not data:
+            self._read_ready__on_eof()
+            return
+
+        self._protocol.data_received(data)
+
+    def _read_ready__on_eof(self):
+        if self._loop.get_debug():
+            logger.debug("%r received EOF", self)
+
+        keep_open = self._protocol.eof_received()
+        if keep_open:
+            # We're keeping the connection open so the
+            # protocol can write more, but we still can't
+            # receive more, so remove the reader callback.
+            self._loop._remove_reader(self._sock_fd)
         else:
-            if data:
-                self._protocol.data_received(data)
-            else:
-                if self._loop.get_debug():
-                    logger.debug("%r received EOF", self)
-                keep_open = self._protocol.eof_received()
-                if keep_open:
-                    # We're keeping the connection open so the
-                    # protocol can write more, but we still can't
-                    # receive more, so remove the reader callback.
-                    self._loop._remove_reader(self._sock_fd)
-                else:
-                    self.close()
+            self.close()
 
     def write(self, data):
         if not isinstance(data, (bytes, bytearray, memoryview)):
@@ -752,6 +824,8 @@ class _SelectorSocketTransport(_SelectorTransport):
                             f'not {type(data).__name__!r}')
         if self._eof:
             raise RuntimeError('Cannot call write() after write_eof()')
+        if self._empty_waiter is not None:
+            raise RuntimeError('unable to write; sendfile is in progress')
         if not data:
             return
 
@@ -794,12 +868,16 @@ class _SelectorSocketTransport(_SelectorTransport):
             self._loop._remove_writer(self._sock_fd)
             self._buffer.clear()
             self._fatal_error(exc, 'Fatal write error on socket transport')
+            if self._empty_waiter is not None:
+                self._empty_waiter.set_exception(exc)
         else:
             if n:
                 del self._buffer[:n]
             self._maybe_resume_protocol()  # May append to buffer.
             if not self._buffer:
                 self._loop._remove_writer(self._sock_fd)
+                if self._empty_waiter is not None:
+                    self._empty_waiter.set_result(None)
                 if self._closing:
                     self._call_connection_lost(None)
                 elif self._eof:
@@ -815,15 +893,45 @@ class _SelectorSocketTransport(_SelectorTransport):
     def can_write_eof(self):
         return True
 
+    def _call_connection_lost(self, exc):
+        super()._call_connection_lost(exc)
+        if self._empty_waiter is not None:
+            self._empty_waiter.set_exception(
+                ConnectionError("Connection is closed by peer"))
+
+    def _make_empty_waiter(self):
+        if self._empty_waiter is not None:
+            raise RuntimeError("Empty waiter is already set")
+        self._empty_waiter = self._loop.create_future()
+        if not self._buffer:
+            self._empty_waiter.set_result(None)
+        return self._empty_waiter
+
+    def _reset_empty_waiter(self):
+        self._empty_waiter = None
+
 
 class _SelectorDatagramTransport(_SelectorTransport):
 
     _buffer_factory = collections.deque
 
+    # Maximum number of datagrams received or sent by a single call to
+    # recvmmsg() or sendmmsg(), and buffer size of each received datagram.
+    _batch_size = 32
+    _datagram_size = 64 * 1024
+
     def __init__(self, loop, sock, protocol, address=None,
                  waiter=None, extra=None):
         super().__init__(loop, sock, protocol, extra)
         self._address = address
+        # Batch system calls for UDP sockets: a datagram larger than
+        # _datagram_size cannot be received there.
+        self._batched = (hasattr(socket.socket, 'recvmmsg') and
+                         hasattr(socket.socket, 'sendmmsg') and
+                         sock.family in (socket.AF_INET, socket.AF_INET6))
+        # Set while received datagrams are delivered to the protocol: the
+        # datagrams sent in the meantime are buffered and sent together.
+        self._corked = False
         self._loop.call_soon(self._protocol.connection_made, self)
         # only start reading when connection_made() has been called
         self._loop.call_soon(self._loop._add_reader,
@@ -839,6 +947,9 @@ class _SelectorDatagramTransport(_SelectorTransport):
     def _read_ready(self):
         if self._conn_lost:
             return
+        if self._batched:
+            self._read_ready_batched()
+            return
         try:
             data, addr = self._sock.recvfrom(self.max_size)
         except (BlockingIOError, InterruptedError):
@@ -850,6 +961,34 @@ class _SelectorDatagramTransport(_SelectorTransport):
         else:
             self._protocol.datagram_received(data, addr)
 
+    def _read_ready_batched(self):
+        try:
+            datagrams = self._sock.recvmmsg(self._batch_size,
+                                            self._datagram_size)
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError as exc:
+            self._protocol.error_received(exc)
+        except Exception as exc:
+            self._fatal_error(exc, 'Fatal read error on datagram transport')
+        else:
+            self._corked = True
+            try:
+                for data, addr in datagrams:
+                    if self._conn_lost or self._closing:
+                        break
+                    self._protocol.datagram_received(data, addr)
+            finally:
+                self._corked = False
+                if self._buffer and not self._conn_lost:
+                    if not self._closing:
+                        self._sendto_ready()
+                    if self._buffer:
+                        # A closing transport is finished by _sendto_ready()
+                        # once the buffer has been flushed.
+                        self._loop._add_writer(self._sock_fd,
+                                               self._sendto_ready)
+
     def sendto(self, data, addr=None):
         if not isinstance(data, (bytes, bytearray, memoryview)):
             raise TypeError(f'data argument must be a bytes-like object, '
@@ -867,7 +1006,7 @@ class _SelectorDatagramTransport(_SelectorTransport):
             self._conn_lost += 1
             return
 
-        if not self._buffer:
+        if not self._buffer and not self._corked:
             # Attempt to send it right away first.
             try:
                 if self._address:
@@ -891,6 +1030,22 @@ class _SelectorDatagramTransport(_SelectorTransport):
 
     def _sendto_ready(self):
         while self._buffer:
+            if self._batched and len(self._buffer) > 1:
+                try:
+                    self._sendmmsg()
+                except (BlockingIOError, InterruptedError):
+                    break  # Try again later.
+                except OSError as exc:
+                    # sendmmsg() only fails if the first datagram could not
+                    # be sent.
+                    self._buffer.popleft()
+                    self._protocol.error_received(exc)
+                    return
+                except Exception as exc:
+                    self._fatal_error(
+                        exc, 'Fatal write error on datagram transport')
+                    return
+                continue
             data, addr = self._buffer.popleft()
             try:
                 if self._address:
@@ -913,3 +1068,12 @@ class _SelectorDatagramTransport(_SelectorTransport):
             self._loop._remove_writer(self._sock_fd)
             if self._closing:
                 self._call_connection_lost(None)
+
+    def _sendmmsg(self):
+        # Send the first datagrams of the buffer with a single system call.
+        datagrams = list(itertools.islice(self._buffer, self._batch_size))
+        if self._address:
+            datagrams = [(data, None) for data, _ in datagrams]
+        sent = self._sock.sendmmsg(datagrams)
+        for _ in range(sent):
+            self._buffer.popleft()
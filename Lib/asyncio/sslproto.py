@@ -6,6 +6,7 @@ except ImportError:  # pragma: no cover
     ssl = None
 
 from . import base_events
+from . import constants
 from . import protocols
 from . import transports
 from .log import logger
@@ -52,7 +53,8 @@ class _SSLPipe(object):
 
     max_size = 256 * 1024   # Buffer size passed to read()
 
-    def __init__(self, context, server_side, server_hostname=None):
+    def __init__(self, context, server_side, server_hostname=None,
+                 session=None):
         """
         The *context* argument specifies the ssl.SSLContext to use.
 
@@ -62,10 +64,13 @@ class _SSLPipe(object):
         The optional *server_hostname* argument can be used to specify the
         hostname you are connecting to. You may only specify this parameter if
         the _ssl module supports Server Name Indication (SNI).
+
+        The optional *session* argument is an ssl.SSLSession to resume.
         """
         self._context = context
         self._server_side = server_side
         self._server_hostname = server_hostname
+        self._session = session
         self._state = _UNWRAPPED
         self._incoming = ssl.MemoryBIO()
         self._outgoing = ssl.MemoryBIO()
@@ -116,7 +121,8 @@ class _SSLPipe(object):
         self._sslobj = self._context.wrap_bio(
             self._incoming, self._outgoing,
             server_side=self._server_side,
-            server_hostname=self._server_hostname)
+            server_hostname=self._server_hostname,
+            session=self._session)
         self._state = _DO_HANDSHAKE
         self._handshake_cb = callback
         ssldata, appdata = self.feed_ssldata(b'', only_handshake=True)
@@ -281,6 +287,8 @@ class _SSLPipe(object):
 class _SSLProtocolTransport(transports._FlowControlMixin,
                             transports.Transport):
 
+    _sendfile_compatible = constants._SendfileMode.FALLBACK
+
     def __init__(self, loop, ssl_protocol):
         self._loop = loop
         # SSLProtocol instance
@@ -292,7 +300,7 @@ class _SSLProtocolTransport(transports._FlowControlMixin,
         return self._ssl_protocol._get_extra_info(name, default)
 
     def set_protocol(self, protocol):
-        self._ssl_protocol._app_protocol = protocol
+        self._ssl_protocol._set_app_protocol(protocol)
 
     def get_protocol(self):
         return self._ssl_protocol._app_protocol
@@ -317,6 +325,12 @@ class _SSLProtocolTransport(transports._FlowControlMixin,
                           source=self)
             self.close()
 
+    def is_reading(self):
+        tr = self._ssl_protocol._transport
+        if tr is None:
+            raise RuntimeError('SSL transport has not been initialized yet')
+        return tr.is_reading()
+
     def pause_reading(self):
         """Pause the receiving end.
 
@@ -333,6 +347,11 @@ class _SSLProtocolTransport(transports._FlowControlMixin,
         """
         self._ssl_protocol._transport.resume_reading()
 
+    @property
+    def _protocol_paused(self):
+        # Required for sendfile fallback pause_writing/resume_writing logic
+        return self._ssl_protocol._transport._protocol_paused
+
     def set_write_buffer_limits(self, high=None, low=None):
         """Set the high- and low-water limits for write flow control.
 
@@ -418,7 +437,7 @@ class SSLProtocol(protocols.Protocol):
 
         self._waiter = waiter
         self._loop = loop
-        self._app_protocol = app_protocol
+        self._set_app_protocol(app_protocol)
         self._app_transport = _SSLProtocolTransport(self._loop, self)
         # _SSLPipe instance (None until the connection is made)
         self._sslpipe = None
@@ -428,6 +447,16 @@ class SSLProtocol(protocols.Protocol):
         # transport, ex: SelectorSocketTransport
         self._transport = None
         self._call_connection_made = call_connection_made
+        # (server_hostname, port) of the session in the session cache
+        self._session_key = None
+
+    def _set_app_protocol(self, app_protocol):
+        self._app_protocol = app_protocol
+        # The data is received as bytes objects: protocols implementing
+        # both interfaces get it without a copy through data_received().
+        self._app_protocol_is_buffer = (
+            isinstance(app_protocol, protocols.BufferedProtocol) and
+            not isinstance(app_protocol, protocols.Protocol))
 
     def _wakeup_waiter(self, exc=None):
         if self._waiter is None:
@@ -445,11 +474,31 @@ class SSLProtocol(protocols.Protocol):
         Start the SSL handshake.
         """
         self._transport = transport
+        session = None
+        cache = getattr(self._sslcontext, 'session_cache', None)
+        if cache is not None and self._server_hostname:
+            peername = transport.get_extra_info('peername')
+            port = peername[1] if isinstance(peername, tuple) else None
+            self._session_key = (self._server_hostname, port)
+            session = cache.get(*self._session_key)
         self._sslpipe = _SSLPipe(self._sslcontext,
                                  self._server_side,
-                                 self._server_hostname)
+                                 self._server_hostname,
+                                 session)
         self._start_handshake()
 
+    def _save_session(self):
+        # Store the session to resume it in later connections.  With TLS
+        # 1.3, the session tickets are received after the handshake: this is
+        # also done when the connection is closed.
+        if (self._session_key is None or not self._session_established or
+                self._sslpipe is None):
+            return
+        sslobj = self._sslpipe.ssl_object
+        if sslobj is not None:
+            self._sslcontext.session_cache.put(*self._session_key,
+                                               sslobj.session)
+
     def connection_lost(self, exc):
         """Called when the low-level connection is lost or closed.
 
@@ -458,6 +507,7 @@ class SSLProtocol(protocols.Protocol):
         aborted or closed).
         """
         if self._session_established:
+            self._save_session()
             self._session_established = False
             self._loop.call_soon(self._app_protocol.connection_lost, exc)
         self._transport = None
@@ -495,7 +545,11 @@ class SSLProtocol(protocols.Protocol):
 
         for chunk in appdata:
             if chunk:
-                self._app_protocol.data_received(chunk)
+                if self._app_protocol_is_buffer:
+                    protocols._feed_data_to_buffered_proto(
+                        self._app_protocol, chunk)
+                else:
+                    self._app_protocol.data_received(chunk)
             else:
                 self._start_shutdown()
                 break
@@ -536,6 +590,7 @@ class SSLProtocol(protocols.Protocol):
         if self._in_handshake:
             self._abort()
         else:
+            self._save_session()
             self._in_shutdown = True
             self._write_appdata(b'')
 
@@ -601,6 +656,8 @@ class SSLProtocol(protocols.Protocol):
             self._app_protocol.connection_made(self._app_transport)
         self._wakeup_waiter()
         self._session_established = True
+        if not sslobj.session_reused:
+            self._save_session()
         # In case transport.write() was already called. Don't call
         # immediately _process_write_backlog(), but schedule it:
         # _on_handshake_complete() can be called indirectly from
@@ -668,6 +725,7 @@ class SSLProtocol(protocols.Protocol):
             self._transport._force_close(exc)
 
     def _finalize(self):
+        self._save_session()
         self._sslpipe = None
 
         if self._transport is not None:
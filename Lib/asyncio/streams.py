@@ -5,6 +5,7 @@ __all__ = (
 )
 
 import socket
+import threading
 
 if hasattr(socket, 'AF_UNIX'):
     __all__ += ('open_unix_connection', 'start_unix_server')
@@ -18,6 +19,15 @@ from .tasks import sleep
 
 _DEFAULT_LIMIT = 2 ** 16
 
+# Size of the buffer the transports read into on behalf of
+# StreamReaderProtocol.
+_READ_BUFFER_SIZE = 256 * 1024
+
+# The data read into the buffer is moved to the StreamReader as soon as
+# buffer_updated() is called, so a single buffer per thread can be shared by
+# all the streams of an event loop.
+_read_buffers = threading.local()
+
 
 class IncompleteReadError(EOFError):
     """
@@ -209,13 +219,18 @@ class FlowControlMixin(protocols.Protocol):
         await waiter
 
 
-class StreamReaderProtocol(FlowControlMixin, protocols.Protocol):
+class StreamReaderProtocol(FlowControlMixin, protocols.Protocol,
+                           protocols.BufferedProtocol):
     """Helper class to adapt between Protocol and StreamReader.
 
     (This is a helper class instead of making StreamReader itself a
     Protocol subclass, because the StreamReader has other potential
     uses, and to prevent the user of the StreamReader to accidentally
     call inappropriate methods of the protocol.)
+
+    Transports supporting BufferedProtocol receive directly into a
+    buffer reused from one read to the next, instead of allocating a
+    new bytes object for each read; the others call data_received().
     """
 
     def __init__(self, stream_reader, client_connected_cb=None, loop=None):
@@ -224,6 +239,12 @@ class StreamReaderProtocol(FlowControlMixin, protocols.Protocol):
         self._stream_writer = None
         self._client_connected_cb = client_connected_cb
         self._over_ssl = False
+        # The data read into the buffer goes straight to the StreamReader,
+        # unless data_received() or feed_data() were overridden.
+        self._feed_reader_buffer = (
+            type(self).data_received is StreamReaderProtocol.data_received and
+            getattr(type(stream_reader), 'feed_data', None) is
+            StreamReader.feed_data)
 
     def connection_made(self, transport):
         self._stream_reader.set_transport(transport)
@@ -250,6 +271,22 @@ class StreamReaderProtocol(FlowControlMixin, protocols.Protocol):
     def data_received(self, data):
         self._stream_reader.feed_data(data)
 
+    def get_buffer(self, sizehint):
+        try:
+            return _read_buffers.buffer
+        except AttributeError:
+            buf = _read_buffers.buffer = bytearray(_READ_BUFFER_SIZE)
+            return buf
+
+    def buffer_updated(self, nbytes):
+        buf = _read_buffers.buffer
+        if not self._feed_reader_buffer:
+            self.data_received(bytes(memoryview(buf)[:nbytes]))
+        elif self._stream_reader._feed_buffer(buf, nbytes):
+            # The reader took the buffer over, allocate a new one for the
+            # next read.
+            del _read_buffers.buffer
+
     def eof_received(self):
         self._stream_reader.feed_eof()
         if self._over_ssl:
@@ -329,6 +366,17 @@ class StreamWriter:
                 await sleep(0, loop=self._loop)
         await self._protocol._drain_helper()
 
+    async def sendfile(self, file, offset=0, count=None, *, fallback=True):
+        """Send a file over the stream using loop.sendfile().
+
+        The write buffer is flushed first, then the file contents are
+        handed to the transport, using os.sendfile() when the transport
+        supports it.  Return the total number of bytes which were sent.
+        """
+        await self.drain()
+        return await self._loop.sendfile(self._transport, file,
+                                         offset, count, fallback=fallback)
+
 
 class StreamReader:
 
@@ -414,7 +462,30 @@ class StreamReader:
 
         self._buffer.extend(data)
         self._wakeup_waiter()
+        self._maybe_pause_transport()
+
+    def _feed_buffer(self, buf, nbytes):
+        """Feed the first nbytes of the bytearray buf.
+
+        If nothing is buffered and buf is mostly filled, buf becomes the
+        buffer of the stream rather than being copied, and True is returned.
+        """
+        assert not self._eof, 'feed_data after feed_eof'
+
+        if not nbytes:
+            return False
+
+        taken = not self._buffer and nbytes > len(buf) // 2
+        if taken:
+            del buf[nbytes:]
+            self._buffer = buf
+        else:
+            self._buffer.extend(memoryview(buf)[:nbytes])
+        self._wakeup_waiter()
+        self._maybe_pause_transport()
+        return taken
 
+    def _maybe_pause_transport(self):
         if (self._transport is not None and
                 not self._paused and
                 len(self._buffer) > 2 * self._limit):
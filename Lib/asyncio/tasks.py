@@ -3,12 +3,13 @@
 __all__ = (
     'Task', 'create_task',
     'FIRST_COMPLETED', 'FIRST_EXCEPTION', 'ALL_COMPLETED',
-    'wait', 'wait_for', 'as_completed', 'sleep',
+    'wait', 'wait_for', 'as_completed', 'imap', 'sleep',
     'gather', 'shield', 'ensure_future', 'run_coroutine_threadsafe',
     'current_task', 'all_tasks',
     '_register_task', '_unregister_task', '_enter_task', '_leave_task',
 )
 
+import collections
 import concurrent.futures
 import functools
 import inspect
@@ -94,6 +95,7 @@ class Task(futures.Future):
         self._must_cancel = False
         self._fut_waiter = None
         self._coro = coro
+        self._num_cancels_requested = 0
 
         self._loop.call_soon(self._step)
         _register_task(self._loop, self)
@@ -169,6 +171,7 @@ class Task(futures.Future):
         self._log_traceback = False
         if self.done():
             return False
+        self._num_cancels_requested += 1
         if self._fut_waiter is not None:
             if self._fut_waiter.cancel():
                 # Leave self._fut_waiter; it may be a Task that
@@ -179,6 +182,26 @@ class Task(futures.Future):
         self._must_cancel = True
         return True
 
+    def cancelling(self):
+        """Return the count of the task's cancellation requests.
+
+        This count is incremented when .cancel() is called
+        and may be decremented using .uncancel().
+        """
+        return self._num_cancels_requested
+
+    def uncancel(self):
+        """Decrement the task's count of cancellation requests.
+
+        This should be called by the party that called `cancel()` on the task
+        beforehand.
+
+        Returns the remaining number of cancellation requests.
+        """
+        if self._num_cancels_requested > 0:
+            self._num_cancels_requested -= 1
+        return self._num_cancels_requested
+
     def _step(self, exc=None):
         assert not self.done(), f'_step(): already done: {self!r}, {exc!r}'
         if self._must_cancel:
@@ -489,6 +512,124 @@ def as_completed(fs, *, loop=None, timeout=None):
         yield _wait_for_one()
 
 
+async def imap(func, iterable, *, limit, ordered=True, loop=None):
+    """Apply an asynchronous function to every item of an iterable.
+
+    This is an asynchronous generator yielding the results of
+    func(item) for each item of iterable, which may be a regular or an
+    asynchronous iterable.  func must return an awaitable (coroutine,
+    Future, ...); for example, to run a blocking function in a thread
+    pool:
+
+        async for result in imap(
+                lambda x: loop.run_in_executor(None, f, x), items,
+                limit=10):
+            ...
+
+    Items are pulled from the iterable lazily: at most *limit* calls are
+    running or have results waiting to be consumed at any time.  No more
+    items are pulled until the consumer asks for the next result, so a
+    slow consumer applies backpressure on the producer and memory use is
+    bounded however long the input is.
+
+    If ordered is true (the default), results are yielded in the order
+    of the input; otherwise, they are yielded as soon as they are ready.
+
+    If a call raises an exception, the calls still running are cancelled
+    and the exception is propagated to the consumer.  The calls still
+    running are cancelled as well if the generator is closed before
+    completion.
+    """
+    if limit < 1:
+        raise ValueError(f'limit must be a positive integer, got {limit!r}')
+    if loop is None:
+        loop = events.get_event_loop()
+
+    if hasattr(iterable, '__aiter__'):
+        aiterator = iterable.__aiter__()
+    else:
+        aiterator = None
+        iterator = iter(iterable)
+
+    # Tasks which results have not been yielded yet: the window.  In
+    # ordered mode, it is a deque in input order; otherwise a set.
+    window = collections.deque() if ordered else set()
+    # Unordered mode: tasks done but not consumed, in completion order.
+    completed = collections.deque()
+    # Ordered mode: done tasks that failed, to raise as soon as possible.
+    failed = []
+    waiter = None
+    exhausted = False
+
+    def _on_completion(task):
+        if ordered:
+            if not task.cancelled() and task.exception() is not None:
+                failed.append(task)
+        else:
+            completed.append(task)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def _wait_for_completion():
+        nonlocal waiter
+        waiter = loop.create_future()
+        try:
+            await waiter
+        finally:
+            waiter = None
+
+    try:
+        while True:
+            # Fill the window.
+            while not exhausted and len(window) < limit:
+                if aiterator is not None:
+                    try:
+                        item = await aiterator.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                else:
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                task = ensure_future(func(item), loop=loop)
+                task.add_done_callback(_on_completion)
+                if ordered:
+                    window.append(task)
+                else:
+                    window.add(task)
+
+            if not window:
+                return
+
+            if ordered:
+                head = window[0]
+                while not head.done() and not failed:
+                    await _wait_for_completion()
+                if failed:
+                    failed[0].result()  # Raise the exception.
+                window.popleft()
+                task = head
+            else:
+                while not completed:
+                    await _wait_for_completion()
+                task = completed.popleft()
+                window.discard(task)
+
+            yield task.result()  # May raise task.exception().
+    finally:
+        for task in window:
+            if task.done():
+                if not task.cancelled():
+                    # The consumer went away: don't log errors that
+                    # nobody will retrieve.
+                    task.exception()
+            else:
+                task.cancel()
+
+
 @types.coroutine
 def __sleep0():
     """Skip one event loop run cycle.
@@ -0,0 +1,395 @@
+"""Proactor event loop for Linux, using io_uring."""
+
+import _uring
+import errno
+import itertools
+import os
+import select
+import socket
+import weakref
+
+from . import futures
+from . import proactor_events
+from . import unix_events
+from .log import logger
+
+
+__all__ = (
+    'IoUringProactor', 'IoUringEventLoop', 'IoUringEventLoopPolicy',
+)
+
+
+# Returned by an operation callback which has submitted another operation
+# to complete the future, e.g. to send the rest of the data.
+_PENDING = object()
+
+
+class _UringFuture(futures.Future):
+    """Subclass of Future which represents an io_uring operation.
+
+    Cancelling it will also cancel the operation in the kernel.
+    """
+
+    def __init__(self, proactor, *, loop=None):
+        super().__init__(loop=loop)
+        if self._source_traceback:
+            del self._source_traceback[-1]
+        self._proactor = proactor
+        self._key = None
+
+    def _repr_info(self):
+        info = super()._repr_info()
+        if self._key is not None:
+            info.insert(1, f'key={self._key}')
+        return info
+
+    def _cancel_operation(self):
+        if self._key is None:
+            return
+        try:
+            self._proactor._cancel(self._key)
+        except OSError as exc:
+            context = {
+                'message': 'Cancelling an io_uring future failed',
+                'exception': exc,
+                'future': self,
+            }
+            if self._source_traceback:
+                context['source_traceback'] = self._source_traceback
+            self._loop.call_exception_handler(context)
+        self._key = None
+
+    def cancel(self):
+        if not self.done():
+            self._cancel_operation()
+        return super().cancel()
+
+
+class IoUringProactor:
+    """Proactor implementation using io_uring."""
+
+    def __init__(self, entries=256):
+        self._ring = None
+        self._loop = None
+        self._results = []
+        self._ring = _uring.Ring(entries)
+        self._keys = itertools.count(1)
+        self._cache = {}
+        self._stopped_serving = weakref.WeakSet()
+
+    def __repr__(self):
+        return ('<%s operation#=%s result#=%s>'
+                % (self.__class__.__name__, len(self._cache),
+                   len(self._results)))
+
+    def set_loop(self, loop):
+        self._loop = loop
+
+    def select(self, timeout=None):
+        if not self._results:
+            self._poll(timeout)
+        tmp = self._results
+        self._results = []
+        return tmp
+
+    def _result(self, value):
+        fut = self._loop.create_future()
+        fut.set_result(value)
+        return fut
+
+    def recv(self, conn, nbytes, flags=0):
+        fut = _UringFuture(self, loop=self._loop)
+        if isinstance(conn, socket.socket):
+            op, arg = self._ring.recv, flags
+        else:
+            op, arg = self._ring.read, -1
+
+        def finish_recv(res, data):
+            return data
+
+        return self._register(fut, conn, finish_recv,
+                              op, conn.fileno(), nbytes, arg,
+                              events=select.POLLIN)
+
+    def recv_into(self, conn, buf, flags=0):
+        fut = _UringFuture(self, loop=self._loop)
+        if isinstance(conn, socket.socket):
+            op, arg = self._ring.recv_into, flags
+        else:
+            op, arg = self._ring.readinto, -1
+
+        def finish_recv(res, data):
+            return res
+
+        return self._register(fut, conn, finish_recv,
+                              op, conn.fileno(), buf, arg,
+                              events=select.POLLIN)
+
+    def send(self, conn, buf, flags=0):
+        fut = _UringFuture(self, loop=self._loop)
+        if isinstance(conn, socket.socket):
+            op, arg = self._ring.send, flags
+        else:
+            op, arg = self._ring.write, -1
+        view = memoryview(buf).cast('B')
+        sent = 0
+
+        def finish_send(res, data):
+            # Like IOCP, complete the future only when all data was sent
+            nonlocal sent
+            sent += res
+            if res and sent < len(view):
+                self._register(fut, conn, finish_send,
+                               op, conn.fileno(), view[sent:], arg,
+                               events=select.POLLOUT)
+                return _PENDING
+            return sent
+
+        self._register(fut, conn, finish_send,
+                       op, conn.fileno(), view, arg,
+                       events=select.POLLOUT)
+        # Reads are submitted in batch when the loop polls for completions,
+        # but like with IOCP, written data must leave immediately.
+        self._ring.submit()
+        return fut
+
+    def read(self, file, nbytes, offset=None):
+        fut = _UringFuture(self, loop=self._loop)
+        fd = file if isinstance(file, int) else file.fileno()
+
+        def finish_read(res, data):
+            return data
+
+        return self._register(fut, file, finish_read,
+                              self._ring.read, fd, nbytes,
+                              -1 if offset is None else offset)
+
+    def write(self, file, buf, offset=None):
+        fut = _UringFuture(self, loop=self._loop)
+        fd = file if isinstance(file, int) else file.fileno()
+
+        def finish_write(res, data):
+            return res
+
+        self._register(fut, file, finish_write,
+                       self._ring.write, fd, buf,
+                       -1 if offset is None else offset)
+        self._ring.submit()
+        return fut
+
+    def accept(self, listener):
+        fut = _UringFuture(self, loop=self._loop)
+
+        def finish_accept(res, data):
+            conn = socket.socket(listener.family, listener.type,
+                                 listener.proto, fileno=res)
+            try:
+                conn.settimeout(listener.gettimeout())
+                return conn, conn.getpeername()
+            except OSError:
+                conn.close()
+                raise
+
+        return self._register(fut, listener, finish_accept,
+                              self._ring.accept, listener.fileno(),
+                              socket.SOCK_CLOEXEC,
+                              events=select.POLLIN)
+
+    def connect(self, conn, address):
+        # io_uring has a connect operation, but it needs the address as a
+        # sockaddr structure: start the connection with the socket module
+        # and wait until the socket is writable instead.
+        try:
+            conn.connect(address)
+        except (BlockingIOError, InterruptedError):
+            pass
+        else:
+            return self._result(conn)
+        fut = _UringFuture(self, loop=self._loop)
+
+        def finish_connect(res, data):
+            err = conn.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            if err != 0:
+                raise OSError(err, f'Connect call failed {address}')
+            return conn
+
+        return self._register(fut, conn, finish_connect,
+                              self._ring.poll, conn.fileno(), select.POLLOUT)
+
+    def wait_closed(self, pipe):
+        """Wait until the read end of the pipe is closed.
+
+        The result is b'', as if end of file was read.
+        """
+        fut = _UringFuture(self, loop=self._loop)
+
+        def finish_wait(res, data):
+            return b''
+
+        return self._register(fut, pipe, finish_wait,
+                              self._ring.poll, pipe.fileno(),
+                              select.POLLERR | select.POLLHUP)
+
+    def _register(self, fut, obj, callback, op, fd, *args, events=0):
+        # Submit an operation and return fut, which will be set with the
+        # value returned by callback(res, data) when the operation
+        # completes.  If the operation fails with EAGAIN, it is retried
+        # once fd is ready for the poll events.  Note that we only store
+        # obj to prevent it from being garbage collected too early.
+        key = next(self._keys)
+        op(key, fd, *args)
+        self._cache[key] = (fut, obj, callback, op, fd, args, events)
+        fut._key = key
+        return fut
+
+    def _cancel(self, key):
+        # The operation completes with ECANCELED, or with its result if it
+        # was too late to cancel it.
+        self._ring.cancel(next(self._keys), key)
+
+    def _retry(self, fut, obj, callback, op, fd, args, events):
+        def finish_poll(res, data):
+            self._register(fut, obj, callback, op, fd, *args, events=events)
+            return _PENDING
+
+        self._register(fut, obj, finish_poll, self._ring.poll, fd, events)
+
+    def _poll(self, timeout=None):
+        # Return True if operations completed before the timeout.
+        if timeout is not None and timeout < 0:
+            raise ValueError("negative timeout")
+
+        completed = False
+        for key, res, data in self._ring.wait(timeout):
+            completed = True
+            try:
+                f, obj, callback, op, fd, args, events = self._cache.pop(key)
+            except KeyError:
+                # Cancellation requests are not registered
+                continue
+            if f._key == key:
+                f._key = None
+
+            if obj in self._stopped_serving:
+                f.cancel()
+            # Don't call the callback if the future has been cancelled
+            if f.done():
+                if op == self._ring.accept and res >= 0:
+                    # Don't leak a connection accepted too late
+                    os.close(res)
+            elif res == -errno.EAGAIN and events:
+                # The kernel does not poll non-blocking files which do not
+                # support it, wait until the file is ready.
+                try:
+                    self._retry(f, obj, callback, op, fd, args, events)
+                except OSError as e:
+                    f.set_exception(e)
+                    self._results.append(f)
+            else:
+                try:
+                    if res < 0:
+                        raise OSError(-res, os.strerror(-res))
+                    value = callback(res, data)
+                except OSError as e:
+                    f.set_exception(e)
+                    self._results.append(f)
+                else:
+                    if value is not _PENDING:
+                        f.set_result(value)
+                        self._results.append(f)
+        return completed
+
+    def _stop_serving(self, obj):
+        # obj is a socket or pipe.  It will be closed in
+        # BaseProactorEventLoop._stop_serving() and its pending operations
+        # are cancelled.
+        self._stopped_serving.add(obj)
+
+    def close(self):
+        if self._ring is None:
+            return
+
+        # Cancel remaining registered operations.
+        for key, (fut, *_) in list(self._cache.items()):
+            if fut.done():
+                # The operation has already been cancelled
+                pass
+            else:
+                fut.cancel()
+
+        while self._cache:
+            if not self._poll(1):
+                logger.debug('taking long time to close proactor')
+
+        self._results = []
+        self._ring.close()
+        self._ring = None
+
+    def __del__(self):
+        self.close()
+
+
+class _IoUringWritePipeTransport(proactor_events._ProactorWritePipeTransport):
+
+    def __init__(self, *args, **kw):
+        # Unlike a Windows pipe handle, the write end of a Unix pipe cannot
+        # be read to learn that the pipe was closed: poll it instead.
+        proactor_events._ProactorBaseWritePipeTransport.__init__(
+            self, *args, **kw)
+        self._read_fut = self._loop._proactor.wait_closed(self._sock)
+        self._read_fut.add_done_callback(self._pipe_closed)
+
+
+class IoUringEventLoop(proactor_events.BaseProactorEventLoop):
+    """Proactor event loop using io_uring.  Linux only."""
+
+    def __init__(self, proactor=None):
+        if proactor is None:
+            proactor = IoUringProactor()
+        super().__init__(proactor)
+        self._signal_handlers = {}
+
+    def close(self):
+        super().close()
+        for sig in list(self._signal_handlers):
+            self.remove_signal_handler(sig)
+
+    # Signals, subprocesses and UNIX domain sockets are handled exactly as
+    # by the selector event loop, on top of the proactor primitives.
+    _process_self_data = unix_events._UnixSelectorEventLoop._process_self_data
+    add_signal_handler = unix_events._UnixSelectorEventLoop.add_signal_handler
+    _handle_signal = unix_events._UnixSelectorEventLoop._handle_signal
+    remove_signal_handler = \
+        unix_events._UnixSelectorEventLoop.remove_signal_handler
+    _check_signal = unix_events._UnixSelectorEventLoop._check_signal
+    _make_subprocess_transport = \
+        unix_events._UnixSelectorEventLoop._make_subprocess_transport
+    _child_watcher_callback = \
+        unix_events._UnixSelectorEventLoop._child_watcher_callback
+    create_unix_connection = \
+        unix_events._UnixSelectorEventLoop.create_unix_connection
+    create_unix_server = unix_events._UnixSelectorEventLoop.create_unix_server
+
+    def _loop_self_reading(self, f=None):
+        # Signal numbers are written to the self-pipe by the C signal
+        # handler, see signal.set_wakeup_fd().
+        if f is not None and not f.cancelled() and f.exception() is None:
+            self._process_self_data(f.result())
+        super()._loop_self_reading(f)
+
+    def _make_write_pipe_transport(self, sock, protocol, waiter=None,
+                                   extra=None):
+        return _IoUringWritePipeTransport(self,
+                                          sock, protocol, waiter, extra)
+
+    async def file_read(self, file, nbytes, offset=None):
+        return await self._proactor.read(file, nbytes, offset)
+
+    async def file_write(self, file, data, offset=None):
+        return await self._proactor.write(file, data, offset)
+
+
+class IoUringEventLoopPolicy(unix_events._UnixDefaultEventLoopPolicy):
+    """UNIX event loop policy creating IoUringEventLoop instances."""
+
+    _loop_factory = IoUringEventLoop
@@ -32,6 +32,7 @@ __version__ = "2.6"
 # =======
 
 from io import StringIO, BytesIO, TextIOWrapper
+from collections import deque
 from collections.abc import Mapping
 import sys
 import os
@@ -43,11 +44,11 @@ import html
 import locale
 import tempfile
 
-__all__ = ["MiniFieldStorage", "FieldStorage",
+__all__ = ["MiniFieldStorage", "FieldStorage", "MultipartParser",
            "parse", "parse_qs", "parse_qsl", "parse_multipart",
-           "parse_header", "test", "print_exception", "print_environ",
-           "print_form", "print_directory", "print_arguments",
-           "print_environ_usage", "escape"]
+           "iter_multipart", "parse_header", "test", "print_exception",
+           "print_environ", "print_form", "print_directory",
+           "print_arguments", "print_environ_usage", "escape"]
 
 # Logging support
 # ===============
@@ -254,6 +255,292 @@ def parse_header(line):
     return key, pdict
 
 
+# Multipart parsing
+# =================
+
+# MultipartParser states
+_PREAMBLE, _HEADERS, _BODY, _EPILOGUE = range(4)
+
+class MultipartParser:
+    """Incremental parser for multipart/* bodies.
+
+    Data is pushed to the parser with feed() in chunks of any size, and
+    the parsing events are retrieved with read_events().  The parser
+    looks for the boundary in large blocks of data, so it is suitable
+    for big binary uploads.
+
+    """
+
+    max_header_size = 64 * 1024  # Maximum size of the headers of a part
+
+    def __init__(self, boundary, encoding='utf-8', errors='replace'):
+        """Constructor.
+
+        boundary        : the boundary parameter of the Content-Type
+            header, as bytes or as a string
+
+        encoding, errors : the encoding and error handler used to decode
+            the headers of the parts
+
+        """
+        if isinstance(boundary, str):
+            boundary = boundary.encode('ascii')
+        if not valid_boundary(boundary):
+            raise ValueError('Invalid boundary in multipart form: %r'
+                             % (boundary,))
+        self.encoding = encoding
+        self.errors = errors
+        self.done = False
+        self._delimiter = b'\n--' + boundary
+        # The first delimiter may not be preceded by a line break
+        self._buffer = bytearray(b'\n')
+        self._state = _PREAMBLE
+        self._events = deque()
+        self._closed = False
+
+    def feed(self, data):
+        """Feed bytes to the parser."""
+        if self._closed:
+            raise ValueError('feed() called after close()')
+        if self._state != _EPILOGUE:
+            self._buffer += data
+            self._parse(False)
+
+    def close(self):
+        """Finish feeding data to the parser.
+
+        Raise ValueError if the closing delimiter was not found.  The
+        events of the data received so far are still available from
+        read_events(), a truncated part being ended.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._state == _EPILOGUE:
+            return
+        self._parse(True)
+        if self._state == _BODY and self._buffer:
+            self._events.append(('data', bytes(self._buffer)))
+        if self._state == _BODY:
+            self._events.append(('end', None))
+        self._buffer.clear()
+        raise ValueError('Incomplete multipart body')
+
+    def read_events(self):
+        """Return an iterator over the available (event, value) pairs.
+
+        The events are:
+        - ('headers', headers) when a part starts, where headers is an
+          email.message.Message instance
+        - ('data', data) for each chunk of the body of the part
+        - ('end', None) when the part is complete
+
+        Events are consumed from the internal event queue as they are
+        retrieved from the iterator.
+        """
+        events = self._events
+        while events:
+            yield events.popleft()
+
+    def _parse(self, eof):
+        while True:
+            if self._state == _HEADERS:
+                if not self._parse_headers():
+                    return
+            elif self._state != _EPILOGUE:
+                if not self._parse_body(eof):
+                    return
+            else:
+                return
+
+    def _parse_headers(self):
+        # Parse the headers of a part, return true if they are complete
+        buf = self._buffer
+        if buf.startswith(b'\n'):
+            end = 1
+        elif buf.startswith(b'\r\n'):
+            end = 2
+        else:
+            end = buf.find(b'\n\n')
+            if end >= 0:
+                end += 2
+            crlf_end = buf.find(b'\n\r\n')
+            if crlf_end >= 0 and (end < 0 or crlf_end + 3 < end):
+                end = crlf_end + 3
+        if end < 0:
+            if len(buf) > self.max_header_size:
+                raise ValueError('Multipart headers too long')
+            return False
+        parser = FeedParser()
+        parser.feed(buf[:end].decode(self.encoding, self.errors))
+        del buf[:end]
+        self._events.append(('headers', parser.close()))
+        self._state = _BODY
+        return True
+
+    def _parse_body(self, eof):
+        # Parse the body of a part, or the preamble, up to the next
+        # delimiter.  Return true if the delimiter was found.
+        buf = self._buffer
+        events = self._events
+        in_body = self._state == _BODY
+        start, end, final = self._find_delimiter(eof)
+        if end is None:
+            if start is None:
+                # Keep what could be the beginning of the delimiter
+                start = max(len(buf) - len(self._delimiter) - 1, 0)
+            if start:
+                if in_body:
+                    events.append(('data', bytes(buf[:start])))
+                del buf[:start]
+            return False
+        if in_body:
+            if start:
+                events.append(('data', bytes(buf[:start])))
+            events.append(('end', None))
+        if final:
+            # Ignore the epilogue
+            self.done = True
+            self._state = _EPILOGUE
+            buf.clear()
+        else:
+            del buf[:end]
+            self._state = _HEADERS
+        return True
+
+    def _find_delimiter(self, eof):
+        # Return (start, end, final) for the next delimiter line in the
+        # buffer, where start is the position of its line break.  end is
+        # None if more data is needed, start also if no delimiter was found.
+        buf = self._buffer
+        delimiter = self._delimiter
+        pos = 0
+        while True:
+            i = buf.find(delimiter, pos)
+            if i < 0:
+                return None, None, False
+            start = i - 1 if i and buf[i - 1] == 0x0d else i   # '\r'
+            j = i + len(delimiter)
+            if buf.startswith(b'--', j):
+                return start, j + 2, True
+            if not eof and buf[j:] == b'-':
+                return start, None, False
+            # The delimiter can be followed by whitespace only
+            nl = buf.find(b'\n', j)
+            end = len(buf) if nl < 0 else nl + 1
+            if buf[j:end].strip():
+                pos = i + 1
+            elif nl >= 0 or eof:
+                return start, end, False
+            else:
+                return start, None, False
+
+
+class _PartReader:
+    """Internal: file-like object reading the body of a multipart part.
+
+    The data is taken from the events of the MultipartParser of the
+    enclosing body, until the end of the part.
+    """
+
+    def __init__(self, events):
+        self._events = events
+        self._buffer = b''
+        self._eof = False
+
+    def _fill(self):
+        if not self._eof:
+            for event, value in self._events:
+                if event == 'data':
+                    return value
+                if event == 'end':
+                    break
+            self._eof = True
+        return b''
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            chunks = [self._buffer]
+            self._buffer = b''
+            while True:
+                data = self._fill()
+                if not data:
+                    return b''.join(chunks)
+                chunks.append(data)
+        if not self._buffer:
+            self._buffer = self._fill()
+        data = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return data
+
+    read1 = read
+
+    def readline(self, size=-1):
+        chunks = []
+        while size:
+            if not self._buffer:
+                self._buffer = self._fill()
+                if not self._buffer:
+                    break
+            end = self._buffer.find(b'\n') + 1
+            if end <= 0:
+                end = len(self._buffer)
+            if 0 < size < end:
+                end = size
+            chunks.append(self._buffer[:end])
+            self._buffer = self._buffer[end:]
+            if chunks[-1].endswith(b'\n'):
+                break
+            if size > 0:
+                size -= end
+        return b''.join(chunks)
+
+
+def iter_multipart(fp, boundary, length=-1, max_size=1024*1024,
+                   encoding='utf-8', errors='replace'):
+    """Iterate over the parts of a multipart body.
+
+    Arguments:
+    fp      : binary file to read the body from, like the wsgi.input
+        stream of a WSGI application
+    boundary: the boundary parameter of the Content-Type header
+    length  : maximum number of bytes to read from fp, usually the
+        Content-Length of the request; read until the end of the body
+        if negative
+    max_size: the body of a part is held in memory up to this number of
+        bytes, and stored in a temporary file above it
+    encoding, errors: used to decode the headers of the parts
+
+    Yield a (headers, file) pair for each part: headers is an
+    email.message.Message instance and file a tempfile.SpooledTemporaryFile
+    object positioned at the beginning of the body.
+
+    Raise ValueError if the body is incomplete.
+    """
+    parser = MultipartParser(boundary, encoding, errors)
+    while not parser.done:
+        if length < 0:
+            data = fp.read(1<<16)
+        elif length:
+            data = fp.read(min(length, 1<<16))
+            length -= len(data)
+        else:
+            data = b''
+        if data:
+            parser.feed(data)
+        else:
+            parser.close()
+        for event, value in parser.read_events():
+            if event == 'headers':
+                headers = value
+                file = tempfile.SpooledTemporaryFile(max_size)
+            elif event == 'data':
+                file.write(value)
+            else:
+                file.seek(0)
+                yield headers, file
+
+
 # Classes for field storage
 # =========================
 
@@ -617,46 +904,54 @@ class FieldStorage:
                 self.list.append(MiniFieldStorage(key, value))
 
         klass = self.FieldStorageClass or self.__class__
-        first_line = self.fp.readline() # bytes
-        if not isinstance(first_line, bytes):
-            raise ValueError("%s should return bytes, got %s" \
-                             % (self.fp, type(first_line).__name__))
-        self.bytes_read += len(first_line)
-
-        # Ensure that we consume the file until we've hit our inner boundary
-        while (first_line.strip() != (b"--" + self.innerboundary) and
-                first_line):
-            first_line = self.fp.readline()
-            self.bytes_read += len(first_line)
-
-        while True:
-            parser = FeedParser()
-            hdr_text = b""
-            while True:
-                data = self.fp.readline()
-                hdr_text += data
-                if not data.strip():
-                    break
-            if not hdr_text:
-                break
-            # parser takes strings, not bytes
-            self.bytes_read += len(hdr_text)
-            parser.feed(hdr_text.decode(self.encoding, self.errors))
-            headers = parser.close()
-
+        parser = MultipartParser(ib, self.encoding, self.errors)
+        events = self.read_multi_events(parser)
+        # The events of a part are its headers, then the events read by
+        # the part itself from a _PartReader
+        for event, headers in events:
             # Some clients add Content-Length for part headers, ignore them
             if 'content-length' in headers:
                 del headers['content-length']
 
-            part = klass(self.fp, headers, ib, environ, keep_blank_values,
-                         strict_parsing,self.limit-self.bytes_read,
-                         self.encoding, self.errors)
-            self.bytes_read += part.bytes_read
+            fp = _PartReader(events)
+            part = klass(fp, headers, ib, environ, keep_blank_values,
+                         strict_parsing, None, self.encoding, self.errors)
+            # Skip the data not read by the part
+            while fp.read(1<<16):
+                pass
             self.list.append(part)
-            if part.done or self.bytes_read >= self.length > 0:
-                break
         self.skip_lines()
 
+    def read_multi_events(self, parser):
+        """Internal: feed parser with the body and yield its events."""
+        limit = self.limit
+        if limit is None or limit < 0:
+            read = getattr(self.fp, 'read1', None)
+            if read is None:
+                read = self.fp.readline
+        while not parser.done:
+            if limit is None or limit < 0:
+                data = read(1<<16)
+            elif limit > self.bytes_read:
+                data = self.fp.read(min(limit - self.bytes_read, 1<<16))
+            else:
+                data = b''
+            if not isinstance(data, bytes):
+                raise ValueError("%s should return bytes, got %s" \
+                                 % (self.fp, type(data).__name__))
+            self.bytes_read += len(data)
+            if data:
+                parser.feed(data)
+            else:
+                try:
+                    parser.close()
+                except ValueError:
+                    # Keep the parts of a truncated body
+                    self.done = -1
+            yield from parser.read_events()
+            if not data:
+                break
+
     def read_single(self):
         """Internal: read an atomic part."""
         if self.length >= 0:
@@ -726,6 +1021,20 @@ class FieldStorage:
         Data is read as bytes: boundaries and line ends must be converted
         to bytes for comparisons.
         """
+        if isinstance(self.fp, _PartReader):
+            # The end of the part has already been found: copy files by
+            # large blocks, and text line by line so that no character is
+            # split.
+            while True:
+                if self._binary_file:
+                    data = self.fp.read(1<<16)
+                else:
+                    data = self.fp.readline(1<<16)
+                if not data:
+                    break
+                self.bytes_read += len(data)
+                self.__write(data)
+            return
         next_boundary = b"--" + self.outerboundary
         last_boundary = next_boundary + b"--"
         delim = b""
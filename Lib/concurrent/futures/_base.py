@@ -547,7 +547,7 @@ class Executor(object):
         """
         raise NotImplementedError()
 
-    def map(self, fn, *iterables, timeout=None, chunksize=1):
+    def map(self, fn, *iterables, timeout=None, chunksize=1, ordered=True):
         """Returns an iterator equivalent to map(fn, iter).
 
         Args:
@@ -559,6 +559,10 @@ class Executor(object):
                 before being passed to a child process. This argument is only
                 used by ProcessPoolExecutor; it is ignored by
                 ThreadPoolExecutor.
+            ordered: If True, the results are yielded in the order of the
+                iterables. Otherwise, they are yielded as soon as the calls
+                complete, and completed calls are not held back by the
+                slower ones.
 
         Returns:
             An iterator equivalent to: map(func, *iterables) but the calls may
@@ -589,7 +593,27 @@ class Executor(object):
             finally:
                 for future in fs:
                     future.cancel()
-        return result_iterator()
+
+        def unordered_result_iterator():
+            pending = set(fs)
+            del fs[:]
+            try:
+                if timeout is None:
+                    completed = as_completed(pending)
+                else:
+                    completed = as_completed(pending, end_time - time.time())
+                for future in completed:
+                    # Careful not to keep a reference to the future
+                    pending.remove(future)
+                    yield future.result()
+                    del future
+            finally:
+                for future in pending:
+                    future.cancel()
+
+        if ordered:
+            return result_iterator()
+        return unordered_result_iterator()
 
     def shutdown(self, wait=True):
         """Clean-up the resources associated with the Executor.
@@ -40,7 +40,8 @@ Local worker thread:
 
 Process #1..n:
 - reads _CallItems from "Call Q", executes the calls, and puts the resulting
-  _ResultItems in "Result Q"
+  _ResultItems in "Result Q", several at once if more calls are waiting in
+  "Call Q" (see the result_batch_size argument)
 """
 
 __author__ = 'Brian Quinlan (brian@sweetapp.com)'
@@ -90,6 +91,10 @@ def _python_exit():
 # (Futures in the call queue cannot be cancelled).
 EXTRA_QUEUED_CALLS = 1
 
+# Upper bound on the number of messages from the workers handled by the queue
+# management thread each time it wakes up, before it refills the call queue.
+_MAX_MESSAGES_PER_WAKEUP = 100
+
 # Hack to embed stringification of remote traceback in local traceback
 
 class _RemoteTraceback(Exception):
@@ -119,10 +124,11 @@ class _WorkItem(object):
         self.kwargs = kwargs
 
 class _ResultItem(object):
-    def __init__(self, work_id, exception=None, result=None):
+    def __init__(self, work_id, exception=None, result=None, exit_pid=None):
         self.work_id = work_id
         self.exception = exception
         self.result = result
+        self.exit_pid = exit_pid
 
 class _CallItem(object):
     def __init__(self, work_id, fn, args, kwargs):
@@ -152,7 +158,19 @@ def _process_chunk(fn, chunk):
     """
     return [fn(*args) for args in chunk]
 
-def _process_worker(call_queue, result_queue, initializer, initargs):
+def _sendback_results(result_queue, results):
+    """ Puts the buffered _ResultItems in result_queue with a single write.
+
+    A lone result is sent as is, several ones as a list.
+    """
+    if len(results) == 1:
+        result_queue.put(results[0])
+    else:
+        result_queue.put(results)
+    results.clear()
+
+def _process_worker(call_queue, result_queue, initializer, initargs,
+                    max_tasks=None, result_batch_size=1):
     """Evaluates calls from call_queue and places the results in result_queue.
 
     This worker is run in a separate process.
@@ -164,6 +182,12 @@ def _process_worker(call_queue, result_queue, initializer, initargs):
             to by the worker.
         initializer: A callable initializer, or None
         initargs: A tuple of args for the initializer
+        max_tasks: The maximum number of calls evaluated before the worker
+            exits, or None for no limit.  The last result carries the PID
+            of the worker so that the parent can replace it.
+        result_batch_size: The maximum number of results sent back together.
+            Results are only held while more calls are waiting in
+            call_queue, never while the worker waits for work.
     """
     if initializer is not None:
         try:
@@ -173,25 +197,53 @@ def _process_worker(call_queue, result_queue, initializer, initargs):
             # The parent will notice that the process stopped and
             # mark the pool broken
             return
+    num_tasks = 0
+    exit_pid = None
+    results = []
     while True:
-        call_item = call_queue.get(block=True)
+        if results:
+            # Only keep the results if another call can be run right away.
+            try:
+                call_item = call_queue.get(block=False)
+            except queue.Empty:
+                _sendback_results(result_queue, results)
+                call_item = call_queue.get(block=True)
+        else:
+            call_item = call_queue.get(block=True)
         if call_item is None:
+            if results:
+                _sendback_results(result_queue, results)
             # Wake up queue management thread
             result_queue.put(os.getpid())
             return
+
+        if max_tasks is not None:
+            num_tasks += 1
+            if num_tasks >= max_tasks:
+                exit_pid = os.getpid()
+
         try:
             r = call_item.fn(*call_item.args, **call_item.kwargs)
         except BaseException as e:
             exc = _ExceptionWithTraceback(e, e.__traceback__)
-            result_queue.put(_ResultItem(call_item.work_id, exception=exc))
+            results.append(_ResultItem(call_item.work_id, exception=exc,
+                                       exit_pid=exit_pid))
         else:
-            result_queue.put(_ResultItem(call_item.work_id,
-                                         result=r))
+            results.append(_ResultItem(call_item.work_id,
+                                       result=r,
+                                       exit_pid=exit_pid))
+            del r
 
         # Liberate the resource as soon as possible, to avoid holding onto
         # open files or shared memory that is not needed anymore
         del call_item
 
+        if len(results) >= result_batch_size or exit_pid is not None:
+            _sendback_results(result_queue, results)
+
+        if exit_pid is not None:
+            return
+
 
 def _add_call_item_to_queue(pending_work_items,
                             work_ids,
@@ -262,14 +314,15 @@ def _queue_management_worker(executor_reference,
 
     def shutdown_worker():
         # This is an upper bound
-        nb_children_alive = sum(p.is_alive() for p in processes.values())
+        nb_children_alive = sum(p.is_alive()
+                                for p in list(processes.values()))
         for i in range(0, nb_children_alive):
             call_queue.put_nowait(None)
         # Release the queue's resources as soon as possible.
         call_queue.close()
         # If .join() is not called on the created processes then
         # some ctx.Queue methods may deadlock on Mac OS X.
-        for p in processes.values():
+        for p in list(processes.values()):
             p.join()
 
     reader = result_queue._reader
@@ -279,11 +332,17 @@ def _queue_management_worker(executor_reference,
                                 work_ids_queue,
                                 call_queue)
 
-        sentinels = [p.sentinel for p in processes.values()]
+        # Workers may be started concurrently by submit(), iterate over
+        # a copy of the mapping.
+        sentinels = [p.sentinel for p in list(processes.values())]
         assert sentinels
         ready = wait([reader] + sentinels)
         if reader in ready:
-            result_item = reader.recv()
+            # Handle all the messages already sent by the workers on this
+            # wakeup, but don't starve the call queue.
+            messages = [reader.recv()]
+            while len(messages) < _MAX_MESSAGES_PER_WAKEUP and reader.poll():
+                messages.append(reader.recv())
         else:
             # Mark the process pool broken so that submits fail right now.
             executor = executor_reference()
@@ -306,29 +365,80 @@ def _queue_management_worker(executor_reference,
             pending_work_items.clear()
             # Terminate remaining workers forcibly: the queues or their
             # locks may be in a dirty state and block forever.
-            for p in processes.values():
+            for p in list(processes.values()):
                 p.terminate()
             shutdown_worker()
             return
-        if isinstance(result_item, int):
-            # Clean shutdown of a worker using its PID
-            # (avoids marking the executor broken)
-            assert shutting_down()
-            p = processes.pop(result_item)
-            p.join()
-            if not processes:
-                shutdown_worker()
-                return
-        elif result_item is not None:
-            work_item = pending_work_items.pop(result_item.work_id, None)
-            # work_item can be None if another process terminated (see above)
-            if work_item is not None:
-                if result_item.exception:
-                    work_item.future.set_exception(result_item.exception)
+        executor = executor_reference()
+        for message in messages:
+            if isinstance(message, int):
+                # Clean shutdown of a worker using its PID
+                # (avoids marking the executor broken)
+                assert shutting_down()
+                p = processes.pop(message)
+                p.join()
+            elif message is not None:
+                # A worker sends back either one _ResultItem or a list of
+                # them, see _sendback_results().
+                if isinstance(message, list):
+                    result_items = message
                 else:
-                    work_item.future.set_result(result_item.result)
-                # Delete references to object. See issue16284
-                del work_item
+                    result_items = [message]
+                process_exited = False
+                for result_item in result_items:
+                    work_item = pending_work_items.pop(result_item.work_id,
+                                                       None)
+                    # work_item can be None if another process terminated
+                    # (see above)
+                    if work_item is not None:
+                        if result_item.exception:
+                            work_item.future.set_exception(
+                                result_item.exception)
+                        else:
+                            work_item.future.set_result(result_item.result)
+                        # Delete references to object. See issue16284
+                        del work_item
+                    if result_item.exit_pid is not None:
+                        # The worker reached max_tasks_per_child and exited.
+                        process_exited = True
+                        p = processes.pop(result_item.exit_pid)
+                        p.join()
+                # Delete references to the results to avoid keeping them
+                # while waiting on new results.
+                del result_item, result_items
+
+                if executor is not None:
+                    if process_exited:
+                        # Replace the worker unless no more calls can come.
+                        # Don't rely on _idle_worker_semaphore: the results
+                        # previously sent by the exited worker released it
+                        # while the worker still had calls to run.
+                        if not shutting_down() or pending_work_items:
+                            with executor._shutdown_lock:
+                                if (executor._call_queue is not None and
+                                        len(processes) <
+                                        executor._max_workers):
+                                    executor._spawn_process()
+                    else:
+                        # The worker which sent the results is idle again.
+                        executor._idle_worker_semaphore.release()
+        del message, messages
+        executor = None
+
+        if not processes:
+            # Either all the workers exited cleanly on shutdown, or the last
+            # one was recycled after the executor was dropped by
+            # shutdown(wait=False), before it could be replaced.
+            if pending_work_items:
+                bpe = BrokenProcessPool("The executor was shut down before "
+                                        "the pending calls could run")
+                for work_id, work_item in pending_work_items.items():
+                    work_item.future.set_exception(bpe)
+                    # Delete references to object. See issue16284
+                    del work_item
+                pending_work_items.clear()
+            shutdown_worker()
+            return
         # Check whether we should start shutting down.
         executor = executor_reference()
         # No more work items can be added if:
@@ -394,7 +504,8 @@ class BrokenProcessPool(_base.BrokenExecutor):
 
 class ProcessPoolExecutor(_base.Executor):
     def __init__(self, max_workers=None, mp_context=None,
-                 initializer=None, initargs=()):
+                 initializer=None, initargs=(), *, max_tasks_per_child=None,
+                 result_batch_size=1):
         """Initializes a new ProcessPoolExecutor instance.
 
         Args:
@@ -405,6 +516,17 @@ class ProcessPoolExecutor(_base.Executor):
                 object should provide SimpleQueue, Queue and Process.
             initializer: An callable used to initialize worker processes.
             initargs: A tuple of arguments to pass to the initializer.
+            max_tasks_per_child: The maximum number of tasks a worker process
+                can complete before it will exit and be replaced with a fresh
+                worker process. The default of None means worker process will
+                live as long as the executor. Requires a non-'fork' mp_context
+                start method. When given, we default to using 'spawn' if no
+                mp_context is supplied.
+            result_batch_size: The maximum number of results a worker process
+                sends back at once. A worker only holds results while more
+                calls are queued for it, so larger values mean fewer wakeups
+                of the parent when many small calls are submitted, at the
+                price of a larger call queue.
         """
         _check_system_limits()
 
@@ -416,18 +538,47 @@ class ProcessPoolExecutor(_base.Executor):
 
             self._max_workers = max_workers
         if mp_context is None:
-            mp_context = mp.get_context()
+            if max_tasks_per_child is not None:
+                mp_context = mp.get_context("spawn")
+            else:
+                mp_context = mp.get_context()
         self._mp_context = mp_context
 
+        # Workers are started on demand, as calls are submitted, unless the
+        # 'fork' start method is used: forking while the queue management
+        # and queue feeder threads hold locks is unsafe, so all the workers
+        # are then started at once, before those threads exist.
+        self._safe_to_dynamically_spawn_children = (
+            self._mp_context.get_start_method(allow_none=False) != "fork")
+
         if initializer is not None and not callable(initializer):
             raise TypeError("initializer must be a callable")
         self._initializer = initializer
         self._initargs = initargs
 
+        if max_tasks_per_child is not None:
+            if not isinstance(max_tasks_per_child, int):
+                raise TypeError("max_tasks_per_child must be an integer")
+            elif max_tasks_per_child <= 0:
+                raise ValueError("max_tasks_per_child must be >= 1")
+            if not self._safe_to_dynamically_spawn_children:
+                raise ValueError("max_tasks_per_child is incompatible with"
+                                 " the 'fork' multiprocessing start method;"
+                                 " supply a different mp_context.")
+        self._max_tasks_per_child = max_tasks_per_child
+
+        if not isinstance(result_batch_size, int):
+            raise TypeError("result_batch_size must be an integer")
+        elif result_batch_size <= 0:
+            raise ValueError("result_batch_size must be >= 1")
+        self._result_batch_size = result_batch_size
+
         # Make the call queue slightly larger than the number of processes to
         # prevent the worker processes from idling. But don't make it too big
-        # because futures in the call queue cannot be cancelled.
-        queue_size = self._max_workers + EXTRA_QUEUED_CALLS
+        # because futures in the call queue cannot be cancelled.  Workers
+        # batching their results need enough calls queued to fill a batch.
+        queue_size = (self._max_workers * self._result_batch_size
+                      + EXTRA_QUEUED_CALLS)
         self._call_queue = mp_context.Queue(queue_size)
         # Killed worker processes can produce spurious "broken pipe"
         # tracebacks in the queue's own worker thread. But we detect killed
@@ -442,6 +593,9 @@ class ProcessPoolExecutor(_base.Executor):
         # Shutdown is a two-step process.
         self._shutdown_thread = False
         self._shutdown_lock = threading.Lock()
+        # Counts the workers waiting for a call: a new worker is only
+        # started when none is idle.
+        self._idle_worker_semaphore = threading.Semaphore(0)
         self._broken = False
         self._queue_count = 0
         self._pending_work_items = {}
@@ -453,7 +607,8 @@ class ProcessPoolExecutor(_base.Executor):
             q.put(None)
         if self._queue_management_thread is None:
             # Start the processes so that their sentinels are known.
-            self._adjust_process_count()
+            if not self._safe_to_dynamically_spawn_children:  # ie, using fork.
+                self._launch_processes()
             self._queue_management_thread = threading.Thread(
                 target=_queue_management_worker,
                 args=(weakref.ref(self, weakref_cb),
@@ -467,15 +622,35 @@ class ProcessPoolExecutor(_base.Executor):
             _threads_queues[self._queue_management_thread] = self._result_queue
 
     def _adjust_process_count(self):
+        # The pool is being torn down by shutdown(wait=False).
+        if self._call_queue is None:
+            return
+
+        # If there's an idle process, we don't need to spawn a new one.
+        if self._idle_worker_semaphore.acquire(blocking=False):
+            return
+
+        if len(self._processes) < self._max_workers:
+            self._spawn_process()
+
+    def _launch_processes(self):
+        assert not self._queue_management_thread, (
+                'Processes cannot be fork()ed after the thread has started, '
+                'deadlock in the child processes could result.')
         for _ in range(len(self._processes), self._max_workers):
-            p = self._mp_context.Process(
-                target=_process_worker,
-                args=(self._call_queue,
-                      self._result_queue,
-                      self._initializer,
-                      self._initargs))
-            p.start()
-            self._processes[p.pid] = p
+            self._spawn_process()
+
+    def _spawn_process(self):
+        p = self._mp_context.Process(
+            target=_process_worker,
+            args=(self._call_queue,
+                  self._result_queue,
+                  self._initializer,
+                  self._initargs,
+                  self._max_tasks_per_child,
+                  self._result_batch_size))
+        p.start()
+        self._processes[p.pid] = p
 
     def submit(self, fn, *args, **kwargs):
         with self._shutdown_lock:
@@ -493,11 +668,13 @@ class ProcessPoolExecutor(_base.Executor):
             # Wake up queue management thread
             self._result_queue.put(None)
 
+            if self._safe_to_dynamically_spawn_children:
+                self._adjust_process_count()
             self._start_queue_management_thread()
             return f
     submit.__doc__ = _base.Executor.submit.__doc__
 
-    def map(self, fn, *iterables, timeout=None, chunksize=1):
+    def map(self, fn, *iterables, timeout=None, chunksize=1, ordered=True):
         """Returns an iterator equivalent to map(fn, iter).
 
         Args:
@@ -508,6 +685,9 @@ class ProcessPoolExecutor(_base.Executor):
             chunksize: If greater than one, the iterables will be chopped into
                 chunks of size chunksize and submitted to the process pool.
                 If set to one, the items in the list will be sent one at a time.
+            ordered: If True, the results are yielded in the order of the
+                iterables. Otherwise, they are yielded as soon as the calls
+                complete; the results of a chunk stay together, in order.
 
         Returns:
             An iterator equivalent to: map(func, *iterables) but the calls may
@@ -523,7 +703,8 @@ class ProcessPoolExecutor(_base.Executor):
 
         results = super().map(partial(_process_chunk, fn),
                               _get_chunks(*iterables, chunksize=chunksize),
-                              timeout=timeout)
+                              timeout=timeout,
+                              ordered=ordered)
         return _chain_from_iterable_of_lists(results)
 
     def shutdown(self, wait=True):
@@ -535,15 +716,17 @@ class ProcessPoolExecutor(_base.Executor):
             if wait:
                 self._queue_management_thread.join()
         # To reduce the risk of opening too many files, remove references to
-        # objects that use file descriptors.
-        self._queue_management_thread = None
-        if self._call_queue is not None:
-            self._call_queue.close()
-            if wait:
-                self._call_queue.join_thread()
-            self._call_queue = None
-        self._result_queue = None
-        self._processes = None
+        # objects that use file descriptors.  The lock keeps the queue
+        # management thread from replacing a recycled worker meanwhile.
+        with self._shutdown_lock:
+            self._queue_management_thread = None
+            if self._call_queue is not None:
+                self._call_queue.close()
+                if wait:
+                    self._call_queue.join_thread()
+                self._call_queue = None
+            self._result_queue = None
+            self._processes = None
     shutdown.__doc__ = _base.Executor.shutdown.__doc__
 
 atexit.register(_python_exit)
@@ -1346,6 +1346,7 @@ else:
         "This class allows communication via SSL."
 
         default_port = HTTPS_PORT
+        _session_key = None     # (server_hostname, port) in the session cache
 
         # XXX Should key_file and cert_file be deprecated in favour of context?
 
@@ -1384,11 +1385,19 @@ else:
 
             if self._tunnel_host:
                 server_hostname = self._tunnel_host
+                port = self._tunnel_port
             else:
                 server_hostname = self.host
+                port = self.port
 
+            cache = getattr(self._context, 'session_cache', None)
+            session = None
+            if cache is not None:
+                session = cache.get(server_hostname, port)
+                self._session_key = (server_hostname, port)
             self.sock = self._context.wrap_socket(self.sock,
-                                                  server_hostname=server_hostname)
+                                                  server_hostname=server_hostname,
+                                                  session=session)
             if not self._context.check_hostname and self._check_hostname:
                 try:
                     ssl.match_hostname(self.sock.getpeercert(), server_hostname)
@@ -1396,6 +1405,18 @@ else:
                     self.sock.shutdown(socket.SHUT_RDWR)
                     self.sock.close()
                     raise
+            if cache is not None and not self.sock.session_reused:
+                cache.put(server_hostname, port, self.sock.session)
+
+        def close(self):
+            # With TLS 1.3, the session tickets are sent by the server after
+            # the handshake: store the session again once they were received
+            cache = getattr(self._context, 'session_cache', None)
+            if cache is not None and self._session_key is not None:
+                session = getattr(self.sock, 'session', None)
+                if session is not None:
+                    cache.put(*self._session_key, session)
+            super().close()
 
     __all__.append("HTTPSConnection")
 
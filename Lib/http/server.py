@@ -83,7 +83,7 @@ XXX To do:
 __version__ = "0.6"
 
 __all__ = [
-    "HTTPServer", "BaseHTTPRequestHandler",
+    "HTTPServer", "ThreadingHTTPServer", "BaseHTTPRequestHandler",
     "SimpleHTTPRequestHandler", "CGIHTTPRequestHandler",
 ]
 
@@ -92,10 +92,12 @@ import datetime
 import email.utils
 import html
 import http.client
+import inspect
 import io
 import mimetypes
 import os
 import posixpath
+import re
 import select
 import shutil
 import socket # For gethostbyaddr()
@@ -140,6 +142,10 @@ class HTTPServer(socketserver.TCPServer):
         self.server_port = port
 
 
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
 class BaseHTTPRequestHandler(socketserver.StreamRequestHandler):
 
     """HTTP request handler base class.
@@ -620,6 +626,29 @@ class BaseHTTPRequestHandler(socketserver.StreamRequestHandler):
     }
 
 
+# A byte range of a Range header, with ASCII digits only: str.isdigit()
+# accepts other digits, which int() may reject.
+_byte_range_re = re.compile(r'(\d*)-(\d*)', re.ASCII)
+
+
+class _LimitedReader:
+    """Read at most count bytes from a file object."""
+
+    def __init__(self, file, count):
+        self.file = file
+        self.remaining = count
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def tell(self):
+        return self.file.tell()
+
+
 class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
 
     """Simple HTTP request handler with GET and HEAD commands.
@@ -635,6 +664,10 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
 
     server_version = "SimpleHTTP/" + __version__
 
+    # The (first, last) byte positions of the file to send, set by
+    # send_head() for a Range request
+    byte_range = None
+
     def __init__(self, *args, directory=None, **kwargs):
         if directory is None:
             directory = os.getcwd()
@@ -646,7 +679,16 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
         f = self.send_head()
         if f:
             try:
-                self.copyfile(f, self.wfile)
+                if self.byte_range is None:
+                    self.copyfile(f, self.wfile)
+                else:
+                    first, last = self.byte_range
+                    f.seek(first)
+                    count = last - first + 1
+                    if self._copyfile_accepts_count():
+                        self.copyfile(f, self.wfile, count)
+                    else:
+                        self.copyfile(_LimitedReader(f, count), self.wfile)
             finally:
                 f.close()
 
@@ -665,11 +707,22 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
         to the outputfile by the caller unless the command was HEAD,
         and must be closed by the caller under all circumstances), or
         None, in which case the caller has nothing further to do.
+        If self.byte_range is not None after the call, only this
+        (first, last) range of bytes of the file must be copied.
 
         """
+        self.byte_range = None
         path = self.translate_path(self.path)
         f = None
-        if os.path.isdir(path):
+        try:
+            # Most requests are for files: a directory is only looked for
+            # when the path cannot be opened.
+            f = open(path, 'rb')
+        except OSError:
+            if not os.path.isdir(path):
+                self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+                return None
+        if f is None:
             parts = urllib.parse.urlsplit(self.path)
             if not parts.path.endswith('/'):
                 # redirect browser - doing basically what apache does
@@ -678,6 +731,7 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
                              parts[3], parts[4])
                 new_url = urllib.parse.urlunsplit(new_parts)
                 self.send_header("Location", new_url)
+                self.send_header("Content-Length", "0")
                 self.end_headers()
                 return None
             for index in "index.html", "index.htm":
@@ -687,54 +741,142 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
                     break
             else:
                 return self.list_directory(path)
+            try:
+                f = open(path, 'rb')
+            except OSError:
+                self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+                return None
         ctype = self.guess_type(path)
-        try:
-            f = open(path, 'rb')
-        except OSError:
-            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
-            return None
 
         try:
             fs = os.fstat(f.fileno())
+            etag, last_modified = self.get_validators(path, fs)
             # Use browser cache if possible
-            if ("If-Modified-Since" in self.headers
-                    and "If-None-Match" not in self.headers):
-                # compare If-Modified-Since and time of last file modification
-                try:
-                    ims = email.utils.parsedate_to_datetime(
-                        self.headers["If-Modified-Since"])
-                except (TypeError, IndexError, OverflowError, ValueError):
-                    # ignore ill-formed values
-                    pass
-                else:
-                    if ims.tzinfo is None:
-                        # obsolete format with no timezone, cf.
-                        # https://tools.ietf.org/html/rfc7231#section-7.1.1.1
-                        ims = ims.replace(tzinfo=datetime.timezone.utc)
-                    if ims.tzinfo is datetime.timezone.utc:
-                        # compare to UTC datetime of last modification
-                        last_modif = datetime.datetime.fromtimestamp(
-                            fs.st_mtime, datetime.timezone.utc)
-                        # remove microseconds, like in If-Modified-Since
-                        last_modif = last_modif.replace(microsecond=0)
-
-                        if last_modif <= ims:
-                            self.send_response(HTTPStatus.NOT_MODIFIED)
-                            self.end_headers()
-                            f.close()
-                            return None
-
-            self.send_response(HTTPStatus.OK)
+            if self.is_not_modified(fs, etag):
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                f.close()
+                return None
+
+            size = fs.st_size
+            if (self.command == 'GET' and "Range" in self.headers and
+                    self.headers.get("If-Range", etag) in (etag,
+                                                           last_modified)):
+                self.byte_range = self.parse_range(self.headers["Range"], size)
+            if self.byte_range is None:
+                self.send_response(HTTPStatus.OK)
+                self.send_header("Content-Length", str(size))
+            elif self.byte_range[0] >= size:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", "bytes */%d" % size)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                f.close()
+                return None
+            else:
+                first, last = self.byte_range
+                self.send_response(HTTPStatus.PARTIAL_CONTENT)
+                self.send_header("Content-Range",
+                                 "bytes %d-%d/%d" % (first, last, size))
+                self.send_header("Content-Length", str(last - first + 1))
             self.send_header("Content-type", ctype)
-            self.send_header("Content-Length", str(fs[6]))
-            self.send_header("Last-Modified",
-                self.date_time_string(fs.st_mtime))
+            self.send_header("Last-Modified", last_modified)
+            self.send_header("ETag", etag)
+            self.send_header("Accept-Ranges", "bytes")
             self.end_headers()
             return f
         except:
             f.close()
             raise
 
+    # Entity tags and Last-Modified values of the recently served files,
+    # shared by all the handlers.  An entry is only used while the size,
+    # modification time and inode of the file are unchanged.
+    _validators_cache = {}
+    _validators_cache_size = 256
+
+    def get_validators(self, path, fs):
+        """Return the (etag, last_modified) header values of a file.
+
+        fs is the stat result of the file opened at path.
+        """
+        key = (fs.st_ino, fs.st_size, fs.st_mtime_ns)
+        try:
+            cached_key, validators = self._validators_cache[path]
+        except KeyError:
+            pass
+        else:
+            if cached_key == key:
+                return validators
+        validators = ('"%x-%x"' % (fs.st_mtime_ns, fs.st_size),
+                      self.date_time_string(fs.st_mtime))
+        cache = self._validators_cache
+        if len(cache) >= self._validators_cache_size:
+            cache.clear()
+        cache[path] = (key, validators)
+        return validators
+
+    def is_not_modified(self, fs, etag):
+        """Return True if the client copy of the file is up to date.
+
+        If-None-Match takes precedence over If-Modified-Since.
+        """
+        if "If-None-Match" in self.headers:
+            tags = [tag.strip() for tag in
+                    self.headers["If-None-Match"].split(',')]
+            # weak comparison: ignore the W/ prefix
+            return "*" in tags or any(tag.rpartition('W/')[2] == etag
+                                      for tag in tags)
+        if "If-Modified-Since" in self.headers:
+            # compare If-Modified-Since and time of last file modification
+            try:
+                ims = email.utils.parsedate_to_datetime(
+                    self.headers["If-Modified-Since"])
+            except (TypeError, IndexError, OverflowError, ValueError):
+                # ignore ill-formed values
+                return False
+            if ims.tzinfo is None:
+                # obsolete format with no timezone, cf.
+                # https://tools.ietf.org/html/rfc7231#section-7.1.1.1
+                ims = ims.replace(tzinfo=datetime.timezone.utc)
+            if ims.tzinfo is datetime.timezone.utc:
+                # compare to UTC datetime of last modification
+                last_modif = datetime.datetime.fromtimestamp(
+                    fs.st_mtime, datetime.timezone.utc)
+                # remove microseconds, like in If-Modified-Since
+                last_modif = last_modif.replace(microsecond=0)
+                return last_modif <= ims
+        return False
+
+    def parse_range(self, value, size):
+        """Parse the value of a Range header for a file of size bytes.
+
+        Return a (first, last) pair of byte positions, with first >= size
+        if the range cannot be satisfied, or None if the header must be
+        ignored: several ranges or an invalid value.
+        """
+        unit, _, byte_range = value.partition('=')
+        match = _byte_range_re.fullmatch(byte_range.strip())
+        if unit.strip().lower() != 'bytes' or match is None:
+            return None
+        first, last = match.groups()
+        if not (first or last):
+            return None
+        if not first:
+            # the last bytes of the file, none cannot be satisfied
+            suffix = int(last)
+            first = max(size - suffix, 0) if suffix else size
+            return first, size - 1
+        first = int(first)
+        if last:
+            last = int(last)
+            if last < first:
+                return None
+        else:
+            last = size - 1
+        return first, min(last, size - 1)
+
     def list_directory(self, path):
         """Helper to produce a directory listing (absent index.html).
 
@@ -823,13 +965,29 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
             path += '/'
         return path
 
-    def copyfile(self, source, outputfile):
+    def _copyfile_accepts_count(self):
+        # copyfile() overrides written before the count parameter was added
+        # are given a reader limited to the range instead.
+        if type(self).copyfile is SimpleHTTPRequestHandler.copyfile:
+            return True
+        try:
+            inspect.signature(self.copyfile).bind(None, None, None)
+        except (TypeError, ValueError):
+            return False
+        return True
+
+    def copyfile(self, source, outputfile, count=None):
         """Copy all data between two file objects.
 
         The SOURCE argument is a file object open for reading
         (or anything with a read() method) and the DESTINATION
         argument is a file object open for writing (or
-        anything with a write() method).
+        anything with a write() method).  If COUNT is given, only
+        COUNT bytes are copied from the current position of SOURCE.
+
+        If DESTINATION has a sendfile() method, like the unbuffered
+        self.wfile, it is used to send a regular file without copying
+        its data in user space.
 
         The only reason for overriding this would be to change
         the block size or perhaps to replace newlines by CRLF
@@ -837,7 +995,18 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
         to copy binary data as well.
 
         """
-        shutil.copyfileobj(source, outputfile)
+        sendfile = getattr(outputfile, 'sendfile', None)
+        if sendfile is not None:
+            sendfile(source, source.tell(), count)
+        elif count is None:
+            shutil.copyfileobj(source, outputfile)
+        else:
+            while count > 0:
+                buf = source.read(min(count, 64 * 1024))
+                if not buf:
+                    break
+                outputfile.write(buf)
+                count -= len(buf)
 
     def guess_type(self, path):
         """Guess the type of a file.
@@ -1213,7 +1382,8 @@ class CGIHTTPRequestHandler(SimpleHTTPRequestHandler):
 
 
 def test(HandlerClass=BaseHTTPRequestHandler,
-         ServerClass=HTTPServer, protocol="HTTP/1.0", port=8000, bind=""):
+         ServerClass=ThreadingHTTPServer, protocol="HTTP/1.0", port=8000,
+         bind=""):
     """Test the HTTP request handler class.
 
     This runs an HTTP server on port 8000 (or the port argument).
@@ -1221,7 +1391,10 @@ def test(HandlerClass=BaseHTTPRequestHandler,
     """
     server_address = (bind, port)
 
-    HandlerClass.protocol_version = protocol
+    if isinstance(HandlerClass, partial):
+        HandlerClass.func.protocol_version = protocol
+    else:
+        HandlerClass.protocol_version = protocol
     with ServerClass(server_address, HandlerClass) as httpd:
         sa = httpd.socket.getsockname()
         serve_message = "Serving HTTP on {host} port {port} (http://{host}:{port}/) ..."
@@ -1251,7 +1424,11 @@ if __name__ == '__main__':
     args = parser.parse_args()
     if args.cgi:
         handler_class = CGIHTTPRequestHandler
+        # The output of CGI scripts is delimited by closing the connection
+        protocol = "HTTP/1.0"
     else:
         handler_class = partial(SimpleHTTPRequestHandler,
                                 directory=args.directory)
-    test(HandlerClass=handler_class, port=args.port, bind=args.bind)
+        protocol = "HTTP/1.1"
+    test(HandlerClass=handler_class, port=args.port, bind=args.bind,
+         protocol=protocol)
@@ -98,13 +98,13 @@ Using json.tool from the shell to validate and pretty-print::
 """
 __version__ = '2.0.9'
 __all__ = [
-    'dump', 'dumps', 'load', 'loads',
-    'JSONDecoder', 'JSONDecodeError', 'JSONEncoder',
+    'dump', 'dumps', 'load', 'loads', 'iterload',
+    'JSONDecoder', 'JSONDecodeError', 'JSONEncoder', 'JSONPullParser',
 ]
 
 __author__ = 'Bob Ippolito <bob@redivi.com>'
 
-from .decoder import JSONDecoder, JSONDecodeError
+from .decoder import JSONDecoder, JSONDecodeError, JSONPullParser
 from .encoder import JSONEncoder
 import codecs
 
@@ -366,3 +366,39 @@ def loads(s, *, encoding=None, cls=None, object_hook=None, parse_float=None,
     if parse_constant is not None:
         kw['parse_constant'] = parse_constant
     return cls(**kw).decode(s)
+
+
+def iterload(fp, depth=1, *, cls=None, object_hook=None, parse_float=None,
+        parse_int=None, parse_constant=None, object_pairs_hook=None, **kw):
+    """Incrementally deserialize ``fp`` (a ``.read()``-supporting file-like
+    object containing a JSON document), yielding ``(event, value)`` pairs.
+
+    The events are those of ``JSONPullParser``: arrays and objects nested at
+    ``depth`` or deeper are yielded whole as ``'value'`` events, so with the
+    default depth of 1 the items of a top-level array are yielded one at a
+    time, without reading the whole document in memory.
+
+    The other arguments have the same meaning as in ``load``; the hooks
+    only apply to the values which are decoded whole.
+    """
+    if cls is None:
+        cls = JSONDecoder
+    if object_hook is not None:
+        kw['object_hook'] = object_hook
+    if object_pairs_hook is not None:
+        kw['object_pairs_hook'] = object_pairs_hook
+    if parse_float is not None:
+        kw['parse_float'] = parse_float
+    if parse_int is not None:
+        kw['parse_int'] = parse_int
+    if parse_constant is not None:
+        kw['parse_constant'] = parse_constant
+    parser = JSONPullParser(depth, decoder=cls(**kw))
+    while True:
+        data = fp.read(64 * 1024)
+        if not data:
+            break
+        parser.feed(data)
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
@@ -1,6 +1,8 @@
 """Implementation of JSONDecoder
 """
+import codecs
 import re
+from collections import deque
 
 from json import scanner
 try:
@@ -8,7 +10,7 @@ try:
 except ImportError:
     c_scanstring = None
 
-__all__ = ['JSONDecoder', 'JSONDecodeError']
+__all__ = ['JSONDecoder', 'JSONDecodeError', 'JSONPullParser']
 
 FLAGS = re.VERBOSE | re.MULTILINE | re.DOTALL
 
@@ -357,3 +359,315 @@ class JSONDecoder(object):
         except StopIteration as err:
             raise JSONDecodeError("Expecting value", s, err.value) from None
         return obj, end
+
+
+# Used by JSONPullParser to find the end of a value without decoding it
+NONSTRING_END = re.compile(r'[ \t\n\r,:\[\]{}"]')
+NESTING = re.compile(r'["\[\]{}]')
+STRING_REST = re.compile(r'[^"\\]*(?:\\[\s\S][^"\\]*)*')
+
+# States of JSONPullParser: what is expected next
+_VALUE, _FIRST_ITEM, _FIRST_KEY, _KEY, _COLON, _NEXT, _END = range(7)
+
+
+def _find_end(s, pos, nesting, instring):
+    """Look for the end of the array, object or string at pos.
+
+    Return the end, or None and the state to resume the search with on
+    the data which follows s.
+    """
+    n = len(s)
+    while True:
+        if instring:
+            pos = STRING_REST.match(s, pos).end()
+            if pos == n or s[pos] != '"':
+                # The string may end with the start of an escape sequence
+                return None, (nesting, True, s[pos:])
+            pos += 1
+            instring = False
+            if not nesting:
+                return pos, None
+        else:
+            m = NESTING.search(s, pos)
+            if m is None:
+                return None, (nesting, False, '')
+            pos = m.end()
+            c = m.group()
+            if c == '"':
+                instring = True
+            elif c in '[{':
+                nesting += 1
+            else:
+                nesting -= 1
+                if not nesting:
+                    return pos, None
+
+
+_EXPECTING = {
+    _VALUE: "Expecting value",
+    _FIRST_ITEM: "Expecting value",
+    _FIRST_KEY: "Expecting property name enclosed in double quotes",
+    _KEY: "Expecting property name enclosed in double quotes",
+    _COLON: "Expecting ':' delimiter",
+    _NEXT: "Expecting ',' delimiter",
+}
+
+
+class JSONPullParser(object):
+    """Incremental JSON parser.
+
+    Data is passed to feed() in chunks of str or bytes, and the parsed
+    events are retrieved with read_events().  The events are (event, value)
+    pairs, where event is one of 'start_object', 'key', 'end_object',
+    'start_array', 'end_array' and 'value'.
+
+    Arrays and objects nested at depth or deeper (the document itself is at
+    depth 0, the items of a top-level array at depth 1) are decoded as a
+    whole, with the scanner of decoder, and reported as a 'value' event;
+    the shallower ones are reported as start, key and end events.  If depth
+    is None, all of them are.  Only the data of the value being parsed is
+    kept in memory.
+
+    """
+    def __init__(self, depth=None, *, decoder=None):
+        if depth is not None and depth < 0:
+            raise ValueError('depth must be None or >= 0')
+        if decoder is None:
+            decoder = JSONDecoder()
+        self.depth = depth
+        self._scan_once = decoder.scan_once
+        self._buf = ''
+        # Stack of the opening characters of the containers being parsed
+        self._stack = []
+        self._state = _VALUE
+        self._events = deque()
+        # Number of characters and lines already parsed and discarded, and
+        # position of the start of the current line
+        self._offset = 0
+        self._lineno = 1
+        self._linestart = 0
+        # (nesting level, in a string, unscanned data) of the search for the
+        # end of the value which starts the buffer, and the data fed since
+        # the search started
+        self._scan = None
+        self._pending = []
+        self._text = None
+        self._raw = b''
+        self._textdecoder = None
+        self._closed = False
+
+    def feed(self, data):
+        """Feed str or bytes data to the parser."""
+        if self._closed:
+            raise ValueError('feed() called after close()')
+        if isinstance(data, str):
+            if self._text is None and data:
+                if data.startswith('\ufeff'):
+                    raise JSONDecodeError(
+                        "Unexpected UTF-8 BOM (decode using utf-8-sig)",
+                        data, 0)
+                self._text = True
+            elif self._text is False:
+                raise TypeError('cannot feed str after bytes')
+        else:
+            if not isinstance(data, (bytes, bytearray)):
+                raise TypeError(f'the JSON data must be str, bytes or '
+                                f'bytearray, not {data.__class__.__name__}')
+            if self._text:
+                raise TypeError('cannot feed bytes after str')
+            self._text = False
+            if self._textdecoder is not None:
+                data = self._textdecoder.decode(data)
+            else:
+                # Wait for enough data to detect the encoding
+                self._raw += data
+                if len(self._raw) < 4:
+                    return
+                data = self._set_encoding(self._raw)
+                self._raw = b''
+        if self._scan is not None:
+            # The end of a value is being searched for: only look at the new
+            # data, and do not copy the buffer until the value is complete
+            nesting, instring, rest = self._scan
+            self._pending.append(data)
+            end, self._scan = _find_end(rest + data, 0, nesting, instring)
+            if end is None:
+                return
+            self._join_pending()
+        else:
+            self._buf += data
+        self._parse(False)
+
+    def close(self):
+        """Finish parsing.
+
+        Raise JSONDecodeError if the data is not a complete JSON document.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._join_pending()
+        if self._text is False:
+            if self._textdecoder is None:
+                self._buf += self._set_encoding(self._raw)
+                self._raw = b''
+            self._buf += self._textdecoder.decode(b'', True)
+        self._parse(True)
+        if self._state != _END:
+            raise self._error(_EXPECTING[self._state], len(self._buf))
+
+    def read_events(self):
+        """Return an iterator over the events parsed since the last call."""
+        events = self._events
+        while events:
+            yield events.popleft()
+
+    def _error(self, msg, pos):
+        # Make an error whose position is relative to the whole document
+        # rather than to the data still in the buffer
+        buf = self._buf
+        err = JSONDecodeError(msg, buf, pos)
+        err.pos = pos + self._offset
+        nl = buf.count('\n', 0, pos)
+        err.lineno = self._lineno + nl
+        if not nl:
+            err.colno = err.pos - self._linestart + 1
+        err.args = ('%s: line %d column %d (char %d)' %
+                    (msg, err.lineno, err.colno, err.pos),)
+        return err
+
+    def _set_encoding(self, data):
+        from json import detect_encoding
+        decoder = codecs.getincrementaldecoder(detect_encoding(data))
+        self._textdecoder = decoder('surrogatepass')
+        return self._textdecoder.decode(data)
+
+    def _join_pending(self):
+        if self._pending:
+            self._pending.insert(0, self._buf)
+            self._buf = ''.join(self._pending)
+            self._pending = []
+        self._scan = None
+
+    def _scan_value(self, buf, pos, final):
+        # Return the value starting at pos and its end, or None if it may
+        # not be complete yet
+        scan_once = self._scan_once
+        if buf[pos] in '"[{':
+            # Most values are complete: try to decode them before looking
+            # for their end, which is slower
+            try:
+                return scan_once(buf, pos)
+            except (JSONDecodeError, StopIteration):
+                pass
+        if self._value_end(buf, pos, final) is None:
+            return None
+        try:
+            return scan_once(buf, pos)
+        except StopIteration as err:
+            raise JSONDecodeError("Expecting value", buf, err.value) from None
+
+    def _value_end(self, buf, pos, final):
+        # Return the end of the value starting at pos, or None if it may not
+        # be complete yet.  Containers and strings are not decoded: only the
+        # quotes and brackets are looked at, and the search is resumed on
+        # the new data when more is fed.
+        n = len(buf)
+        if buf[pos] not in '"[{':
+            m = NONSTRING_END.search(buf, pos)
+            if m is not None:
+                return m.start()
+            return n if final else None
+        end, scan = _find_end(buf, pos, 0, False)
+        if end is not None:
+            return end
+        if final:
+            # Let the scanner report the error
+            return n
+        self._scan = scan
+        return None
+
+    def _parse(self, final, _w=WHITESPACE.match):
+        buf = self._buf
+        n = len(buf)
+        pos = 0
+        stack = self._stack
+        state = self._state
+        events = self._events
+        depth = self.depth
+        try:
+            while True:
+                pos = _w(buf, pos).end()
+                if pos == n:
+                    break
+                c = buf[pos]
+                if state == _VALUE or state == _FIRST_ITEM:
+                    if c == ']' and state == _FIRST_ITEM:
+                        stack.pop()
+                        events.append(('end_array', None))
+                        pos += 1
+                        state = _NEXT if stack else _END
+                        continue
+                    if c in '[{' and (depth is None or len(stack) < depth):
+                        stack.append(c)
+                        if c == '[':
+                            events.append(('start_array', None))
+                            state = _FIRST_ITEM
+                        else:
+                            events.append(('start_object', None))
+                            state = _FIRST_KEY
+                        pos += 1
+                        continue
+                    result = self._scan_value(buf, pos, final)
+                    if result is None:
+                        break
+                    value, pos = result
+                    events.append(('value', value))
+                    state = _NEXT if stack else _END
+                elif state == _KEY or state == _FIRST_KEY:
+                    if c == '}' and state == _FIRST_KEY:
+                        stack.pop()
+                        events.append(('end_object', None))
+                        pos += 1
+                        state = _NEXT if stack else _END
+                        continue
+                    if c != '"':
+                        raise JSONDecodeError(_EXPECTING[state], buf, pos)
+                    result = self._scan_value(buf, pos, final)
+                    if result is None:
+                        break
+                    key, pos = result
+                    events.append(('key', key))
+                    state = _COLON
+                elif state == _COLON:
+                    if c != ':':
+                        raise JSONDecodeError(_EXPECTING[state], buf, pos)
+                    pos += 1
+                    state = _VALUE
+                elif state == _NEXT:
+                    top = stack[-1]
+                    if c == ',':
+                        pos += 1
+                        state = _VALUE if top == '[' else _KEY
+                    elif c == (']' if top == '[' else '}'):
+                        stack.pop()
+                        if top == '[':
+                            events.append(('end_array', None))
+                        else:
+                            events.append(('end_object', None))
+                        pos += 1
+                        state = _NEXT if stack else _END
+                    else:
+                        raise JSONDecodeError(_EXPECTING[state], buf, pos)
+                else:
+                    raise JSONDecodeError("Extra data", buf, pos)
+        except JSONDecodeError as err:
+            raise self._error(err.msg, err.pos) from None
+        self._state = state
+        # Only keep the data which has not been parsed yet
+        self._buf = buf[pos:]
+        nl = buf.count('\n', 0, pos)
+        if nl:
+            self._lineno += nl
+            self._linestart = self._offset + buf.rindex('\n', 0, pos) + 1
+        self._offset += pos
@@ -75,6 +75,12 @@ logMultiprocessing = True
 #
 logProcesses = True
 
+#
+# The LogRecord attributes which are computed by Logger.findCaller()
+#
+_callerAttributes = frozenset(['pathname', 'filename', 'module', 'lineno',
+                               'funcName'])
+
 #---------------------------------------------------------------------------
 #   Level related stuff
 #---------------------------------------------------------------------------
@@ -242,9 +248,14 @@ class LogRecord(object):
     information to be logged.
     """
     def __init__(self, name, level, pathname, lineno,
-                 msg, args, exc_info, func=None, sinfo=None, **kwargs):
+                 msg, args, exc_info, func=None, sinfo=None, attributes=None,
+                 **kwargs):
         """
         Initialize a logging record with interesting information.
+
+        If attributes is not None, it is the set of the optional attributes
+        (thread, threadName, processName and process) which are needed: the
+        others are set to None without being computed.
         """
         ct = time.time()
         self.name = name
@@ -288,14 +299,20 @@ class LogRecord(object):
         self.created = ct
         self.msecs = (ct - int(ct)) * 1000
         self.relativeCreated = (self.created - _startTime) * 1000
-        if logThreads:
+        # The attributes are always assigned, in the same order, so that the
+        # instances share the keys of their __dict__.
+        if logThreads and (attributes is None or 'thread' in attributes):
             self.thread = threading.get_ident()
-            self.threadName = threading.current_thread().name
         else: # pragma: no cover
             self.thread = None
+        if logThreads and (attributes is None or 'threadName' in attributes):
+            self.threadName = threading.current_thread().name
+        else: # pragma: no cover
             self.threadName = None
         if not logMultiprocessing: # pragma: no cover
             self.processName = None
+        elif attributes is not None and 'processName' not in attributes:
+            self.processName = None
         else:
             self.processName = 'MainProcess'
             mp = sys.modules.get('multiprocessing')
@@ -308,7 +325,8 @@ class LogRecord(object):
                     self.processName = mp.current_process().name
                 except Exception: #pragma: no cover
                     pass
-        if logProcesses and hasattr(os, 'getpid'):
+        if (logProcesses and hasattr(os, 'getpid') and
+            (attributes is None or 'process' in attributes)):
             self.process = os.getpid()
         else:
             self.process = None
@@ -374,11 +392,22 @@ class PercentStyle(object):
     asctime_format = '%(asctime)s'
     asctime_search = '%(asctime)'
 
+    # (format string, whether it uses the time) for the last format string
+    _timeCheck = (None, False)
+
     def __init__(self, fmt):
         self._fmt = fmt or self.default_format
 
     def usesTime(self):
-        return self._fmt.find(self.asctime_search) >= 0
+        fmt, result = self._timeCheck
+        if fmt is not self._fmt:
+            fmt = self._fmt
+            result = self._checkTime(fmt)
+            self._timeCheck = (fmt, result)
+        return result
+
+    def _checkTime(self, fmt):
+        return fmt.find(self.asctime_search) >= 0
 
     def format(self, record):
         return self._fmt % record.__dict__
@@ -389,7 +418,7 @@ class StrFormatStyle(PercentStyle):
     asctime_search = '{asctime'
 
     def format(self, record):
-        return self._fmt.format(**record.__dict__)
+        return self._fmt.format_map(record.__dict__)
 
 
 class StringTemplateStyle(PercentStyle):
@@ -400,13 +429,36 @@ class StringTemplateStyle(PercentStyle):
     def __init__(self, fmt):
         self._fmt = fmt or self.default_format
         self._tpl = Template(self._fmt)
+        self._pfmt = self._compile(self._fmt)
+
+    @staticmethod
+    def _compile(fmt):
+        """
+        Translate a template into an equivalent %-format string, which is
+        faster to apply; return None if the template has invalid placeholders.
+        """
+        parts = []
+        pos = 0
+        for mo in Template.pattern.finditer(fmt):
+            parts.append(fmt[pos:mo.start()].replace('%', '%%'))
+            named = mo.group('named') or mo.group('braced')
+            if named is not None:
+                parts.append('%%(%s)s' % named)
+            elif mo.group('escaped') is not None:
+                parts.append(Template.delimiter)
+            else:
+                return None
+            pos = mo.end()
+        parts.append(fmt[pos:].replace('%', '%%'))
+        return ''.join(parts)
 
-    def usesTime(self):
-        fmt = self._fmt
+    def _checkTime(self, fmt):
         return fmt.find('$asctime') >= 0 or fmt.find(self.asctime_format) >= 0
 
     def format(self, record):
-        return self._tpl.substitute(**record.__dict__)
+        if self._pfmt is None:
+            return self._tpl.substitute(record.__dict__)
+        return self._pfmt % record.__dict__
 
 BASIC_FORMAT = "%(levelname)s:%(name)s:%(message)s"
 
@@ -460,6 +512,10 @@ class Formatter(object):
 
     converter = time.localtime
 
+    # (key, formatted time) for the second of the last record formatted by
+    # formatTime(): the records logged during the same second share it.
+    _timeCache = (None, None)
+
     def __init__(self, fmt=None, datefmt=None, style='%'):
         """
         Initialize the formatter with specified format strings.
@@ -502,14 +558,24 @@ class Formatter(object):
         time.localtime() or time.gmtime(). To change it for all formatters,
         for example if you want all logging times to be shown in GMT,
         set the 'converter' attribute in the Formatter class.
-        """
-        ct = self.converter(record.created)
+
+        The time formatted with strftime() is cached for the last second: the
+        converter must return the same time tuple for all the times of a
+        second, as time.localtime() and time.gmtime() do.
+        """
+        converter = self.converter
+        if not datefmt:
+            datefmt = None
+        key = (int(record.created), converter, datefmt,
+               self.default_time_format)
+        cachedKey, t = self._timeCache
+        if cachedKey != key:
+            ct = converter(record.created)
+            t = time.strftime(datefmt or self.default_time_format, ct)
+            self._timeCache = (key, t)
         if datefmt:
-            s = time.strftime(datefmt, ct)
-        else:
-            t = time.strftime(self.default_time_format, ct)
-            s = self.default_msec_format % (t, record.msecs)
-        return s
+            return t
+        return self.default_msec_format % (t, record.msecs)
 
     def formatException(self, ei):
         """
@@ -945,6 +1011,10 @@ class StreamHandler(Handler):
 
     terminator = '\n'
 
+    # Set by QueueListener.handle_batch() to flush once per batch of records
+    # rather than after each of them
+    _deferFlush = False
+
     def __init__(self, stream=None):
         """
         Initialize the handler.
@@ -983,7 +1053,8 @@ class StreamHandler(Handler):
             stream = self.stream
             stream.write(msg)
             stream.write(self.terminator)
-            self.flush()
+            if not self._deferFlush:
+                self.flush()
         except Exception:
             self.handleError(record)
 
@@ -1297,6 +1368,7 @@ class Logger(Filterer):
         self.propagate = True
         self.handlers = []
         self.disabled = False
+        self.recordAttributes = None
         self._cache = {}
 
     def setLevel(self, level):
@@ -1306,6 +1378,45 @@ class Logger(Filterer):
         self.level = _checkLevel(level)
         self.manager._clear_cache()
 
+    def setRecordAttributes(self, attributes):
+        """
+        Declare the LogRecord attributes needed by the handlers, filters and
+        formatters which process the records of this logger and its children.
+
+        attributes is an iterable of attribute names, or None to use the
+        attributes of the parent logger (all of them for the root logger).
+        The optional attributes which are not listed are set to None rather
+        than computed: the caller attributes (pathname, filename, module,
+        lineno and funcName, which require walking the stack), thread,
+        threadName, processName and process.
+        """
+        if attributes is not None:
+            attributes = frozenset(attributes)
+        self.recordAttributes = attributes
+        self.manager._clear_cache()
+
+    def getRecordAttributes(self):
+        """
+        Get the effective set of LogRecord attributes for this logger, or
+        None if all of them are needed.
+
+        Loop through this logger and its parents in the logger hierarchy,
+        looking for a set of attributes declared by setRecordAttributes().
+        """
+        # The result is cached together with the results of isEnabledFor()
+        try:
+            return self._cache['recordAttributes']
+        except KeyError:
+            logger = self
+            attributes = None
+            while logger:
+                if logger.recordAttributes is not None:
+                    attributes = logger.recordAttributes
+                    break
+                logger = logger.parent
+            self._cache['recordAttributes'] = attributes
+            return attributes
+
     def debug(self, msg, *args, **kwargs):
         """
         Log 'msg % args' with severity 'DEBUG'.
@@ -1432,8 +1543,13 @@ class Logger(Filterer):
         A factory method which can be overridden in subclasses to create
         specialized LogRecords.
         """
-        rv = _logRecordFactory(name, level, fn, lno, msg, args, exc_info, func,
-                             sinfo)
+        attributes = self.getRecordAttributes()
+        if attributes is None:
+            rv = _logRecordFactory(name, level, fn, lno, msg, args, exc_info,
+                                   func, sinfo)
+        else:
+            rv = _logRecordFactory(name, level, fn, lno, msg, args, exc_info,
+                                   func, sinfo, attributes=attributes)
         if extra is not None:
             for key in extra:
                 if (key in ["message", "asctime"]) or (key in rv.__dict__):
@@ -1447,7 +1563,9 @@ class Logger(Filterer):
         all the handlers of this logger to handle the record.
         """
         sinfo = None
-        if _srcfile:
+        attributes = self.getRecordAttributes()
+        if _srcfile and (attributes is None or stack_info or
+                         not _callerAttributes.isdisjoint(attributes)):
             #IronPython doesn't track Python frames, so findCaller raises an
             #exception on some versions of IronPython. We trap it here so that
             #IronPython can use logging.
@@ -28,6 +28,7 @@ import errno
 import io
 import logging
 import logging.handlers
+import queue
 import re
 import struct
 import sys
@@ -73,8 +74,7 @@ def fileConfig(fname, defaults=None, disable_existing_loggers=True):
     # critical section
     logging._acquireLock()
     try:
-        logging._handlers.clear()
-        del logging._handlerList[:]
+        _clearExistingHandlers()
         # Handlers add themselves to logging._handlers
         handlers = _install_handlers(cp, formatters)
         _install_loggers(cp, handlers, disable_existing_loggers)
@@ -96,6 +96,19 @@ def _resolve(name):
             found = getattr(found, n)
     return found
 
+def _clearExistingHandlers():
+    """Clear the existing handlers.
+
+    The queue handlers are closed: this stops their listeners, which would
+    otherwise keep running and could lose queued records at exit.
+    """
+    for ref in logging._handlerList[:]:
+        handler = ref()
+        if isinstance(handler, logging.handlers.QueueHandler):
+            handler.close()
+    logging._handlers.clear()
+    del logging._handlerList[:]
+
 def _strip_spaces(alist):
     return map(str.strip, alist)
 
@@ -524,8 +537,7 @@ class DictConfigurator(BaseConfigurator):
             else:
                 disable_existing = config.pop('disable_existing_loggers', True)
 
-                logging._handlers.clear()
-                del logging._handlerList[:]
+                _clearExistingHandlers()
 
                 # Do formatters first - they don't refer to anything else
                 formatters = config.get('formatters', EMPTY_DICT)
@@ -695,6 +707,7 @@ class DictConfigurator(BaseConfigurator):
                                  '%r' % formatter) from e
         level = config.pop('level', None)
         filters = config.pop('filters', None)
+        listener = None
         if '()' in config:
             c = config.pop('()')
             if not callable(c):
@@ -715,6 +728,11 @@ class DictConfigurator(BaseConfigurator):
                 except Exception as e:
                     raise ValueError('Unable to set target handler '
                                      '%r' % config['target']) from e
+            #Special case for handler which feeds other handlers through a
+            #queue and a listener thread
+            elif issubclass(klass, logging.handlers.QueueHandler) and\
+                'handlers' in config:
+                listener = self.configure_queue_listener(config, config_copy)
             elif issubclass(klass, logging.handlers.SMTPHandler) and\
                 'mailhost' in config:
                 config['mailhost'] = self.as_tuple(config['mailhost'])
@@ -744,8 +762,51 @@ class DictConfigurator(BaseConfigurator):
         if props:
             for name, value in props.items():
                 setattr(result, name, value)
+        if listener is not None:
+            result.listener = listener(result.queue)
+            result.listener.start()
         return result
 
+    def configure_queue_listener(self, config, config_copy):
+        """
+        Prepare the listener of a QueueHandler from its configuration.
+
+        The 'handlers', 'listener', 'respect_handler_level' and 'batch_size'
+        keys are removed from config, and the queue is created if needed.
+        Return a callable which takes the queue and returns the listener.
+        """
+        targets = []
+        for name in config.pop('handlers'):
+            try:
+                th = self.config['handlers'][name]
+                if not isinstance(th, logging.Handler):
+                    config.update(config_copy)  # restore for deferred cfg
+                    raise TypeError('target not configured yet')
+                targets.append(th)
+            except Exception as e:
+                raise ValueError('Unable to set target handler '
+                                 '%r' % name) from e
+        q = config.get('queue')
+        if q is None:
+            q = queue.Queue()
+        else:
+            if isinstance(q, str):
+                q = self.resolve(q)
+            if callable(q):
+                q = q()
+        config['queue'] = q
+        klass = config.pop('listener', logging.handlers.QueueListener)
+        if isinstance(klass, str):
+            klass = self.resolve(klass)
+        respect_handler_level = bool(config.pop('respect_handler_level',
+                                                False))
+        batch_size = int(config.pop('batch_size', 100))
+        def listener(q):
+            return klass(q, *targets,
+                         respect_handler_level=respect_handler_level,
+                         batch_size=batch_size)
+        return listener
+
     def add_handlers(self, logger, handlers):
         """Add handlers to a logger from a list of names."""
         for h in handlers:
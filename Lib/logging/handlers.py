@@ -41,21 +41,50 @@ SYSLOG_TCP_PORT             = 514
 
 _MIDNIGHT = 24 * 60 * 60  # number of seconds in a day
 
+# Module and filename suffix of the compressions supported by rotating handlers
+_COMPRESSIONS = {
+    'gzip': ('gzip', '.gz'),
+    'bz2': ('bz2', '.bz2'),
+    'lzma': ('lzma', '.xz'),
+}
+
+def _compress_file(source, dest, module):
+    """
+    Compress source into dest and remove source.
+    """
+    module = __import__(module)
+    with open(source, 'rb') as sf:
+        with module.open(dest, 'wb') as df:
+            while True:
+                data = sf.read(1024 * 1024)
+                if not data:
+                    break
+                df.write(data)
+    os.remove(source)
+
 class BaseRotatingHandler(logging.FileHandler):
     """
     Base class for handlers that rotate log files at a certain point.
     Not meant to be instantiated directly.  Instead, use RotatingFileHandler
     or TimedRotatingFileHandler.
     """
-    def __init__(self, filename, mode, encoding=None, delay=False):
+    def __init__(self, filename, mode, encoding=None, delay=False,
+                 compression=None):
         """
-        Use the specified filename for streamed logging
+        Use the specified filename for streamed logging.
+
+        If compression is 'gzip', 'bz2' or 'lzma', the rotated files are
+        compressed on a background thread.
         """
+        if compression is not None and compression not in _COMPRESSIONS:
+            raise ValueError("Unsupported compression: %r" % (compression,))
         logging.FileHandler.__init__(self, filename, mode, encoding, delay)
         self.mode = mode
         self.encoding = encoding
         self.namer = None
         self.rotator = None
+        self.compression = compression
+        self._compressThread = None
 
     def emit(self, record):
         """
@@ -88,6 +117,8 @@ class BaseRotatingHandler(logging.FileHandler):
             result = default_name
         else:
             result = self.namer(default_name)
+        if self.compression is not None:
+            result += _COMPRESSIONS[self.compression][1]
         return result
 
     def rotate(self, source, dest):
@@ -97,7 +128,9 @@ class BaseRotatingHandler(logging.FileHandler):
         The default implementation calls the 'rotator' attribute of the
         handler, if it's callable, passing the source and dest arguments to
         it. If the attribute isn't callable (the default is None), the source
-        is simply renamed to the destination.
+        is simply renamed to the destination.  If compression is set, the
+        source is renamed to a temporary file which is compressed into the
+        destination on a background thread.
 
         :param source: The source filename. This is normally the base
                        filename, e.g. 'test.log'
@@ -107,16 +140,45 @@ class BaseRotatingHandler(logging.FileHandler):
         if not callable(self.rotator):
             # Issue 18940: A file may not have been created if delay is True.
             if os.path.exists(source):
-                os.rename(source, dest)
+                if self.compression is None:
+                    os.rename(source, dest)
+                else:
+                    self.waitForRotation()
+                    tmp = source + '.rotating'
+                    os.rename(source, tmp)
+                    module = _COMPRESSIONS[self.compression][0]
+                    t = threading.Thread(target=_compress_file,
+                                         args=(tmp, dest, module))
+                    t.daemon = True
+                    t.start()
+                    self._compressThread = t
         else:
             self.rotator(source, dest)
 
+    def waitForRotation(self):
+        """
+        Wait until the compression of the last rotated file is done.
+        """
+        t = self._compressThread
+        if t is not None:
+            t.join()
+            self._compressThread = None
+
+    def close(self):
+        """
+        Closes the stream, after waiting for the compression of the last
+        rotated file.
+        """
+        self.waitForRotation()
+        logging.FileHandler.close(self)
+
 class RotatingFileHandler(BaseRotatingHandler):
     """
     Handler for logging to a set of files, which switches from one file
     to the next when the current file reaches a certain size.
     """
-    def __init__(self, filename, mode='a', maxBytes=0, backupCount=0, encoding=None, delay=False):
+    def __init__(self, filename, mode='a', maxBytes=0, backupCount=0,
+                 encoding=None, delay=False, compression=None):
         """
         Open the specified file and use it as the stream for logging.
 
@@ -136,6 +198,13 @@ class RotatingFileHandler(BaseRotatingHandler):
         respectively.
 
         If maxBytes is zero, rollover never occurs.
+
+        If compression is 'gzip', 'bz2' or 'lzma', the backup files are
+        compressed, on a background thread, and named "app.log.1.gz" etc.
+
+        The size of the file is only read when the file is opened: the handler
+        then adds the size of the records it writes, so other processes must
+        not write to the same file.
         """
         # If rotation/rollover is wanted, it doesn't make sense to use another
         # mode. If for example 'w' were specified, then if there were multiple
@@ -144,14 +213,52 @@ class RotatingFileHandler(BaseRotatingHandler):
         # on each run.
         if maxBytes > 0:
             mode = 'a'
-        BaseRotatingHandler.__init__(self, filename, mode, encoding, delay)
+        # Size of the file, or None if it has to be read from the file; and
+        # (record, formatted record, size) computed by shouldRollover()
+        self._size = None
+        self._formatted = None
+        BaseRotatingHandler.__init__(self, filename, mode, encoding, delay,
+                                     compression)
         self.maxBytes = maxBytes
         self.backupCount = backupCount
 
+    def _open(self):
+        """
+        Open the current base file and note that its size is unknown.
+        """
+        self._size = None
+        return BaseRotatingHandler._open(self)
+
+    def emit(self, record):
+        """
+        Emit a record.
+
+        The record is formatted only once, by shouldRollover(), and the size
+        of the file is updated after it is written.
+        """
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            formatted = self._formatted
+            self._formatted = None
+            if formatted is None or formatted[0] is not record:
+                formatted = (record, self.format(record) + self.terminator,
+                             None)
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(formatted[1])
+            if not self._deferFlush:
+                self.flush()
+            if self._size is not None and formatted[2] is not None:
+                self._size += formatted[2]
+        except Exception:
+            self.handleError(record)
+
     def doRollover(self):
         """
         Do a rollover, as described in __init__().
         """
+        self.waitForRotation()
         if self.stream:
             self.stream.close()
             self.stream = None
@@ -181,9 +288,17 @@ class RotatingFileHandler(BaseRotatingHandler):
         if self.stream is None:                 # delay was set...
             self.stream = self._open()
         if self.maxBytes > 0:                   # are we rolling over?
-            msg = "%s\n" % self.format(record)
-            self.stream.seek(0, 2)  #due to non-posix-compliant Windows feature
-            if self.stream.tell() + len(msg) >= self.maxBytes:
+            msg = self.format(record) + self.terminator
+            size = len(msg.encode(self.stream.encoding or 'utf-8',
+                                  'replace'))
+            if os.linesep != '\n':
+                size += msg.count('\n') * (len(os.linesep) - 1)
+            self._formatted = (record, msg, size)
+            if self._size is None:
+                # due to non-posix-compliant Windows feature
+                self.stream.seek(0, 2)
+                self._size = self.stream.tell()
+            if self._size + size >= self.maxBytes:
                 return 1
         return 0
 
@@ -195,8 +310,11 @@ class TimedRotatingFileHandler(BaseRotatingHandler):
     If backupCount is > 0, when rollover is done, no more than backupCount
     files are kept - the oldest ones are deleted.
     """
-    def __init__(self, filename, when='h', interval=1, backupCount=0, encoding=None, delay=False, utc=False, atTime=None):
-        BaseRotatingHandler.__init__(self, filename, 'a', encoding, delay)
+    def __init__(self, filename, when='h', interval=1, backupCount=0,
+                 encoding=None, delay=False, utc=False, atTime=None,
+                 compression=None):
+        BaseRotatingHandler.__init__(self, filename, 'a', encoding, delay,
+                                     compression)
         self.when = when.upper()
         self.backupCount = backupCount
         self.utc = utc
@@ -368,6 +486,7 @@ class TimedRotatingFileHandler(BaseRotatingHandler):
         then we have to get a list of matching filenames, sort them and remove
         the one with the oldest suffix.
         """
+        self.waitForRotation()
         if self.stream:
             self.stream.close()
             self.stream = None
@@ -1346,6 +1465,7 @@ class QueueHandler(logging.Handler):
         """
         logging.Handler.__init__(self)
         self.queue = queue
+        self.listener = None
 
     def enqueue(self, record):
         """
@@ -1394,6 +1514,19 @@ class QueueHandler(logging.Handler):
         except Exception:
             self.handleError(record)
 
+    def close(self):
+        """
+        Tidies up any resources used by the handler.
+
+        If a listener is attached to the handler, as done by dictConfig(),
+        it is stopped, which handles the records still in the queue.
+        """
+        listener = self.listener
+        if listener is not None:
+            self.listener = None
+            listener.stop()
+        logging.Handler.close(self)
+
 
 class QueueListener(object):
     """
@@ -1403,15 +1536,21 @@ class QueueListener(object):
     """
     _sentinel = None
 
-    def __init__(self, queue, *handlers, respect_handler_level=False):
+    def __init__(self, queue, *handlers, respect_handler_level=False,
+                 batch_size=1):
         """
         Initialise an instance with the specified queue and
         handlers.
+
+        If batch_size is greater than 1, up to that many records already
+        waiting in the queue are dequeued together and passed to
+        handle_batch().
         """
         self.queue = queue
         self.handlers = handlers
         self._thread = None
         self.respect_handler_level = respect_handler_level
+        self.batch_size = batch_size
 
     def dequeue(self, block):
         """
@@ -1459,6 +1598,50 @@ class QueueListener(object):
             if process:
                 handler.handle(record)
 
+    def handle_batch(self, records):
+        """
+        Handle a list of records.
+
+        This passes the records to each handler in turn.  The lock of the
+        handler is taken once for the whole batch, the records are filtered
+        and emitted under it, and stream handlers are flushed once at the end
+        of the batch.  If handle() is overridden, in the listener or in a
+        handler, it is called for each record instead.
+        """
+        if type(self).handle is not QueueListener.handle:
+            for record in records:
+                self.handle(record)
+            return
+        records = [self.prepare(record) for record in records]
+        for handler in self.handlers:
+            if self.respect_handler_level:
+                level = handler.level
+                batch = [r for r in records if r.levelno >= level]
+            else:
+                batch = records
+            if not batch:
+                continue
+            if type(handler).handle is not logging.Handler.handle:
+                for record in batch:
+                    handler.handle(record)
+                continue
+            stream = isinstance(handler, logging.StreamHandler)
+            handler.acquire()
+            try:
+                if stream:
+                    handler._deferFlush = True
+                try:
+                    for record in batch:
+                        if handler.filter(record):
+                            handler.emit(record)
+                finally:
+                    if stream:
+                        del handler._deferFlush
+                if stream:
+                    handler.flush()
+            finally:
+                handler.release()
+
     def _monitor(self):
         """
         Monitor the queue for records, and ask the handler
@@ -1474,9 +1657,27 @@ class QueueListener(object):
                 record = self.dequeue(True)
                 if record is self._sentinel:
                     break
-                self.handle(record)
+                records = [record]
+                stop = False
+                # Take the records which are already waiting in the queue
+                while len(records) < self.batch_size:
+                    try:
+                        record = self.dequeue(False)
+                    except queue.Empty:
+                        break
+                    if record is self._sentinel:
+                        stop = True
+                        break
+                    records.append(record)
+                if self.batch_size > 1:
+                    self.handle_batch(records)
+                else:
+                    self.handle(record)
                 if has_task_done:
-                    q.task_done()
+                    for record in records:
+                        q.task_done()
+                if stop:
+                    break
             except queue.Empty:
                 break
 
@@ -1497,7 +1698,10 @@ class QueueListener(object):
         This asks the thread to terminate, and then waits for it to do so.
         Note that if you don't call this before your application exits, there
         may be some records still left on the queue, which won't be processed.
+        Calling this method when the listener is not running does nothing.
         """
+        if self._thread is None:
+            return
         self.enqueue_sentinel()
         self._thread.join()
         self._thread = None
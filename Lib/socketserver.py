@@ -21,6 +21,8 @@ For request-based servers (including socket-based):
         - synchronous (one request is handled at a time)
         - forking (each request is handled by a new process)
         - threading (each request is handled by a new thread)
+        - thread pool (requests are handled by a pool of threads)
+        - prefork (requests are handled by a fixed set of processes)
 
 The classes in this module favor the server type that is simplest to
 write: a synchronous TCP/IP server.  This is bad class design, but
@@ -49,9 +51,10 @@ UnixStreamServer -- the only difference between an IP and a Unix
 stream server is the address family, which is simply repeated in both
 unix server classes.
 
-Forking and threading versions of each type of server can be created
-using the ForkingMixIn and ThreadingMixIn mix-in classes.  For
-instance, a threading UDP server class is created as follows:
+Forking, threading, thread pool and prefork versions of each type of
+server can be created using the ForkingMixIn, ThreadingMixIn,
+ThreadPoolMixIn and PreforkMixIn mix-in classes.  For instance, a
+threading UDP server class is created as follows:
 
         class ThreadingUDPServer(ThreadingMixIn, UDPServer): pass
 
@@ -126,17 +129,28 @@ __version__ = "0.4"
 import socket
 import selectors
 import os
+import queue
+import signal
 import sys
 import threading
 from io import BufferedIOBase
 from time import monotonic as time
 
+try:
+    _IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = -1
+if _IOV_MAX <= 0:
+    _IOV_MAX = 16   # the POSIX minimum
+
 __all__ = ["BaseServer", "TCPServer", "UDPServer",
            "ThreadingUDPServer", "ThreadingTCPServer",
+           "ThreadPoolUDPServer", "ThreadPoolTCPServer",
            "BaseRequestHandler", "StreamRequestHandler",
-           "DatagramRequestHandler", "ThreadingMixIn"]
+           "DatagramRequestHandler", "ThreadingMixIn", "ThreadPoolMixIn"]
 if hasattr(os, "fork"):
-    __all__.extend(["ForkingUDPServer","ForkingTCPServer", "ForkingMixIn"])
+    __all__.extend(["ForkingUDPServer","ForkingTCPServer", "ForkingMixIn",
+                    "PreforkUDPServer", "PreforkTCPServer", "PreforkMixIn"])
 if hasattr(socket, "AF_UNIX"):
     __all__.extend(["UnixStreamServer","UnixDatagramServer",
                     "ThreadingUnixStreamServer",
@@ -622,6 +636,175 @@ if hasattr(os, "fork"):
             super().server_close()
             self.collect_children(blocking=True)
 
+    class PreforkMixIn:
+        """Mix-in class to handle requests in a fixed set of processes.
+
+        serve_forever() starts self.workers processes which accept and
+        handle requests in parallel, and restarts them when they exit.
+        The worker processes share the listening socket, unless
+        reuse_port is true: each new worker then binds its own socket with
+        SO_REUSEPORT, and the kernel balances the requests between them.
+        """
+
+        workers = 4
+        reuse_port = False
+        # PIDs of the worker processes, only set in the parent process
+        worker_pids = None
+        # Set in a worker process by SIGTERM
+        _worker_stopping = False
+
+        def __init__(self, *args, **kwargs):
+            self.__shutdown_request = threading.Event()
+            self.__is_shut_down = threading.Event()
+            super().__init__(*args, **kwargs)
+
+        def server_bind(self):
+            if self.reuse_port:
+                if not hasattr(socket, 'SO_REUSEPORT'):
+                    raise ValueError('reuse_port not supported by socket module')
+                self.socket.setsockopt(socket.SOL_SOCKET,
+                                       socket.SO_REUSEPORT, 1)
+            super().server_bind()
+
+        def serve_forever(self, poll_interval=0.5):
+            """Run the worker processes until shutdown.
+
+            Workers which exited are restarted every poll_interval seconds.
+            """
+            self.__is_shut_down.clear()
+            try:
+                if self.worker_pids is None:
+                    self.worker_pids = set()
+                while not self.__shutdown_request.is_set():
+                    self.collect_workers()
+                    while len(self.worker_pids) < self.workers:
+                        self.start_worker(poll_interval)
+                    self.service_actions()
+                    self.__shutdown_request.wait(poll_interval)
+            finally:
+                self.stop_workers()
+                self.__shutdown_request.clear()
+                self.__is_shut_down.set()
+
+        def shutdown(self):
+            """Stops the serve_forever loop and the worker processes.
+
+            Blocks until the workers have finished their current request.
+            This must be called while serve_forever() is running in another
+            thread, or it will deadlock.
+            """
+            self.__shutdown_request.set()
+            self.__is_shut_down.wait()
+
+        def start_worker(self, poll_interval=0.5):
+            """Fork a new worker process."""
+            sock = None
+            if self.reuse_port and self.socket.fileno() == -1:
+                # The socket of the parent process went to the first worker
+                sock = self.make_worker_socket()
+            try:
+                pid = os.fork()
+            except:
+                if sock is not None:
+                    sock.close()
+                raise
+            if pid:
+                # Parent process
+                self.worker_pids.add(pid)
+                if sock is not None:
+                    sock.close()
+                if self.reuse_port:
+                    # Requests must not be queued on a socket from which
+                    # no worker accepts.
+                    self.socket.close()
+                return
+            # Worker process.
+            # This must never return, hence os._exit()!
+            status = 1
+            try:
+                if sock is not None:
+                    self.socket.close()
+                    self.socket = sock
+                self.serve_worker(poll_interval)
+                status = 0
+            except Exception:
+                import traceback
+                traceback.print_exc()
+            finally:
+                os._exit(status)
+
+        def make_worker_socket(self):
+            """Create the socket of a new worker when reuse_port is true."""
+            sock = socket.socket(self.address_family, self.socket_type)
+            try:
+                if self.allow_reuse_address:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+                sock.bind(self.server_address)
+                if self.socket_type == socket.SOCK_STREAM:
+                    sock.listen(self.request_queue_size)
+            except:
+                sock.close()
+                raise
+            return sock
+
+        def serve_worker(self, poll_interval=0.5):
+            """Handle requests in a worker process until SIGTERM."""
+            self.worker_pids = None
+            signal.signal(signal.SIGTERM, self._stop_worker)
+            # The workers wait for the socket to be readable in parallel,
+            # but only one of them gets each request: the others must not
+            # block in get_request().
+            self.socket.setblocking(False)
+            with _ServerSelector() as selector:
+                selector.register(self, selectors.EVENT_READ)
+
+                while not self._worker_stopping:
+                    ready = selector.select(poll_interval)
+                    if ready:
+                        self._handle_request_noblock()
+
+                    self.service_actions()
+
+        def _stop_worker(self, signum, frame):
+            self._worker_stopping = True
+
+        def get_request(self):
+            request, client_address = super().get_request()
+            if isinstance(request, socket.socket):
+                # The accepted socket may inherit the non-blocking mode of
+                # the listening socket.
+                request.setblocking(True)
+            return request, client_address
+
+        def collect_workers(self):
+            """Wait for the worker processes that have exited."""
+            for pid in self.worker_pids.copy():
+                try:
+                    pid, _ = os.waitpid(pid, os.WNOHANG)
+                    # if the worker hasn't exited yet, pid will be 0 and
+                    # ignored by discard() below
+                    self.worker_pids.discard(pid)
+                except ChildProcessError:
+                    # someone else reaped it
+                    self.worker_pids.discard(pid)
+
+        def stop_workers(self):
+            """Terminate the worker processes and wait for them."""
+            if not self.worker_pids:
+                return
+            for pid in self.worker_pids:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+            for pid in self.worker_pids:
+                try:
+                    os.waitpid(pid, 0)
+                except ChildProcessError:
+                    pass
+            self.worker_pids.clear()
+
 
 class ThreadingMixIn:
     """Mix-in class to handle each request in a new thread."""
@@ -666,12 +849,61 @@ class ThreadingMixIn:
                 thread.join()
 
 
+class ThreadPoolMixIn(ThreadingMixIn):
+    """Mix-in class to handle requests in a pool of reusable threads.
+
+    Requests are queued until one of the pool_size threads is free.  When
+    pool_queue_size requests are already waiting, the server stops getting
+    new requests until a thread takes one.
+    """
+
+    pool_size = 8
+    pool_queue_size = 64
+    _pool_queue = None
+
+    def process_request_pool(self, pool_queue):
+        """Handle the queued requests until None is queued."""
+        while True:
+            item = pool_queue.get()
+            if item is None:
+                break
+            self.process_request_thread(*item)
+
+    def process_request(self, request, client_address):
+        """Queue the request for a thread of the pool."""
+        if self._pool_queue is None:
+            self._pool_queue = queue.Queue(self.pool_queue_size)
+            for i in range(self.pool_size):
+                t = threading.Thread(target = self.process_request_pool,
+                                     args = (self._pool_queue,))
+                t.daemon = self.daemon_threads
+                if not t.daemon:
+                    if self._threads is None:
+                        self._threads = []
+                    self._threads.append(t)
+                t.start()
+        self._pool_queue.put((request, client_address))
+
+    def server_close(self):
+        # The threads handle the requests already queued, then exit.
+        pool_queue = self._pool_queue
+        self._pool_queue = None
+        if pool_queue is not None:
+            for i in range(self.pool_size):
+                pool_queue.put(None)
+        super().server_close()
+
+
 if hasattr(os, "fork"):
     class ForkingUDPServer(ForkingMixIn, UDPServer): pass
     class ForkingTCPServer(ForkingMixIn, TCPServer): pass
+    class PreforkUDPServer(PreforkMixIn, UDPServer): pass
+    class PreforkTCPServer(PreforkMixIn, TCPServer): pass
 
 class ThreadingUDPServer(ThreadingMixIn, UDPServer): pass
 class ThreadingTCPServer(ThreadingMixIn, TCPServer): pass
+class ThreadPoolUDPServer(ThreadPoolMixIn, UDPServer): pass
+class ThreadPoolTCPServer(ThreadPoolMixIn, TCPServer): pass
 
 if hasattr(socket, 'AF_UNIX'):
 
@@ -795,6 +1027,34 @@ class _SocketWriter(BufferedIOBase):
     def fileno(self):
         return self._sock.fileno()
 
+    def writelines(self, lines):
+        views = [view for view in (memoryview(b).cast('B') for b in lines)
+                 if view.nbytes]
+        if not hasattr(self._sock, 'sendmsg'):
+            for view in views:
+                self._sock.sendall(view)
+            return
+        # Gather the buffers into as few sendmsg() calls as possible
+        while views:
+            try:
+                sent = self._sock.sendmsg(views[:_IOV_MAX])
+            except NotImplementedError:
+                # SSL sockets don't support sendmsg()
+                for view in views:
+                    self._sock.sendall(view)
+                return
+            i = 0
+            while sent >= views[i].nbytes:
+                sent -= views[i].nbytes
+                i += 1
+                if i == len(views):
+                    return
+            views[i] = views[i][sent:]
+            del views[:i]
+
+    def sendfile(self, file, offset=0, count=None):
+        return self._sock.sendfile(file, offset, count)
+
 class DatagramRequestHandler(BaseRequestHandler):
 
     """Define self.rfile and self.wfile for datagram sockets."""
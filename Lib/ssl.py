@@ -6,6 +6,7 @@
 Object types:
 
   SSLSocket -- subtype of socket.socket which does SSL over the socket
+  SSLSessionCache -- cache of client sessions, keyed by server name and port
 
 Exceptions:
 
@@ -94,7 +95,9 @@ import ipaddress
 import re
 import sys
 import os
-from collections import namedtuple
+import time as _time
+from collections import namedtuple, OrderedDict as _OrderedDict
+from _thread import allocate_lock as _allocate_lock
 from enum import Enum as _Enum, IntEnum as _IntEnum, IntFlag as _IntFlag
 
 import _ssl             # if we can't import it, let the error propagate
@@ -391,6 +394,7 @@ class SSLContext(_SSLContext):
 
     sslsocket_class = None  # SSLSocket is assigned later.
     sslobject_class = None  # SSLObject is assigned later.
+    session_cache = None    # Client sessions to resume, see SSLSessionCache
 
     def __new__(cls, protocol=PROTOCOL_TLS, *args, **kwargs):
         self = _SSLContext.__new__(cls, protocol)
@@ -494,6 +498,53 @@ class SSLContext(_SSLContext):
         super(SSLContext, SSLContext).verify_mode.__set__(self, value)
 
 
+class SSLSessionCache:
+    """Cache of client-side SSL sessions, keyed by server name and port.
+
+    When an instance is assigned to the session_cache attribute of an
+    SSLContext, http.client, urllib.request and asyncio resume the sessions
+    of the servers they connect to with the context.  Any object with the
+    same get() and put() methods can be used instead.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._sessions = _OrderedDict()
+        self._lock = _allocate_lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def get(self, server_hostname, port):
+        """Return the session to resume for the server, or None."""
+        key = (server_hostname, port)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                return None
+            if session.time + session.timeout <= _time.time():
+                del self._sessions[key]
+                return None
+            self._sessions.move_to_end(key)
+            return session
+
+    def put(self, server_hostname, port, session):
+        """Store the session of a connection to the server."""
+        if session is None:
+            return
+        key = (server_hostname, port)
+        with self._lock:
+            self._sessions[key] = session
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.maxsize:
+                self._sessions.popitem(last=False)
+
+    def clear(self):
+        """Remove all the sessions."""
+        with self._lock:
+            self._sessions.clear()
+
+
 def create_default_context(purpose=Purpose.SERVER_AUTH, *, cafile=None,
                            capath=None, cadata=None):
     """Create a SSLContext object with default settings.
@@ -514,6 +565,7 @@ def create_default_context(purpose=Purpose.SERVER_AUTH, *, cafile=None,
         # verify certs and host name in client mode
         context.verify_mode = CERT_REQUIRED
         context.check_hostname = True
+        context.session_cache = SSLSessionCache()
     elif purpose == Purpose.CLIENT_AUTH:
         context.set_ciphers(_RESTRICTED_SERVER_CIPHERS)
 
@@ -551,6 +603,8 @@ def _create_unverified_context(protocol=PROTOCOL_TLS, *, cert_reqs=CERT_NONE,
         context.verify_mode = cert_reqs
     if check_hostname:
         context.check_hostname = True
+    if purpose == Purpose.SERVER_AUTH:
+        context.session_cache = SSLSessionCache()
 
     if keyfile and not certfile:
         raise ValueError("certfile must be specified")
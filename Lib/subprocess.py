@@ -153,6 +153,12 @@ else:
     else:
         _PopenSelector = selectors.SelectSelector
 
+    # Let _posixsubprocess create children with vfork() when no preexec_fn
+    # is given, so that spawning does not copy the parent's page tables.
+    # This is a fail-safe knob: a true value does not guarantee that
+    # vfork() is used on the platform.
+    _USE_VFORK = True
+
 
 __all__ = ["Popen", "PIPE", "STDOUT", "call", "check_call", "getstatusoutput",
            "getoutput", "check_output", "run", "CalledProcessError", "DEVNULL",
@@ -1332,7 +1338,8 @@ class Popen(object):
                             p2cread, p2cwrite, c2pread, c2pwrite,
                             errread, errwrite,
                             errpipe_read, errpipe_write,
-                            restore_signals, start_new_session, preexec_fn)
+                            restore_signals, start_new_session, preexec_fn,
+                            _USE_VFORK)
                     self._child_created = True
                 finally:
                     # be sure the FD is closed no matter what
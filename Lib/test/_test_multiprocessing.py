@@ -19,6 +19,7 @@ import random
 import logging
 import struct
 import operator
+import pickle
 import weakref
 import test.support
 import test.support.script_helper
@@ -55,6 +56,12 @@ try:
 except ImportError:
     HAS_SHAREDCTYPES = False
 
+try:
+    from multiprocessing import shared_memory
+    HAS_SHMEM = True
+except ImportError:
+    HAS_SHMEM = False
+
 try:
     import msvcrt
 except ImportError:
@@ -3421,6 +3428,200 @@ class _TestSharedCTypes(BaseTestCase):
 #
 #
 
+@unittest.skipUnless(HAS_SHMEM, "requires multiprocessing.shared_memory")
+class _TestSharedMemory(BaseTestCase):
+
+    ALLOWED_TYPES = ('processes',)
+
+    @staticmethod
+    def _attach_existing_shmem_then_write(shmem_name_or_obj, binary_data):
+        if isinstance(shmem_name_or_obj, str):
+            local_sms = shared_memory.SharedMemory(shmem_name_or_obj)
+        else:
+            local_sms = shmem_name_or_obj
+        local_sms.buf[:len(binary_data)] = binary_data
+        local_sms.close()
+
+    def test_shared_memory_basics(self):
+        sms = shared_memory.SharedMemory(create=True, size=512)
+        self.addCleanup(sms.unlink)
+        self.addCleanup(sms.close)
+
+        # Verify attributes are readable.
+        self.assertGreaterEqual(sms.size, 512)
+        self.assertGreaterEqual(len(sms.buf), sms.size)
+        self.assertIn(sms.name, str(sms))
+
+        # Modify contents of shared memory segment through memoryview.
+        sms.buf[0] = 42
+        self.assertEqual(sms.buf[0], 42)
+
+        # Attach to existing shared memory segment.
+        also_sms = shared_memory.SharedMemory(sms.name)
+        self.assertEqual(also_sms.buf[0], 42)
+        also_sms.close()
+
+        # Creating a block that already exists must fail.
+        with self.assertRaises(FileExistsError):
+            shared_memory.SharedMemory(sms.name, create=True, size=512)
+
+        # Attaching to a block that does not exist must fail.
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory('test_mp_no_such_block')
+
+        with self.assertRaises(ValueError):
+            shared_memory.SharedMemory(create=True, size=-2)
+        with self.assertRaises(ValueError):
+            shared_memory.SharedMemory(create=False)
+
+    def test_shared_memory_across_processes(self):
+        sms = shared_memory.SharedMemory(create=True, size=512)
+        self.addCleanup(sms.unlink)
+        self.addCleanup(sms.close)
+
+        # Verify remote attachment to existing block by name is working.
+        p = self.Process(
+            target=self._attach_existing_shmem_then_write,
+            args=(sms.name, b'howdy')
+        )
+        p.daemon = True
+        p.start()
+        p.join()
+        self.assertEqual(bytes(sms.buf[:5]), b'howdy')
+
+        # Verify pickling of SharedMemory instance also works.
+        p = self.Process(
+            target=self._attach_existing_shmem_then_write,
+            args=(sms, b'HELLO')
+        )
+        p.daemon = True
+        p.start()
+        p.join()
+        self.assertEqual(bytes(sms.buf[:5]), b'HELLO')
+
+    def test_shared_memory_unlink(self):
+        sms = shared_memory.SharedMemory(create=True, size=64)
+        name = sms.name
+        sms.close()
+        sms.unlink()
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name)
+
+    def test_shared_memory_SharedMemoryManager_basics(self):
+        smm1 = multiprocessing.managers.SharedMemoryManager()
+        with self.assertRaises(ValueError):
+            smm1.SharedMemory(size=9)  # Fails if SharedMemoryServer not started
+        smm1.start()
+        lol = [ smm1.ShareableList(range(i)) for i in range(5, 10) ]
+        lom = [ smm1.SharedMemory(size=j) for j in range(32, 128, 16) ]
+        doppleganger_list0 = shared_memory.ShareableList(name=lol[0].shm.name)
+        self.assertEqual(len(doppleganger_list0), 5)
+        doppleganger_shm0 = shared_memory.SharedMemory(name=lom[0].name)
+        self.assertGreaterEqual(len(doppleganger_shm0.buf), 32)
+        held_name = lom[0].name
+        doppleganger_list0.shm.close()
+        doppleganger_shm0.close()
+        for sl in lol:
+            sl.shm.close()
+        for sm in lom:
+            sm.close()
+        smm1.shutdown()
+        # Manager shutdown must have released all tracked segments.
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=held_name)
+
+    def test_shared_memory_ShareableList_basics(self):
+        sl = shared_memory.ShareableList(
+            ['howdy', b'HoWdY', -273.154, 100, None, True, 42]
+        )
+        self.addCleanup(sl.shm.unlink)
+        self.addCleanup(sl.shm.close)
+
+        # Verify attributes are readable.
+        self.assertEqual(sl.format, '8s8sdqxxxxxx?xxxxxxxx?q')
+
+        # Exercise len().
+        self.assertEqual(len(sl), 7)
+
+        # Exercise index().
+        self.assertEqual(sl.index('howdy'), 0)
+        with self.assertRaises(ValueError):
+            sl.index('100')
+
+        # Exercise count().
+        self.assertEqual(sl.count(42), 1)
+        self.assertEqual(sl.count(3), 0)
+
+        # Exercise retrieving individual values.
+        self.assertEqual(sl[0], 'howdy')
+        self.assertEqual(sl[-2], True)
+
+        # Exercise iterability.
+        self.assertEqual(
+            tuple(sl),
+            ('howdy', b'HoWdY', -273.154, 100, None, True, 42)
+        )
+
+        # Exercise modifying individual values.
+        sl[3] = 42
+        self.assertEqual(sl[3], 42)
+        sl[4] = 'some'  # Change type at a given position.
+        self.assertEqual(sl[4], 'some')
+        self.assertEqual(sl.format, '8s8sdq8sxxxxxxx?q')
+        with self.assertRaisesRegex(ValueError,
+                                    "exceeds available storage"):
+            sl[4] = 'far too many'
+        self.assertEqual(sl[4], 'some')
+        sl[0] = 'encodés'  # Exactly 8 bytes of UTF-8 data
+        self.assertEqual(sl[0], 'encodés')
+        with self.assertRaises(IndexError):
+            sl[7]
+        with self.assertRaises(IndexError):
+            sl[7] = 2
+
+        # Attach to the same list by name and verify the contents match.
+        also_sl = shared_memory.ShareableList(name=sl.shm.name)
+        self.assertEqual(sl.shm.name, also_sl.shm.name)
+        self.assertEqual(list(also_sl), list(sl))
+        also_sl.shm.close()
+
+        # Non-ASCII strings are sized by their encoded length.
+        sl_utf8 = shared_memory.ShareableList(['\u00e9' * 8])
+        self.addCleanup(sl_utf8.shm.unlink)
+        self.addCleanup(sl_utf8.shm.close)
+        self.assertEqual(sl_utf8[0], '\u00e9' * 8)
+
+        # Exercise creating an empty ShareableList.
+        empty_sl = shared_memory.ShareableList()
+        try:
+            self.assertEqual(len(empty_sl), 0)
+            self.assertEqual(empty_sl.format, '')
+            self.assertEqual(empty_sl.count('any'), 0)
+            with self.assertRaises(ValueError):
+                empty_sl.index(None)
+        finally:
+            empty_sl.shm.close()
+            empty_sl.shm.unlink()
+
+    def test_shared_memory_ShareableList_pickling(self):
+        sl = shared_memory.ShareableList(range(10))
+        self.addCleanup(sl.shm.unlink)
+        self.addCleanup(sl.shm.close)
+
+        serialized_sl = pickle.dumps(sl)
+        deserialized_sl = pickle.loads(serialized_sl)
+        self.assertIsInstance(deserialized_sl,
+                              shared_memory.ShareableList)
+        self.assertEqual(deserialized_sl[-1], 9)
+        self.assertIsNot(sl, deserialized_sl)
+        deserialized_sl[4] = "changed"
+        self.assertEqual(sl[4], "changed")
+        deserialized_sl.shm.close()
+
+#
+#
+#
+
 class _TestFinalize(BaseTestCase):
 
     ALLOWED_TYPES = ('processes',)
@@ -3569,6 +3770,10 @@ class _TestImportStar(unittest.TestCase):
             # This module requires _ctypes
             modules.remove('multiprocessing.sharedctypes')
 
+        if not HAS_SHMEM:
+            # This module requires _posixshmem
+            modules.remove('multiprocessing.shared_memory')
+
         for name in modules:
             __import__(name)
             mod = sys.modules[name]
@@ -398,6 +398,107 @@ class BaseEventLoopTests(test_utils.TestCase):
         self.assertTrue(processed)
         self.assertEqual([handle], list(self.loop._ready))
 
+    def test_add_remove_instrument(self):
+        instrument = asyncio.EventLoopInstrument()
+        self.loop.add_instrument(instrument)
+        self.loop.add_instrument(instrument)
+        self.assertEqual(self.loop._instruments, (instrument,))
+        self.assertTrue(self.loop.remove_instrument(instrument))
+        self.assertFalse(self.loop.remove_instrument(instrument))
+        self.assertEqual(self.loop._instruments, ())
+
+    def test__run_once_instruments(self):
+        calls = []
+        durations = []
+
+        class Instrument(asyncio.EventLoopInstrument):
+            def select_started(self, loop, timeout):
+                calls.append(('select_started', loop, timeout))
+
+            def select_finished(self, loop, duration, nevents):
+                durations.append(duration)
+                calls.append(('select_finished', loop, nevents))
+
+            def callbacks_started(self, loop, ntodo):
+                calls.append(('callbacks_started', loop, ntodo))
+
+            def callback_finished(self, loop, handle, duration):
+                durations.append(duration)
+                calls.append(('callback_finished', loop, handle))
+
+            def callbacks_finished(self, loop, duration):
+                durations.append(duration)
+                calls.append(('callbacks_finished', loop))
+
+        self.loop._process_events = mock.Mock()
+        self.loop.add_instrument(Instrument())
+        h1 = self.loop.call_soon(lambda: None)
+        h2 = self.loop.call_soon(lambda: None)
+        h2.cancel()
+        self.loop._run_once()
+
+        self.assertEqual(calls, [
+            ('select_started', self.loop, 0),
+            ('select_finished', self.loop, 0),
+            ('callbacks_started', self.loop, 2),
+            ('callback_finished', self.loop, h1),
+            ('callbacks_finished', self.loop),
+        ])
+        self.assertEqual(len(durations), 3)
+        self.assertTrue(all(d >= 0 for d in durations), durations)
+
+    def test_instrument_stats(self):
+        stats = asyncio.EventLoopStats()
+        self.loop._process_events = mock.Mock()
+        self.loop.add_instrument(stats)
+
+        for i in range(3):
+            self.loop.call_soon(lambda: None)
+        self.loop._run_once()
+        self.loop.call_soon(lambda: None)
+        self.loop._run_once()
+
+        self.assertEqual(stats.iterations, 2)
+        self.assertEqual(stats.callbacks, 4)
+        self.assertEqual(stats.ready, 1)
+        self.assertEqual(stats.max_ready, 3)
+        self.assertGreaterEqual(stats.callback_time, stats.max_callback_time)
+        self.assertIn('iterations=2', repr(stats))
+
+        stats.reset()
+        self.assertEqual(stats.iterations, 0)
+        self.assertEqual(stats.max_ready, 0)
+
+    def test_instrument_loop_started_stopped(self):
+        instrument = mock.Mock(spec=asyncio.EventLoopInstrument)
+        self.loop._process_events = mock.Mock()
+        self.loop.add_instrument(instrument)
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+
+        instrument.loop_started.assert_called_once_with(self.loop)
+        instrument.loop_stopped.assert_called_once_with(self.loop)
+
+    def test_instrument_exception(self):
+        class Instrument(asyncio.EventLoopInstrument):
+            def select_started(self, loop, timeout):
+                raise ZeroDivisionError
+
+        instrument = Instrument()
+        handler = mock.Mock()
+        self.loop.set_exception_handler(handler)
+        self.loop._process_events = mock.Mock()
+        self.loop.add_instrument(instrument)
+        self.loop._run_once()
+
+        handler.assert_called_once_with(self.loop, {
+            'message': test_utils.MockPattern(
+                'Exception in instrument .* method select_started'),
+            'exception': mock.ANY,
+        })
+        self.assertIsInstance(handler.call_args[0][1]['exception'],
+                              ZeroDivisionError)
+
     def test__run_once_cancelled_event_cleanup(self):
         self.loop._process_events = mock.Mock()
 
@@ -0,0 +1,121 @@
+"""Tests for BufferedProtocol support in the transports."""
+
+import sys
+import unittest
+
+import asyncio
+from test.test_asyncio import utils as test_utils
+
+
+class ReceiveStuffProto(asyncio.BufferedProtocol):
+    def __init__(self, cb, con_lost_fut):
+        self.cb = cb
+        self.con_lost_fut = con_lost_fut
+
+    def get_buffer(self, sizehint):
+        self.buffer = bytearray(100)
+        return self.buffer
+
+    def buffer_updated(self, nr):
+        self.cb(self.buffer[:nr])
+
+    def connection_lost(self, exc):
+        if exc is None:
+            self.con_lost_fut.set_result(None)
+        else:
+            self.con_lost_fut.set_exception(exc)
+
+
+class BaseTestBufferedProtocol:
+
+    def new_loop(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        super().setUp()
+        self.loop = self.new_loop()
+        self.set_event_loop(self.loop)
+
+    def test_buffered_proto_create_connection(self):
+
+        NOISE = b'12345678+' * 1024
+
+        async def client(addr):
+            data = b''
+
+            def on_buf(buf):
+                nonlocal data
+                data += buf
+                if data == NOISE:
+                    tr.write(b'1')
+
+            conn_lost_fut = self.loop.create_future()
+
+            tr, pr = await self.loop.create_connection(
+                lambda: ReceiveStuffProto(on_buf, conn_lost_fut), *addr)
+
+            await conn_lost_fut
+
+        class ServerProto(asyncio.Protocol):
+            def connection_made(self, transport):
+                self.transport = transport
+                transport.write(NOISE)
+
+            def data_received(self, data):
+                self.transport.close()
+
+        async def main():
+            server = await self.loop.create_server(
+                ServerProto, '127.0.0.1', 0)
+            addr = server.sockets[0].getsockname()
+            try:
+                await asyncio.wait_for(client(addr), 10, loop=self.loop)
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        self.loop.run_until_complete(main())
+
+    def test_stream_reader_over_buffered_transport(self):
+
+        NOISE = b'line\n' * 100000
+
+        async def handle_client(reader, writer):
+            writer.write(NOISE)
+            await writer.drain()
+            writer.close()
+
+        async def main():
+            server = await asyncio.start_server(
+                handle_client, '127.0.0.1', 0, loop=self.loop)
+            addr = server.sockets[0].getsockname()
+            try:
+                reader, writer = await asyncio.open_connection(
+                    *addr, loop=self.loop)
+                self.assertEqual(await reader.readline(), b'line\n')
+                self.assertEqual(await reader.read(), NOISE[5:])
+                writer.close()
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        self.loop.run_until_complete(main())
+
+
+class BufferedProtocolSelectorTests(BaseTestBufferedProtocol,
+                                    test_utils.TestCase):
+
+    def new_loop(self):
+        return asyncio.SelectorEventLoop()
+
+
+@unittest.skipUnless(sys.platform == 'win32', 'Windows only')
+class BufferedProtocolProactorTests(BaseTestBufferedProtocol,
+                                    test_utils.TestCase):
+
+    def new_loop(self):
+        return asyncio.ProactorEventLoop()
+
+
+if __name__ == '__main__':
+    unittest.main()
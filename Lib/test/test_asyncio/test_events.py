@@ -15,6 +15,7 @@ except ImportError:
     ssl = None
 import subprocess
 import sys
+import tempfile
 import threading
 import time
 import errno
@@ -1827,6 +1828,254 @@ class EventLoopTestsMixin:
             self.loop.add_signal_handler(signal.SIGTERM, func)
 
 
+class MySendfileProto(MyBaseProto):
+
+    def __init__(self, loop=None):
+        super().__init__(loop)
+        self.data = bytearray()
+
+    def data_received(self, data):
+        self.data.extend(data)
+        super().data_received(data)
+
+
+class SendfileTestsMixin:
+
+    DATA = b"12345abcde" * 16 * 1024  # 160 KiB
+
+    @classmethod
+    def setUpClass(cls):
+        with open(support.TESTFN, 'wb') as fp:
+            fp.write(cls.DATA)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        support.unlink(support.TESTFN)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.file = open(support.TESTFN, 'rb')
+        self.addCleanup(self.file.close)
+        super().setUp()
+
+    def run_loop(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def prepare_socksendfile(self):
+        proto = MySendfileProto(loop=self.loop)
+        server = self.run_loop(self.loop.create_server(
+            lambda: proto, '127.0.0.1', 0))
+        port = server.sockets[0].getsockname()[1]
+        sock = socket.socket()
+        sock.setblocking(False)
+        self.run_loop(self.loop.sock_connect(sock, ('127.0.0.1', port)))
+        self.run_loop(proto.connected)
+
+        def cleanup():
+            if not sock._closed:
+                sock.close()
+            if proto.transport is not None:
+                proto.transport.close()
+                self.run_loop(proto.done)
+            server.close()
+            self.run_loop(server.wait_closed())
+
+        self.addCleanup(cleanup)
+        return sock, proto
+
+    def prepare_sendfile(self, *, is_ssl=False):
+        srv_proto = MySendfileProto(loop=self.loop)
+        if is_ssl:
+            if ssl is None:
+                self.skipTest('No ssl module')
+            srv_ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            srv_ctx.load_cert_chain(ONLYCERT, ONLYKEY)
+            cli_ctx = test_utils.dummy_ssl_context()
+        else:
+            srv_ctx = cli_ctx = None
+        server = self.run_loop(self.loop.create_server(
+            lambda: srv_proto, '127.0.0.1', 0, ssl=srv_ctx))
+        port = server.sockets[0].getsockname()[1]
+        cli_proto = MyBaseProto(loop=self.loop)
+        tr, _ = self.run_loop(self.loop.create_connection(
+            lambda: cli_proto, '127.0.0.1', port, ssl=cli_ctx))
+        self.run_loop(srv_proto.connected)
+
+        def cleanup():
+            tr.close()
+            self.run_loop(cli_proto.done)
+            if srv_proto.transport is not None:
+                srv_proto.transport.close()
+            server.close()
+            self.run_loop(server.wait_closed())
+
+        self.addCleanup(cleanup)
+        return srv_proto, tr
+
+    def test_sock_sendfile_success(self):
+        sock, proto = self.prepare_socksendfile()
+        ret = self.run_loop(self.loop.sock_sendfile(sock, self.file))
+        sock.close()
+        self.run_loop(proto.done)
+
+        self.assertEqual(ret, len(self.DATA))
+        self.assertEqual(proto.data, self.DATA)
+        self.assertEqual(self.file.tell(), len(self.DATA))
+
+    def test_sock_sendfile_with_offset_and_count(self):
+        sock, proto = self.prepare_socksendfile()
+        ret = self.run_loop(self.loop.sock_sendfile(sock, self.file,
+                                                    1000, 2000))
+        sock.close()
+        self.run_loop(proto.done)
+
+        self.assertEqual(ret, 2000)
+        self.assertEqual(proto.data, self.DATA[1000:3000])
+        self.assertEqual(self.file.tell(), 3000)
+
+    def test_sock_sendfile_zero_size(self):
+        sock, proto = self.prepare_socksendfile()
+        with tempfile.TemporaryFile() as f:
+            ret = self.run_loop(self.loop.sock_sendfile(sock, f))
+        sock.close()
+        self.run_loop(proto.done)
+
+        self.assertEqual(ret, 0)
+        self.assertEqual(proto.data, b'')
+
+    def test_sock_sendfile_not_regular_file(self):
+        sock, proto = self.prepare_socksendfile()
+        f = io.BytesIO(self.DATA)
+        ret = self.run_loop(self.loop.sock_sendfile(sock, f))
+        sock.close()
+        self.run_loop(proto.done)
+
+        self.assertEqual(ret, len(self.DATA))
+        self.assertEqual(proto.data, self.DATA)
+        self.assertEqual(f.tell(), len(self.DATA))
+
+    def test_sock_sendfile_fallback(self):
+        sock, proto = self.prepare_socksendfile()
+
+        async def sendfile_native(*args):
+            raise asyncio.SendfileNotAvailableError()
+
+        self.loop._sock_sendfile_native = sendfile_native
+        ret = self.run_loop(self.loop.sock_sendfile(sock, self.file))
+        sock.close()
+        self.run_loop(proto.done)
+
+        self.assertEqual(ret, len(self.DATA))
+        self.assertEqual(proto.data, self.DATA)
+        self.assertEqual(self.file.tell(), len(self.DATA))
+
+    def test_sock_sendfile_no_fallback(self):
+        sock, proto = self.prepare_socksendfile()
+
+        async def sendfile_native(*args):
+            raise asyncio.SendfileNotAvailableError()
+
+        self.loop._sock_sendfile_native = sendfile_native
+        with self.assertRaises(asyncio.SendfileNotAvailableError):
+            self.run_loop(self.loop.sock_sendfile(sock, self.file,
+                                                  fallback=False))
+        self.assertEqual(self.file.tell(), 0)
+
+    def test_sock_sendfile_invalid_args(self):
+        sock, proto = self.prepare_socksendfile()
+        with self.assertRaisesRegex(TypeError, 'count must be a positive'):
+            self.run_loop(self.loop.sock_sendfile(sock, self.file, 0, '1'))
+        with self.assertRaisesRegex(ValueError, 'count must be a positive'):
+            self.run_loop(self.loop.sock_sendfile(sock, self.file, 0, 0))
+        with self.assertRaisesRegex(TypeError, 'offset must be a non-neg'):
+            self.run_loop(self.loop.sock_sendfile(sock, self.file, '1'))
+        with self.assertRaisesRegex(ValueError, 'offset must be a non-neg'):
+            self.run_loop(self.loop.sock_sendfile(sock, self.file, -1))
+        with open(support.TESTFN, 'r') as f:
+            with self.assertRaisesRegex(ValueError, 'binary mode'):
+                self.run_loop(self.loop.sock_sendfile(sock, f))
+
+    def test_sock_sendfile_not_stream_socket(self):
+        with socket.socket(type=socket.SOCK_DGRAM) as sock:
+            sock.setblocking(False)
+            with self.assertRaisesRegex(ValueError, 'only SOCK_STREAM'):
+                self.run_loop(self.loop.sock_sendfile(sock, self.file))
+
+    def test_sendfile(self):
+        srv_proto, tr = self.prepare_sendfile()
+        ret = self.run_loop(self.loop.sendfile(tr, self.file))
+        tr.close()
+        self.run_loop(srv_proto.done)
+
+        self.assertEqual(ret, len(self.DATA))
+        self.assertEqual(srv_proto.data, self.DATA)
+        self.assertEqual(self.file.tell(), len(self.DATA))
+
+    def test_sendfile_with_offset_and_count(self):
+        srv_proto, tr = self.prepare_sendfile()
+        ret = self.run_loop(self.loop.sendfile(tr, self.file, 1000, 2000))
+        tr.close()
+        self.run_loop(srv_proto.done)
+
+        self.assertEqual(ret, 2000)
+        self.assertEqual(srv_proto.data, self.DATA[1000:3000])
+        self.assertEqual(self.file.tell(), 3000)
+
+    def test_sendfile_ssl(self):
+        srv_proto, tr = self.prepare_sendfile(is_ssl=True)
+        ret = self.run_loop(self.loop.sendfile(tr, self.file))
+        tr.close()
+        self.run_loop(srv_proto.done)
+
+        self.assertEqual(ret, len(self.DATA))
+        self.assertEqual(srv_proto.data, self.DATA)
+        self.assertEqual(self.file.tell(), len(self.DATA))
+
+    def test_sendfile_ssl_no_fallback(self):
+        srv_proto, tr = self.prepare_sendfile(is_ssl=True)
+        with self.assertRaisesRegex(RuntimeError, 'fallback is disabled'):
+            self.run_loop(self.loop.sendfile(tr, self.file, fallback=False))
+
+    def test_sendfile_pre_and_post_data(self):
+        srv_proto, tr = self.prepare_sendfile()
+        tr.write(b'HEAD\n')
+        ret = self.run_loop(self.loop.sendfile(tr, self.file))
+        tr.write(b'TAIL\n')
+        tr.close()
+        self.run_loop(srv_proto.done)
+
+        self.assertEqual(ret, len(self.DATA))
+        self.assertEqual(srv_proto.data, b'HEAD\n' + self.DATA + b'TAIL\n')
+
+    def test_sendfile_force_fallback(self):
+        srv_proto, tr = self.prepare_sendfile()
+
+        async def sendfile_native(*args):
+            raise asyncio.SendfileNotAvailableError()
+
+        self.loop._sendfile_native = sendfile_native
+        ret = self.run_loop(self.loop.sendfile(tr, self.file))
+        tr.close()
+        self.run_loop(srv_proto.done)
+
+        self.assertEqual(ret, len(self.DATA))
+        self.assertEqual(srv_proto.data, self.DATA)
+        self.assertEqual(self.file.tell(), len(self.DATA))
+
+    def test_sendfile_closing_transport(self):
+        srv_proto, tr = self.prepare_sendfile()
+        tr.close()
+        with self.assertRaisesRegex(RuntimeError, 'is closing'):
+            self.run_loop(self.loop.sendfile(tr, self.file))
+
+    def test_sendfile_unsupported_transport(self):
+        tr = asyncio.Transport()
+        tr.is_closing = lambda: False
+        with self.assertRaisesRegex(RuntimeError, 'not supported'):
+            self.run_loop(self.loop.sendfile(tr, self.file))
+
+
 class SubprocessTestsMixin:
 
     def check_terminated(self, returncode):
@@ -2103,12 +2352,15 @@ class SubprocessTestsMixin:
 
 if sys.platform == 'win32':
 
-    class SelectEventLoopTests(EventLoopTestsMixin, test_utils.TestCase):
+    class SelectEventLoopTests(EventLoopTestsMixin,
+                               SendfileTestsMixin,
+                               test_utils.TestCase):
 
         def create_event_loop(self):
             return asyncio.SelectorEventLoop()
 
     class ProactorEventLoopTests(EventLoopTestsMixin,
+                                 SendfileTestsMixin,
                                  SubprocessTestsMixin,
                                  test_utils.TestCase):
 
@@ -2150,6 +2402,7 @@ else:
 
     if hasattr(selectors, 'KqueueSelector'):
         class KqueueEventLoopTests(UnixEventLoopTestsMixin,
+                                   SendfileTestsMixin,
                                    SubprocessTestsMixin,
                                    test_utils.TestCase):
 
@@ -2175,6 +2428,7 @@ else:
 
     if hasattr(selectors, 'EpollSelector'):
         class EPollEventLoopTests(UnixEventLoopTestsMixin,
+                                  SendfileTestsMixin,
                                   SubprocessTestsMixin,
                                   test_utils.TestCase):
 
@@ -2183,6 +2437,7 @@ else:
 
     if hasattr(selectors, 'PollSelector'):
         class PollEventLoopTests(UnixEventLoopTestsMixin,
+                                 SendfileTestsMixin,
                                  SubprocessTestsMixin,
                                  test_utils.TestCase):
 
@@ -2191,12 +2446,68 @@ else:
 
     # Should always exist.
     class SelectEventLoopTests(UnixEventLoopTestsMixin,
+                               SendfileTestsMixin,
                                SubprocessTestsMixin,
                                test_utils.TestCase):
 
         def create_event_loop(self):
             return asyncio.SelectorEventLoop(selectors.SelectSelector())
 
+    if hasattr(asyncio, 'IoUringEventLoop'):
+        class IoUringEventLoopTests(UnixEventLoopTestsMixin,
+                                    SendfileTestsMixin,
+                                    SubprocessTestsMixin,
+                                    test_utils.TestCase):
+
+            def create_event_loop(self):
+                try:
+                    return asyncio.IoUringEventLoop()
+                except OSError as exc:
+                    # The kernel is too old or io_uring is disabled
+                    raise unittest.SkipTest(str(exc))
+
+            def test_reader_callback(self):
+                raise unittest.SkipTest(
+                    "IoUringEventLoop does not have add_reader()")
+
+            def test_reader_callback_cancel(self):
+                raise unittest.SkipTest(
+                    "IoUringEventLoop does not have add_reader()")
+
+            def test_writer_callback(self):
+                raise unittest.SkipTest(
+                    "IoUringEventLoop does not have add_writer()")
+
+            def test_writer_callback_cancel(self):
+                raise unittest.SkipTest(
+                    "IoUringEventLoop does not have add_writer()")
+
+            def test_create_datagram_endpoint(self):
+                raise unittest.SkipTest(
+                    "IoUringEventLoop does not have "
+                    "create_datagram_endpoint()")
+
+            def test_create_datagram_endpoint_sock(self):
+                raise unittest.SkipTest(
+                    "IoUringEventLoop does not have "
+                    "create_datagram_endpoint()")
+
+            def test_remove_fds_after_closing(self):
+                raise unittest.SkipTest(
+                    "IoUringEventLoop does not have add_reader()")
+
+            def test_unclosed_pipe_transport(self):
+                raise unittest.SkipTest(
+                    "IoUringEventLoop uses proactor pipe transports")
+
+            def test_write_pipe(self):
+                raise unittest.SkipTest(
+                    "IoUringEventLoop uses proactor pipe transports")
+
+            def test_write_pty(self):
+                raise unittest.SkipTest(
+                    "IoUringEventLoop uses proactor pipe transports")
+
 
 def noop(*args, **kwargs):
     pass
@@ -2550,6 +2861,10 @@ class AbstractEventLoopTests(unittest.TestCase):
             NotImplementedError, loop.get_debug)
         self.assertRaises(
             NotImplementedError, loop.set_debug, f)
+        self.assertRaises(
+            NotImplementedError, loop.add_instrument, f)
+        self.assertRaises(
+            NotImplementedError, loop.remove_instrument, f)
 
     def test_not_implemented_async(self):
 
@@ -2579,6 +2894,12 @@ class AbstractEventLoopTests(unittest.TestCase):
                 await loop.sock_connect(f, f)
             with self.assertRaises(NotImplementedError):
                 await loop.sock_accept(f)
+            with self.assertRaises(NotImplementedError):
+                await loop.sock_sendfile(f, f)
+            with self.assertRaises(NotImplementedError):
+                await loop.sendfile(f, f)
+            with self.assertRaises(NotImplementedError):
+                await loop.start_tls(f, f, f)
             with self.assertRaises(NotImplementedError):
                 await loop.connect_read_pipe(f, mock.sentinel.pipe)
             with self.assertRaises(NotImplementedError):
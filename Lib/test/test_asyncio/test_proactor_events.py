@@ -63,6 +63,35 @@ class ProactorSocketTransportTests(test_utils.TestCase):
         self.loop._proactor.recv.assert_called_with(self.sock, 4096)
         self.protocol.data_received.assert_called_with(b'data')
 
+    def test_loop_reading_data_buffered_protocol(self):
+        res = asyncio.Future(loop=self.loop)
+        res.set_result(b'data')
+
+        self.protocol = test_utils.make_test_protocol(asyncio.BufferedProtocol)
+        buf = bytearray(10)
+        self.protocol.get_buffer.side_effect = lambda hint: buf
+
+        tr = self.socket_transport()
+        tr._read_fut = res
+        tr._loop_reading(res)
+        self.loop._proactor.recv.assert_called_with(self.sock, 4096)
+        self.protocol.get_buffer.assert_called_with(4)
+        self.protocol.buffer_updated.assert_called_with(4)
+        self.assertEqual(buf[:4], b'data')
+
+    def test_loop_reading_data_stream_protocol(self):
+        # The data is passed as is to the protocols implementing both
+        # interfaces.
+        res = asyncio.Future(loop=self.loop)
+        res.set_result(b'data')
+
+        reader = mock.Mock()
+        self.protocol = asyncio.StreamReaderProtocol(reader, loop=self.loop)
+        tr = self.socket_transport()
+        tr._read_fut = res
+        tr._loop_reading(res)
+        reader.feed_data.assert_called_once_with(b'data')
+
     def test_loop_reading_no_data(self):
         res = asyncio.Future(loop=self.loop)
         res.set_result(b'')
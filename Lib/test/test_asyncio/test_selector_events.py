@@ -1207,6 +1207,163 @@ class SelectorSocketTransportTests(test_utils.TestCase):
         remove_writer.assert_called_with(self.sock_fd)
 
 
+class SelectorSocketTransportBufferedProtocolTests(test_utils.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.loop = self.new_test_loop()
+
+        self.protocol = test_utils.make_test_protocol(asyncio.BufferedProtocol)
+        self.buf = bytearray(1)
+        self.protocol.get_buffer.side_effect = lambda hint: self.buf
+
+        self.sock = mock.Mock(socket.socket)
+        self.sock_fd = self.sock.fileno.return_value = 7
+
+    def socket_transport(self, waiter=None):
+        transport = _SelectorSocketTransport(self.loop, self.sock,
+                                             self.protocol, waiter=waiter)
+        self.addCleanup(close_transport, transport)
+        return transport
+
+    def test_ctor(self):
+        waiter = asyncio.Future(loop=self.loop)
+        tr = self.socket_transport(waiter=waiter)
+        self.loop.run_until_complete(waiter)
+
+        self.loop.assert_reader(7, tr._read_ready)
+        test_utils.run_briefly(self.loop)
+        self.protocol.connection_made.assert_called_with(tr)
+
+    def test_get_buffer_error(self):
+        transport = self.socket_transport()
+        transport._fatal_error = mock.Mock()
+
+        self.loop.call_exception_handler = mock.Mock()
+        self.protocol.get_buffer.side_effect = LookupError()
+
+        transport._read_ready()
+
+        self.assertTrue(transport._fatal_error.called)
+        self.assertTrue(self.protocol.get_buffer.called)
+        self.assertFalse(self.protocol.buffer_updated.called)
+
+    def test_get_buffer_zerosized(self):
+        transport = self.socket_transport()
+        transport._fatal_error = mock.Mock()
+
+        self.loop.call_exception_handler = mock.Mock()
+        self.protocol.get_buffer.side_effect = lambda hint: bytearray(0)
+
+        transport._read_ready()
+
+        self.assertTrue(transport._fatal_error.called)
+        self.assertTrue(self.protocol.get_buffer.called)
+        self.assertFalse(self.protocol.buffer_updated.called)
+
+    def test_proto_type_switch(self):
+        self.protocol = test_utils.make_test_protocol(asyncio.Protocol)
+        transport = self.socket_transport()
+
+        self.sock.recv.return_value = b'data'
+        transport._read_ready()
+
+        self.protocol.data_received.assert_called_with(b'data')
+
+        # switch protocol to a BufferedProtocol
+
+        buf_proto = test_utils.make_test_protocol(asyncio.BufferedProtocol)
+        buf = bytearray(4)
+        buf_proto.get_buffer.side_effect = lambda hint: buf
+
+        transport.set_protocol(buf_proto)
+
+        self.sock.recv_into.return_value = 10
+        transport._read_ready()
+
+        buf_proto.get_buffer.assert_called_with(-1)
+        buf_proto.buffer_updated.assert_called_with(10)
+
+    def test_buffer_updated_error(self):
+        transport = self.socket_transport()
+        transport._fatal_error = mock.Mock()
+
+        self.loop.call_exception_handler = mock.Mock()
+        self.protocol.buffer_updated.side_effect = LookupError()
+
+        self.sock.recv_into.return_value = 10
+        transport._read_ready()
+
+        self.assertTrue(transport._fatal_error.called)
+        self.assertTrue(self.protocol.get_buffer.called)
+        self.assertTrue(self.protocol.buffer_updated.called)
+
+    def test_read_ready(self):
+        transport = self.socket_transport()
+
+        self.sock.recv_into.return_value = 10
+        transport._read_ready()
+
+        self.protocol.get_buffer.assert_called_with(-1)
+        self.protocol.buffer_updated.assert_called_with(10)
+        self.sock.recv_into.assert_called_with(self.buf)
+
+    def test_read_ready_eof(self):
+        transport = self.socket_transport()
+        transport.close = mock.Mock()
+
+        self.sock.recv_into.return_value = 0
+        transport._read_ready()
+
+        self.protocol.eof_received.assert_called_with()
+        self.assertFalse(self.protocol.buffer_updated.called)
+        transport.close.assert_called_with()
+
+    def test_read_ready_eof_keep_open(self):
+        transport = self.socket_transport()
+        transport.close = mock.Mock()
+
+        self.sock.recv_into.return_value = 0
+        self.protocol.eof_received.return_value = True
+        transport._read_ready()
+
+        self.protocol.eof_received.assert_called_with()
+        self.assertFalse(transport.close.called)
+
+    @mock.patch('logging.exception')
+    def test_read_ready_tryagain(self, m_exc):
+        self.sock.recv_into.side_effect = BlockingIOError
+
+        transport = self.socket_transport()
+        transport._fatal_error = mock.Mock()
+        transport._read_ready()
+
+        self.assertFalse(transport._fatal_error.called)
+        self.assertFalse(self.protocol.buffer_updated.called)
+
+    @mock.patch('logging.exception')
+    def test_read_ready_conn_reset(self, m_exc):
+        err = self.sock.recv_into.side_effect = ConnectionResetError()
+
+        transport = self.socket_transport()
+        transport._force_close = mock.Mock()
+        with test_utils.disable_logger():
+            transport._read_ready()
+        transport._force_close.assert_called_with(err)
+
+    @mock.patch('logging.exception')
+    def test_read_ready_err(self, m_exc):
+        err = self.sock.recv_into.side_effect = OSError()
+
+        transport = self.socket_transport()
+        transport._fatal_error = mock.Mock()
+        transport._read_ready()
+
+        transport._fatal_error.assert_called_with(
+                                   err,
+                                   'Fatal read error on socket transport')
+
+
 class SelectorDatagramTransportTests(test_utils.TestCase):
 
     def setUp(self):
@@ -1495,6 +1652,157 @@ class SelectorDatagramTransportTests(test_utils.TestCase):
             exc_info=(ConnectionRefusedError, MOCK_ANY, MOCK_ANY))
 
 
+@unittest.skipUnless(hasattr(socket.socket, 'recvmmsg') and
+                     hasattr(socket.socket, 'sendmmsg'),
+                     'need socket.recvmmsg() and socket.sendmmsg()')
+class SelectorBatchedDatagramTransportTests(test_utils.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.loop = self.new_test_loop()
+        self.protocol = test_utils.make_test_protocol(asyncio.DatagramProtocol)
+        self.sock = mock.Mock(spec_set=socket.socket)
+        self.sock.fileno.return_value = 7
+        self.sock.family = socket.AF_INET
+
+    def datagram_transport(self, address=None):
+        transport = _SelectorDatagramTransport(self.loop, self.sock,
+                                               self.protocol,
+                                               address=address)
+        self.addCleanup(close_transport, transport)
+        return transport
+
+    def test_read_ready(self):
+        transport = self.datagram_transport()
+
+        self.sock.recvmmsg.return_value = [(b'data1', ('0.0.0.0', 1234)),
+                                           (b'data2', ('0.0.0.0', 1235))]
+        transport._read_ready()
+
+        self.sock.recvmmsg.assert_called_with(transport._batch_size,
+                                              transport._datagram_size)
+        self.assertFalse(self.sock.recvfrom.called)
+        self.assertEqual(self.protocol.datagram_received.call_args_list,
+                         [mock.call(b'data1', ('0.0.0.0', 1234)),
+                          mock.call(b'data2', ('0.0.0.0', 1235))])
+
+    def test_read_ready_tryagain(self):
+        transport = self.datagram_transport()
+
+        self.sock.recvmmsg.side_effect = BlockingIOError
+        transport._fatal_error = mock.Mock()
+        transport._read_ready()
+
+        self.assertFalse(transport._fatal_error.called)
+        self.assertFalse(self.protocol.datagram_received.called)
+
+    def test_read_ready_oserr(self):
+        transport = self.datagram_transport()
+
+        err = self.sock.recvmmsg.side_effect = ConnectionRefusedError()
+        transport._fatal_error = mock.Mock()
+        transport._read_ready()
+
+        self.assertFalse(transport._fatal_error.called)
+        self.protocol.error_received.assert_called_with(err)
+
+    def test_read_ready_abort(self):
+        transport = self.datagram_transport()
+
+        self.sock.recvmmsg.return_value = [(b'data1', ('0.0.0.0', 1234)),
+                                           (b'data2', ('0.0.0.0', 1235))]
+        self.protocol.datagram_received.side_effect = \
+            lambda data, addr: transport.abort()
+        transport._read_ready()
+
+        self.protocol.datagram_received.assert_called_once_with(
+            b'data1', ('0.0.0.0', 1234))
+
+    def test_read_ready_close_after_reply(self):
+        transport = self.datagram_transport()
+
+        self.sock.recvmmsg.return_value = [
+            (b'data%d' % i, ('0.0.0.0', 1234)) for i in range(5)]
+        self.sock.sendmmsg.return_value = 1
+
+        def datagram_received(data, addr):
+            transport.sendto(data, addr)
+            transport.close()
+        self.protocol.datagram_received.side_effect = datagram_received
+        transport._read_ready()
+
+        self.protocol.datagram_received.assert_called_once_with(
+            b'data0', ('0.0.0.0', 1234))
+        self.assertEqual(list(transport._buffer),
+                         [(b'data0', ('0.0.0.0', 1234))])
+        self.loop.assert_writer(7, transport._sendto_ready)
+        self.assertFalse(self.protocol.connection_lost.called)
+
+        transport._sendto_ready()
+        self.sock.sendto.assert_called_once_with(
+            b'data0', ('0.0.0.0', 1234))
+        self.assertFalse(transport._buffer)
+        self.assertFalse(self.loop.writers)
+        self.protocol.connection_lost.assert_called_with(None)
+
+    def test_replies_are_batched(self):
+        transport = self.datagram_transport()
+
+        self.sock.recvmmsg.return_value = [(b'data1', ('0.0.0.0', 1234)),
+                                           (b'data2', ('0.0.0.0', 1235))]
+        self.sock.sendmmsg.return_value = 2
+        self.protocol.datagram_received.side_effect = \
+            lambda data, addr: transport.sendto(data.upper(), addr)
+        transport._read_ready()
+
+        self.assertFalse(self.sock.sendto.called)
+        self.sock.sendmmsg.assert_called_once_with(
+            [(b'DATA1', ('0.0.0.0', 1234)), (b'DATA2', ('0.0.0.0', 1235))])
+        self.assertFalse(transport._buffer)
+        self.assertFalse(self.loop.writers)
+
+    def test_replies_tryagain(self):
+        transport = self.datagram_transport()
+
+        self.sock.recvmmsg.return_value = [(b'data1', ('0.0.0.0', 1234)),
+                                           (b'data2', ('0.0.0.0', 1235))]
+        self.sock.sendmmsg.side_effect = BlockingIOError
+        self.protocol.datagram_received.side_effect = \
+            lambda data, addr: transport.sendto(data, addr)
+        transport._read_ready()
+
+        self.assertEqual(len(transport._buffer), 2)
+        self.loop.assert_writer(7, transport._sendto_ready)
+
+    def test_sendto_ready_partial(self):
+        self.sock.sendmmsg.side_effect = [1, 2]
+
+        transport = self.datagram_transport(address=('0.0.0.0', 1))
+        transport._buffer.extend([(b'data1', None), (b'data2', None),
+                                  (b'data3', None)])
+        self.loop._add_writer(7, transport._sendto_ready)
+        transport._sendto_ready()
+
+        self.assertEqual(self.sock.sendmmsg.call_args_list,
+                         [mock.call([(b'data1', None), (b'data2', None),
+                                     (b'data3', None)]),
+                          mock.call([(b'data2', None), (b'data3', None)])])
+        self.assertFalse(transport._buffer)
+        self.assertFalse(self.loop.writers)
+
+    def test_sendto_ready_error_received(self):
+        self.sock.sendmmsg.side_effect = ConnectionRefusedError
+
+        transport = self.datagram_transport()
+        transport._fatal_error = mock.Mock()
+        transport._buffer.extend([(b'data1', ()), (b'data2', ())])
+        transport._sendto_ready()
+
+        self.assertFalse(transport._fatal_error.called)
+        self.assertTrue(self.protocol.error_received.called)
+        self.assertEqual(list(transport._buffer), [(b'data2', ())])
+
+
 class TestSelectorUtils(test_utils.TestCase):
     def check_set_nodelay(self, sock):
         opt = sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
@@ -1,6 +1,9 @@
 """Tests for asyncio/sslproto.py."""
 
 import logging
+import os
+import socket
+import threading
 import unittest
 from unittest import mock
 try:
@@ -14,6 +17,14 @@ from asyncio import sslproto
 from test.test_asyncio import utils as test_utils
 
 
+def data_file(filename):
+    return os.path.join(os.path.dirname(__file__), filename)
+
+
+ONLYCERT = data_file('ssl_cert.pem')
+ONLYKEY = data_file('ssl_key.pem')
+
+
 @unittest.skipIf(ssl is None, 'No ssl module')
 class SslProtoHandshakeTests(test_utils.TestCase):
 
@@ -129,6 +140,196 @@ class SslProtoHandshakeTests(test_utils.TestCase):
         self.assertIs(ssl_proto._app_transport.get_protocol(), new_app_proto)
         self.assertIs(ssl_proto._app_protocol, new_app_proto)
 
+    def test_data_received_buffered_app_protocol(self):
+        app_proto = test_utils.make_test_protocol(asyncio.BufferedProtocol)
+        buf = bytearray(3)
+        app_proto.get_buffer.side_effect = lambda hint: buf
+        received = []
+        app_proto.buffer_updated.side_effect = (
+            lambda nbytes: received.append(bytes(buf[:nbytes])))
+
+        ssl_proto = self.ssl_protocol()
+        ssl_proto._app_transport.set_protocol(app_proto)
+        transport = self.connection_made(ssl_proto)
+        ssl_proto._sslpipe.feed_ssldata.return_value = ([], [b'abcdefgh'])
+        ssl_proto.data_received(b'ssldata')
+
+        # The data is split to fit in the buffer of the protocol.
+        self.assertEqual(received, [b'abc', b'def', b'gh'])
+        app_proto.get_buffer.assert_called_with(2)
+        self.assertFalse(transport.write.called)
+
+    def test_data_received_stream_reader_protocol(self):
+        # StreamReaderProtocol gets the decrypted data through
+        # data_received(), without copying it to a buffer first.
+        reader = asyncio.StreamReader(loop=self.loop)
+        app_proto = asyncio.StreamReaderProtocol(reader, loop=self.loop)
+        ssl_proto = self.ssl_protocol()
+        ssl_proto._app_transport.set_protocol(app_proto)
+        self.connection_made(ssl_proto)
+        ssl_proto._sslpipe.feed_ssldata.return_value = ([], [b'abcdefgh'])
+        with mock.patch.object(app_proto, 'get_buffer') as get_buffer:
+            ssl_proto.data_received(b'ssldata')
+        self.assertFalse(get_buffer.called)
+        self.assertEqual(bytes(reader._buffer), b'abcdefgh')
+
+    def test_session_cache(self):
+        sslcontext = test_utils.dummy_ssl_context()
+        cache = sslcontext.session_cache = mock.Mock()
+        cached_session = cache.get.return_value
+        ssl_proto = sslproto.SSLProtocol(self.loop, asyncio.Protocol(),
+                                         sslcontext, None,
+                                         server_hostname='example.com')
+        self.addCleanup(ssl_proto._app_transport.close)
+        transport = mock.Mock()
+        transport.get_extra_info.return_value = ('127.0.0.1', 8443)
+        sslpipe = mock.Mock()
+        sslpipe.do_handshake.return_value = []
+        sslobj = sslpipe.ssl_object
+        sslobj.session_reused = False
+        with mock.patch('asyncio.sslproto._SSLPipe',
+                        return_value=sslpipe) as m:
+            ssl_proto.connection_made(transport)
+        cache.get.assert_called_once_with('example.com', 8443)
+        m.assert_called_once_with(sslcontext, False, 'example.com',
+                                  cached_session)
+
+        # A new session is saved after the handshake...
+        ssl_proto._on_handshake_complete(None)
+        cache.put.assert_called_once_with('example.com', 8443,
+                                          sslobj.session)
+        # ...and again when the connection is lost, to store the session
+        # tickets received after the handshake
+        cache.put.reset_mock()
+        ssl_proto.connection_lost(None)
+        cache.put.assert_called_once_with('example.com', 8443,
+                                          sslobj.session)
+
+
+class BaseStartTLS:
+
+    PAYLOAD_SIZE = 1024 * 100
+
+    def new_loop(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        super().setUp()
+        self.loop = self.new_loop()
+        self.set_event_loop(self.loop)
+
+    def server_context(self):
+        sslcontext = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        sslcontext.load_cert_chain(ONLYCERT, ONLYKEY)
+        return sslcontext
+
+    def run_client(self, address, payload, result):
+        # Blocking STARTTLS-style client: negotiate in plaintext, then
+        # upgrade the very same socket to TLS and echo some data.
+        try:
+            with socket.create_connection(address, timeout=10) as sock:
+                sock.sendall(b'STARTTLS\n')
+                self.assertEqual(sock.recv(3), b'OK\n')
+                sslcontext = test_utils.dummy_ssl_context()
+                with sslcontext.wrap_socket(sock) as ssock:
+                    ssock.sendall(payload)
+                    data = bytearray()
+                    while len(data) < len(payload):
+                        chunk = ssock.recv(65536)
+                        if not chunk:
+                            break
+                        data.extend(chunk)
+                    result.append(bytes(data))
+        except BaseException as exc:
+            result.append(exc)
+
+    def test_start_tls_server(self):
+        payload = os.urandom(self.PAYLOAD_SIZE)
+        server_context = self.server_context()
+        upgraded = self.loop.create_future()
+        loop = self.loop
+
+        class ServerProto(asyncio.Protocol):
+            def __init__(self):
+                self.buf = bytearray()
+                self.transport = None
+
+            def connection_made(self, tr):
+                self.transport = tr
+
+            def data_received(self, data):
+                self.buf.extend(data)
+                if upgraded.done():
+                    if len(self.buf) >= len(payload):
+                        self.transport.write(bytes(self.buf))
+                        self.buf.clear()
+                elif self.buf == b'STARTTLS\n':
+                    self.buf.clear()
+                    loop.create_task(self.upgrade())
+                    self.transport.write(b'OK\n')
+
+            async def upgrade(self):
+                try:
+                    self.transport = await loop.start_tls(
+                        self.transport, self, server_context,
+                        server_side=True)
+                except Exception as exc:
+                    upgraded.set_exception(exc)
+                else:
+                    upgraded.set_result(self.transport)
+
+        proto = ServerProto()
+        server = self.loop.run_until_complete(
+            self.loop.create_server(lambda: proto, '127.0.0.1', 0))
+        address = server.sockets[0].getsockname()
+
+        result = []
+        client = threading.Thread(target=self.run_client,
+                                  args=(address, payload, result))
+        client.start()
+        try:
+            new_tr = self.loop.run_until_complete(
+                asyncio.wait_for(upgraded, 10, loop=self.loop))
+            self.assertIsInstance(new_tr, asyncio.Transport)
+            self.assertIsNotNone(new_tr.get_extra_info('ssl_object'))
+            self.loop.run_until_complete(self.loop.run_in_executor(
+                None, client.join, 10))
+        finally:
+            client.join()
+            server.close()
+            self.loop.run_until_complete(server.wait_closed())
+            if proto.transport is not None:
+                proto.transport.close()
+                test_utils.run_briefly(self.loop)
+
+        self.assertEqual(result, [payload])
+
+    def test_start_tls_wrong_args(self):
+        async def main():
+            with self.assertRaisesRegex(TypeError, 'SSLContext, got'):
+                await self.loop.start_tls(None, None, None)
+
+            sslctx = test_utils.dummy_ssl_context()
+            with self.assertRaisesRegex(TypeError, 'is not supported'):
+                await self.loop.start_tls(None, None, sslctx)
+
+        self.loop.run_until_complete(main())
+
+
+@unittest.skipIf(ssl is None, 'No ssl module')
+class SelectorStartTLSTests(BaseStartTLS, test_utils.TestCase):
+
+    def new_loop(self):
+        return asyncio.SelectorEventLoop()
+
+
+@unittest.skipIf(ssl is None, 'No ssl module')
+@unittest.skipUnless(hasattr(asyncio, 'ProactorEventLoop'), 'Windows only')
+class ProactorStartTLSTests(BaseStartTLS, test_utils.TestCase):
+
+    def new_loop(self):
+        return asyncio.ProactorEventLoop()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -121,6 +121,38 @@ class StreamReaderTests(test_utils.TestCase):
                                                     loop=self.loop)
             self._basetest_open_connection_error(conn_fut)
 
+    def test_writer_sendfile(self):
+        data = b'0123456789' * 10000
+        with open(support.TESTFN, 'wb') as f:
+            f.write(data)
+        self.addCleanup(support.unlink, support.TESTFN)
+        received = self.loop.create_future()
+
+        async def handle_client(reader, writer):
+            received.set_result(await reader.read())
+            writer.close()
+
+        async def client(addr):
+            reader, writer = await asyncio.open_connection(*addr,
+                                                           loop=self.loop)
+            writer.write(b'HEAD')
+            with open(support.TESTFN, 'rb') as f:
+                sent = await writer.sendfile(f, 10, 1000)
+            writer.write(b'TAIL')
+            writer.close()
+            return sent
+
+        server = self.loop.run_until_complete(
+            asyncio.start_server(handle_client, '127.0.0.1', 0,
+                                 loop=self.loop))
+        addr = server.sockets[0].getsockname()
+        sent = self.loop.run_until_complete(client(addr))
+        self.assertEqual(sent, 1000)
+        self.assertEqual(self.loop.run_until_complete(received),
+                         b'HEAD' + data[10:1010] + b'TAIL')
+        server.close()
+        self.loop.run_until_complete(server.wait_closed())
+
     def test_feed_empty_data(self):
         stream = asyncio.StreamReader(loop=self.loop)
 
@@ -757,6 +789,95 @@ os.close(fd)
         protocol = asyncio.StreamReaderProtocol(reader)
         self.assertIs(protocol._loop, self.loop)
 
+    def test_streamreaderprotocol_buffer_updated(self):
+        reader = asyncio.StreamReader(loop=self.loop)
+        protocol = asyncio.StreamReaderProtocol(reader, loop=self.loop)
+        self.assertIsInstance(protocol, asyncio.BufferedProtocol)
+
+        buf = protocol.get_buffer(-1)
+        self.assertGreater(len(buf), 0)
+        buf[:5] = b'line1'
+        protocol.buffer_updated(5)
+        # The buffer is reused, the data has been copied to the reader.
+        self.assertIs(protocol.get_buffer(-1), buf)
+        buf[:6] = b'\nline2'
+        protocol.buffer_updated(6)
+        protocol.eof_received()
+
+        self.assertEqual(self.loop.run_until_complete(reader.read()),
+                         b'line1\nline2')
+
+    def test_streamreaderprotocol_buffer_updated_pauses(self):
+        reader = asyncio.StreamReader(limit=4, loop=self.loop)
+        protocol = asyncio.StreamReaderProtocol(reader, loop=self.loop)
+        transport = mock.Mock()
+        protocol.connection_made(transport)
+
+        buf = protocol.get_buffer(-1)
+        buf[:9] = b'123456789'
+        protocol.buffer_updated(9)
+        transport.pause_reading.assert_called_with()
+
+    def test_streamreaderprotocol_buffer_taken_over(self):
+        reader = asyncio.StreamReader(loop=self.loop)
+        protocol = asyncio.StreamReaderProtocol(reader, loop=self.loop)
+
+        # A mostly filled buffer becomes the buffer of an empty reader.
+        buf = protocol.get_buffer(-1)
+        buf[:] = b'x' * len(buf)
+        protocol.buffer_updated(len(buf) - 1)
+        self.assertIs(reader._buffer, buf)
+        self.assertEqual(len(reader._buffer), len(buf))
+        new_buf = protocol.get_buffer(-1)
+        self.assertIsNot(new_buf, buf)
+
+        # The data is copied when the reader already has some.
+        new_buf[:] = b'y' * len(new_buf)
+        protocol.buffer_updated(len(new_buf))
+        self.assertIs(reader._buffer, buf)
+        self.assertIs(protocol.get_buffer(-1), new_buf)
+        protocol.eof_received()
+        data = self.loop.run_until_complete(reader.read())
+        self.assertEqual(data, b'x' * (len(new_buf) - 1) + b'y' * len(new_buf))
+
+    def test_streamreaderprotocol_data_received_overridden(self):
+        # Subclasses overriding data_received() still get the data through
+        # it when the transport supports buffered protocols.
+        received = []
+
+        class Protocol(asyncio.StreamReaderProtocol):
+            def data_received(self, data):
+                received.append(data)
+                super().data_received(data)
+
+        rsock, wsock = socket.socketpair()
+        self.addCleanup(wsock.close)
+        reader = asyncio.StreamReader(loop=self.loop)
+        transport, protocol = self.loop.run_until_complete(
+            self.loop.create_connection(
+                lambda: Protocol(reader, loop=self.loop), sock=rsock))
+        wsock.sendall(b'data\n')
+        line = self.loop.run_until_complete(reader.readline())
+        transport.close()
+        test_utils.run_briefly(self.loop)
+        self.assertEqual(line, b'data\n')
+        self.assertEqual(received, [b'data\n'])
+
+        # Same with a StreamReader overriding feed_data().
+        fed = []
+
+        class Reader(asyncio.StreamReader):
+            def feed_data(self, data):
+                fed.append(data)
+                super().feed_data(data)
+
+        reader = Reader(loop=self.loop)
+        protocol = asyncio.StreamReaderProtocol(reader, loop=self.loop)
+        buf = protocol.get_buffer(-1)
+        buf[:4] = b'data'
+        protocol.buffer_updated(4)
+        self.assertEqual(fed, [b'data'])
+
     def test_drain_raises(self):
         # See http://bugs.python.org/issue25441
 
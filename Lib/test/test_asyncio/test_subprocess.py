@@ -1,5 +1,7 @@
+import os
 import signal
 import sys
+import threading
 import unittest
 import warnings
 from unittest import mock
@@ -508,6 +510,59 @@ if sys.platform != 'win32':
 
         Watcher = unix_events.FastChildWatcher
 
+    class SubprocessThreadedWatcherTests(SubprocessWatcherMixin,
+                                         test_utils.TestCase):
+
+        Watcher = unix_events.ThreadedChildWatcher
+
+        def tearDown(self):
+            # The reaper threads exit right after delivering the exit status,
+            # wait for them before the dangling threads check.
+            threads = [thread for thread in threading.enumerate()
+                       if thread.name.startswith('waitpid-')]
+            for thread in threads:
+                thread.join()
+            threads = thread = None
+            super().tearDown()
+
+        def test_loop_in_thread(self):
+            # The watcher needs no SIGCHLD handler, so subprocesses can be
+            # spawned by an event loop running outside of the main thread.
+            result = []
+
+            def run_loop():
+                loop = asyncio.new_event_loop()
+                try:
+                    async def spawn():
+                        proc = await asyncio.create_subprocess_exec(
+                            sys.executable, '-c', 'import sys; sys.exit(47)',
+                            loop=loop)
+                        return await proc.wait()
+                    result.append(loop.run_until_complete(spawn()))
+                finally:
+                    loop.close()
+
+            thread = threading.Thread(target=run_loop)
+            thread.start()
+            thread.join(60)
+            self.assertFalse(thread.is_alive())
+            self.assertEqual(result, [47])
+
+    def _pidfd_supported():
+        if not hasattr(os, 'pidfd_open'):
+            return False
+        try:
+            os.close(os.pidfd_open(os.getpid()))
+        except OSError:
+            return False
+        return True
+
+    @unittest.skipUnless(_pidfd_supported(),
+                         "requires os.pidfd_open() and kernel support")
+    class SubprocessPidfdWatcherTests(SubprocessThreadedWatcherTests):
+
+        Watcher = unix_events.PidfdChildWatcher
+
 else:
     # Windows
     class SubprocessProactorTests(SubprocessMixin, test_utils.TestCase):
@@ -0,0 +1,337 @@
+"""Tests for taskgroups.py."""
+
+import pickle
+import unittest
+
+import asyncio
+from test.test_asyncio import utils as test_utils
+
+
+class MyExc(Exception):
+    pass
+
+
+class TaskGroupTests(test_utils.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.loop = asyncio.new_event_loop()
+        self.set_event_loop(self.loop)
+
+    def run_loop(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_taskgroup_01(self):
+
+        async def foo1():
+            await asyncio.sleep(0.1)
+            return 42
+
+        async def foo2():
+            await asyncio.sleep(0.2)
+            return 11
+
+        async def runner():
+            async with asyncio.TaskGroup() as g:
+                t1 = g.create_task(foo1())
+                t2 = g.create_task(foo2())
+
+            return t1, t2
+
+        t1, t2 = self.run_loop(runner())
+        self.assertEqual(t1.result(), 42)
+        self.assertEqual(t2.result(), 11)
+
+    def test_taskgroup_create_task_after_body(self):
+
+        async def foo1():
+            await asyncio.sleep(0.1)
+            return 42
+
+        async def foo2():
+            await asyncio.sleep(0.2)
+            return 11
+
+        async def runner():
+            async with asyncio.TaskGroup() as g:
+                t1 = g.create_task(foo1())
+                await asyncio.sleep(0.15)
+                # t1 is done by now: the group can keep growing.
+                t2 = g.create_task(foo2())
+
+            return t1, t2
+
+        t1, t2 = self.run_loop(runner())
+        self.assertEqual(t1.result(), 42)
+        self.assertEqual(t2.result(), 11)
+
+    def test_taskgroup_child_error_cancels_siblings(self):
+
+        async def foo1():
+            await asyncio.sleep(1)
+            return 42
+
+        async def foo2():
+            await asyncio.sleep(0.1)
+            1 / 0
+
+        async def runner():
+            async with asyncio.TaskGroup() as g:
+                t1 = g.create_task(foo1())
+                g.create_task(foo2())
+
+            return t1
+
+        with self.assertRaises(asyncio.TaskGroupError) as cm:
+            self.run_loop(runner())
+
+        errors = cm.exception.errors
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], ZeroDivisionError)
+        self.assertIn('ZeroDivisionError', str(cm.exception))
+
+    def test_taskgroup_child_error_cancels_body(self):
+        NUM = 0
+        t2_cancel = False
+        t2 = None
+
+        async def foo1():
+            await asyncio.sleep(0.1)
+            1 / 0
+
+        async def foo2():
+            nonlocal NUM, t2_cancel
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                t2_cancel = True
+                raise
+            NUM += 1
+
+        async def runner():
+            nonlocal NUM, t2
+
+            async with asyncio.TaskGroup() as g:
+                g.create_task(foo1())
+                t2 = g.create_task(foo2())
+
+                # The body is cancelled by the failure of foo1().
+                await asyncio.sleep(10)
+                NUM += 10
+
+        with self.assertRaises(asyncio.TaskGroupError) as cm:
+            self.run_loop(runner())
+
+        self.assertEqual(
+            [type(e) for e in cm.exception.errors], [ZeroDivisionError])
+        self.assertEqual(NUM, 0)
+        self.assertTrue(t2_cancel)
+        self.assertTrue(t2.cancelled())
+
+    def test_taskgroup_parent_continues_after_error(self):
+        # The cancellation requested by the group on its parent task is
+        # withdrawn once the group has finished.
+        async def crash_soon():
+            await asyncio.sleep(0.1)
+            1 / 0
+
+        async def runner():
+            try:
+                async with asyncio.TaskGroup() as g:
+                    g.create_task(crash_soon())
+                    await asyncio.sleep(10)
+            except asyncio.TaskGroupError:
+                pass
+            self.assertEqual(asyncio.current_task().cancelling(), 0)
+            await asyncio.sleep(0.01)
+            return 'done'
+
+        self.assertEqual(self.run_loop(runner()), 'done')
+
+    def test_taskgroup_body_error(self):
+        NUM = 0
+        t2_cancel = False
+
+        async def foo2():
+            nonlocal t2_cancel
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                t2_cancel = True
+                raise
+
+        async def runner():
+            nonlocal NUM
+            async with asyncio.TaskGroup() as g:
+                g.create_task(foo2())
+                await asyncio.sleep(0.01)
+                raise MyExc
+
+        with self.assertRaises(asyncio.TaskGroupError) as cm:
+            self.run_loop(runner())
+
+        self.assertEqual([type(e) for e in cm.exception.errors], [MyExc])
+        self.assertTrue(t2_cancel)
+
+    def test_taskgroup_multiple_errors(self):
+
+        async def fail(delay, exc):
+            await asyncio.sleep(delay)
+            raise exc
+
+        async def runner():
+            async with asyncio.TaskGroup() as g:
+                g.create_task(fail(0.1, MyExc()))
+                # Ignores the cancellation and fails while the group
+                # is aborting.
+                g.create_task(self.fail_on_cancel(ZeroDivisionError()))
+
+        with self.assertRaises(asyncio.TaskGroupError) as cm:
+            self.run_loop(runner())
+
+        self.assertEqual(
+            [type(e) for e in cm.exception.errors],
+            [MyExc, ZeroDivisionError])
+
+    async def fail_on_cancel(self, exc):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            raise exc
+
+    def test_taskgroup_parent_cancelled(self):
+        t1_cancelled = False
+
+        async def foo1():
+            nonlocal t1_cancelled
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                t1_cancelled = True
+                raise
+
+        async def runner():
+            async with asyncio.TaskGroup() as g:
+                g.create_task(foo1())
+                await asyncio.sleep(10)
+
+        r = self.loop.create_task(runner())
+        self.run_loop(asyncio.sleep(0.1))
+        self.assertFalse(r.done())
+        r.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            self.run_loop(r)
+        self.assertTrue(t1_cancelled)
+        self.assertTrue(r.cancelled())
+
+    def test_taskgroup_parent_cancelled_while_waiting(self):
+        t1_cancelled = False
+
+        async def foo1():
+            nonlocal t1_cancelled
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                t1_cancelled = True
+                raise
+
+        async def runner():
+            async with asyncio.TaskGroup() as g:
+                g.create_task(foo1())
+            # __aexit__() waits for foo1() here.
+
+        r = self.loop.create_task(runner())
+        self.run_loop(asyncio.sleep(0.1))
+        r.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            self.run_loop(r)
+        self.assertTrue(t1_cancelled)
+
+    def test_taskgroup_base_error(self):
+
+        async def crash_hard():
+            await asyncio.sleep(0.01)
+            raise KeyboardInterrupt
+
+        async def runner():
+            async with asyncio.TaskGroup() as g:
+                g.create_task(crash_hard())
+                await asyncio.sleep(10)
+
+        r = self.loop.create_task(runner())
+        # KeyboardInterrupt propagates out of the event loop once from
+        # the child task, then again from the parent when the group
+        # re-raises it instead of a TaskGroupError.
+        with self.assertRaises(KeyboardInterrupt):
+            self.run_loop(r)
+        self.assertFalse(r.done())
+        with self.assertRaises(KeyboardInterrupt):
+            self.run_loop(r)
+        self.assertIsInstance(r.exception(), KeyboardInterrupt)
+
+    def test_taskgroup_many_tasks(self):
+        # Hundreds of children are waited for with a single future.
+        async def child(i):
+            await asyncio.sleep(0.01)
+            return i
+
+        async def runner():
+            async with asyncio.TaskGroup() as g:
+                tasks = [g.create_task(child(i)) for i in range(500)]
+            return [t.result() for t in tasks]
+
+        self.assertEqual(self.run_loop(runner()), list(range(500)))
+
+    def test_taskgroup_create_task_errors(self):
+
+        async def coro():
+            pass
+
+        async def runner():
+            g = asyncio.TaskGroup()
+            c = coro()
+            with self.assertRaisesRegex(RuntimeError, 'has not been entered'):
+                g.create_task(c)
+            c.close()
+
+            async with g:
+                pass
+
+            c = coro()
+            with self.assertRaisesRegex(RuntimeError, 'is finished'):
+                g.create_task(c)
+            c.close()
+
+            with self.assertRaisesRegex(RuntimeError, 'already entered'):
+                async with g:
+                    pass
+
+        self.run_loop(runner())
+
+    def test_taskgroup_no_parent_task(self):
+        # Entering the group outside of any task.
+        g = asyncio.TaskGroup(loop=self.loop)
+        with self.assertRaisesRegex(RuntimeError, 'parent task'):
+            g.__aenter__().send(None)
+
+    def test_taskgroup_repr(self):
+
+        async def runner():
+            g = asyncio.TaskGroup()
+            self.assertEqual(repr(g), '<TaskGroup>')
+            async with g:
+                self.assertEqual(repr(g), '<TaskGroup entered>')
+                g.create_task(asyncio.sleep(0.01))
+                self.assertEqual(repr(g), '<TaskGroup tasks=1 entered>')
+
+        self.run_loop(runner())
+
+    def test_taskgroup_error_pickle(self):
+        exc = asyncio.TaskGroupError('message', [MyExc('a')])
+        exc2 = pickle.loads(pickle.dumps(exc))
+        self.assertEqual(exc2.message, 'message')
+        self.assertEqual([type(e) for e in exc2.errors], [MyExc])
+
+
+if __name__ == '__main__':
+    unittest.main()
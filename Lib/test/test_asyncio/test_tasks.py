@@ -433,6 +433,33 @@ class BaseTaskTests:
         self.assertTrue(t.cancelled())
         self.assertFalse(t.cancel())
 
+    def test_cancelling_and_uncancel(self):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+
+        async def task():
+            try:
+                await asyncio.sleep(10, loop=loop)
+            except asyncio.CancelledError:
+                # The cancellation request was handled: withdraw it
+                # and keep running.
+                self.assertEqual(t.cancelling(), 2)
+                self.assertEqual(t.uncancel(), 1)
+                self.assertEqual(t.uncancel(), 0)
+                self.assertEqual(t.uncancel(), 0)
+            return 42
+
+        t = self.new_task(loop, task())
+        self.assertEqual(t.cancelling(), 0)
+        test_utils.run_briefly(loop)
+        self.assertTrue(t.cancel())
+        self.assertTrue(t.cancel())
+        self.assertEqual(loop.run_until_complete(t), 42)
+        self.assertEqual(t.cancelling(), 0)
+        # A finished task does not count cancellation requests.
+        self.assertFalse(t.cancel())
+        self.assertEqual(t.cancelling(), 0)
+
     def test_cancel_yield(self):
         @asyncio.coroutine
         def task():
@@ -2767,6 +2794,125 @@ class RunCoroutineThreadsafeTests(test_utils.TestCase):
         self.assertEqual(context['exception'], exc_context.exception)
 
 
+class IMapTests(test_utils.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.loop = asyncio.new_event_loop()
+        self.set_event_loop(self.loop)
+        self.running = 0
+        self.max_running = 0
+
+    async def work(self, x):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            if x == 'fail':
+                await asyncio.sleep(0.025, loop=self.loop)
+                raise ZeroDivisionError
+            # Later items finish first.
+            await asyncio.sleep(0.01 * (5 - x % 5), loop=self.loop)
+            return x * 10
+        finally:
+            self.running -= 1
+
+    def collect(self, *args, **kwargs):
+        async def consume():
+            return [x async for x in asyncio.imap(*args, loop=self.loop,
+                                                  **kwargs)]
+        return self.loop.run_until_complete(consume())
+
+    def test_ordered(self):
+        res = self.collect(self.work, range(12), limit=3)
+        self.assertEqual(res, [x * 10 for x in range(12)])
+        self.assertEqual(self.max_running, 3)
+
+    def test_unordered(self):
+        res = self.collect(self.work, range(5), limit=5, ordered=False)
+        self.assertEqual(res, [40, 30, 20, 10, 0])
+        self.assertEqual(self.max_running, 5)
+
+    def test_empty(self):
+        self.assertEqual(self.collect(self.work, [], limit=3), [])
+
+    def test_async_iterable(self):
+        async def agen():
+            for i in range(7):
+                await asyncio.sleep(0, loop=self.loop)
+                yield i
+
+        res = self.collect(self.work, agen(), limit=2)
+        self.assertEqual(res, [x * 10 for x in range(7)])
+        self.assertEqual(self.max_running, 2)
+
+    def test_lazy_input_and_backpressure(self):
+        pulled = 0
+
+        def items():
+            nonlocal pulled
+            for i in range(1000000):
+                pulled += 1
+                yield i
+
+        async def consume():
+            gen = asyncio.imap(self.work, items(), limit=4, loop=self.loop)
+            results = []
+            async for x in gen:
+                results.append(x)
+                # The consumer is slow: the producer must not run ahead.
+                await asyncio.sleep(0.02, loop=self.loop)
+                self.assertLessEqual(pulled, len(results) + 4)
+                if len(results) == 10:
+                    break
+            await gen.aclose()
+            return results
+
+        res = self.loop.run_until_complete(consume())
+        self.assertEqual(res, [x * 10 for x in range(10)])
+        self.assertLessEqual(pulled, 14)
+        self.assertEqual(self.running, 0)
+
+    def test_executor(self):
+        res = self.collect(
+            lambda x: self.loop.run_in_executor(None, pow, x, 2),
+            range(20), limit=4, ordered=False)
+        self.assertEqual(sorted(res), [x ** 2 for x in range(20)])
+
+    def test_exception_cancels_pending(self):
+        async def consume():
+            results = []
+            async for x in asyncio.imap(self.work, [1, 2, 'fail', 3, 4],
+                                        limit=5, loop=self.loop):
+                results.append(x)
+            return results
+
+        # 'fail' completes before the first item: in ordered mode it is
+        # raised as soon as it happens.
+        with self.assertRaises(ZeroDivisionError):
+            self.loop.run_until_complete(consume())
+        test_utils.run_briefly(self.loop)
+        self.assertEqual(self.running, 0)
+
+    def test_exception_unordered(self):
+        async def consume():
+            results = []
+            try:
+                async for x in asyncio.imap(self.work, [4, 'fail', 1],
+                                            limit=3, ordered=False,
+                                            loop=self.loop):
+                    results.append(x)
+            except ZeroDivisionError:
+                return results
+
+        self.assertEqual(self.loop.run_until_complete(consume()), [40])
+        test_utils.run_briefly(self.loop)
+        self.assertEqual(self.running, 0)
+
+    def test_invalid_limit(self):
+        with self.assertRaises(ValueError):
+            self.collect(self.work, range(3), limit=0)
+
+
 class SleepTests(test_utils.TestCase):
     def setUp(self):
         super().setUp()
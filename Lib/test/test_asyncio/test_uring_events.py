@@ -0,0 +1,240 @@
+"""Tests for uring_events.py"""
+
+import errno
+import os
+import socket
+import tempfile
+import unittest
+from unittest import mock
+
+from test import support
+
+_uring = support.import_module('_uring')
+
+import asyncio
+from test.test_asyncio import utils as test_utils
+
+
+def _ring_supported():
+    try:
+        _uring.Ring(1).close()
+    except OSError:
+        # ENOSYS, or io_uring disabled by the administrator
+        return False
+    return True
+
+
+@unittest.skipUnless(_ring_supported(), 'io_uring is not available')
+class RingTests(unittest.TestCase):
+
+    def setUp(self):
+        self.ring = _uring.Ring(8)
+        self.addCleanup(self.ring.close)
+        self.rsock, self.wsock = socket.socketpair()
+        self.addCleanup(self.rsock.close)
+        self.addCleanup(self.wsock.close)
+
+    def test_recv(self):
+        self.ring.recv(1, self.rsock.fileno(), 100)
+        self.assertEqual(self.ring.pending, 1)
+        self.assertEqual(self.ring.wait(0), [])
+        self.wsock.send(b'data')
+        self.assertEqual(self.ring.wait(5), [(1, 4, b'data')])
+        self.assertEqual(self.ring.pending, 0)
+
+    def test_recv_into_and_send(self):
+        buf = bytearray(10)
+        self.ring.recv_into(1, self.rsock.fileno(), buf)
+        self.ring.send(2, self.wsock.fileno(), b'abc')
+        results = []
+        while len(results) < 2:
+            results.extend(self.ring.wait(5))
+        self.assertEqual(sorted(results), [(1, 3, None), (2, 3, None)])
+        self.assertEqual(buf[:3], b'abc')
+
+    def test_error(self):
+        self.wsock.close()
+        self.ring.send(1, self.rsock.fileno(), b'x')
+        [(key, res, data)] = self.ring.wait(5)
+        self.assertLess(res, 0)
+
+    def test_cancel(self):
+        self.ring.recv(1, self.rsock.fileno(), 100)
+        self.ring.cancel(2, 1)
+        results = []
+        while len(results) < 2:
+            results.extend(self.ring.wait(5))
+        self.assertIn((1, -errno.ECANCELED, None), results)
+
+    def test_duplicate_key(self):
+        self.ring.recv(1, self.rsock.fileno(), 100)
+        with self.assertRaises(ValueError):
+            self.ring.recv(1, self.rsock.fileno(), 100)
+        self.ring.cancel(2, 1)
+        while self.ring.pending:
+            self.ring.wait(5)
+
+    def test_file(self):
+        with tempfile.TemporaryFile() as f:
+            self.ring.write(1, f.fileno(), b'hello world', 0)
+            self.assertEqual(self.ring.wait(5), [(1, 11, None)])
+            self.ring.read(2, f.fileno(), 100, 6)
+            self.assertEqual(self.ring.wait(5), [(2, 5, b'world')])
+
+    @support.cpython_only
+    def test_wait_no_memory(self):
+        _testcapi = support.import_module('_testcapi')
+        # Completions must neither be lost nor returned twice when wait()
+        # fails in the middle of the queue.
+        wait = self.ring.wait
+        for start in range(12):
+            with self.subTest(start=start):
+                for key in (1, 2, 3):
+                    self.ring.send(key, self.wsock.fileno(), b'x')
+                _testcapi.set_nomemory(start, start + 1)
+                try:
+                    results = wait(5)
+                except MemoryError:
+                    results = []
+                finally:
+                    _testcapi.remove_mem_hooks()
+                for i in range(3):
+                    if len(results) == 3:
+                        break
+                    results.extend(wait(1))
+                self.assertEqual(sorted(results),
+                                 [(1, 1, None), (2, 1, None), (3, 1, None)])
+                self.assertEqual(self.ring.pending, 0)
+                self.assertEqual(self.rsock.recv(10), b'xxx')
+
+    def test_close(self):
+        self.assertFalse(self.ring.closed)
+        self.ring.close()
+        self.assertTrue(self.ring.closed)
+        self.ring.close()
+        self.assertRaises(ValueError, self.ring.fileno)
+        self.assertRaises(ValueError, self.ring.recv,
+                          1, self.rsock.fileno(), 100)
+
+    def test_close_pending(self):
+        ring = _uring.Ring(8)
+        ring.recv(1, self.rsock.fileno(), 100)
+        with self.assertWarns(RuntimeWarning):
+            ring.close()
+
+
+@unittest.skipUnless(_ring_supported(), 'io_uring is not available')
+class IoUringEventLoopTests(test_utils.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.loop = asyncio.IoUringEventLoop()
+        self.set_event_loop(self.loop)
+
+    def test_policy(self):
+        policy = asyncio.IoUringEventLoopPolicy()
+        loop = policy.new_event_loop()
+        try:
+            self.assertIsInstance(loop, asyncio.IoUringEventLoop)
+        finally:
+            loop.close()
+
+    def test_sock_sendall_large(self):
+        # The data does not fit in the socket buffers, the proactor has to
+        # send it in several operations.
+        data = b'x' * (16 * 1024 * 1024)
+        rsock, wsock = socket.socketpair()
+        self.addCleanup(rsock.close)
+        self.addCleanup(wsock.close)
+        rsock.setblocking(False)
+        wsock.setblocking(False)
+
+        async def receive():
+            received = bytearray()
+            while len(received) < len(data):
+                received += await self.loop.sock_recv(rsock, 1024 * 1024)
+            return bytes(received)
+
+        async def main():
+            send = self.loop.create_task(self.loop.sock_sendall(wsock, data))
+            received = await receive()
+            self.assertEqual(await send, len(data))
+            return received
+
+        self.assertEqual(self.loop.run_until_complete(main()), data)
+
+    def test_sock_recv_cancel(self):
+        rsock, wsock = socket.socketpair()
+        self.addCleanup(rsock.close)
+        self.addCleanup(wsock.close)
+        rsock.setblocking(False)
+
+        async def main():
+            task = self.loop.create_task(self.loop.sock_recv(rsock, 100))
+            await asyncio.sleep(0.01, loop=self.loop)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            # The data is not consumed by the cancelled operation
+            wsock.send(b'data')
+            return await self.loop.sock_recv(rsock, 100)
+
+        self.assertEqual(self.loop.run_until_complete(main()), b'data')
+
+    def test_file_read_write(self):
+        with tempfile.TemporaryFile() as f:
+            async def main():
+                n = await self.loop.file_write(f, b'hello world', 0)
+                self.assertEqual(n, 11)
+                self.assertEqual(
+                    await self.loop.file_read(f, 100, 6), b'world')
+                self.assertEqual(
+                    await self.loop.file_read(f.fileno(), 5, 0), b'hello')
+            self.loop.run_until_complete(main())
+
+    def test_write_pipe_closed(self):
+        rpipe, wpipe = os.pipe()
+        pipeobj = open(wpipe, 'wb', buffering=0)
+        proto = asyncio.Protocol()
+        lost = self.loop.create_future()
+        proto.connection_lost = lost.set_result
+
+        transport, _ = self.loop.run_until_complete(
+            self.loop.connect_write_pipe(lambda: proto, pipeobj))
+        os.close(rpipe)
+        self.loop.run_until_complete(asyncio.wait_for(lost, 5,
+                                                      loop=self.loop))
+        self.assertTrue(transport.is_closing())
+
+    def test_close_with_pending_operations(self):
+        rsock, wsock = socket.socketpair()
+        self.addCleanup(rsock.close)
+        self.addCleanup(wsock.close)
+        fut = self.loop._proactor.recv(rsock, 100)
+        with mock.patch('asyncio.uring_events.logger') as m_logger:
+            self.loop.close()
+        self.assertTrue(fut.cancelled())
+        # The cancellation completes right away
+        self.assertFalse(m_logger.debug.called)
+
+    def test_accept_after_stop_serving(self):
+        listener = socket.socket()
+        self.addCleanup(listener.close)
+        listener.bind((support.HOST, 0))
+        listener.listen()
+        listener.setblocking(False)
+        proactor = self.loop._proactor
+        fut = proactor.accept(listener)
+        client = socket.create_connection(listener.getsockname())
+        self.addCleanup(client.close)
+        proactor._stop_serving(listener)
+        while not fut.done():
+            self.assertTrue(proactor._poll(10))
+        self.assertTrue(fut.cancelled())
+        # The connection accepted too late is closed
+        client.settimeout(10)
+        self.assertEqual(client.recv(1), b'')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -345,6 +345,98 @@ Larry
         self.assertEqual(fs.list[0].name, 'submit-name')
         self.assertEqual(fs.list[0].value, 'Larry')
 
+    def test_fieldstorage_multipart_binary(self):
+        # Binary data is copied unchanged, including what looks like a
+        # boundary but is not one
+        content = bytes(range(256)) * 1000 + b'\r\n---123x\r\n---12\r'
+        data = (b'---123\r\n'
+                b'Content-Disposition: form-data; name="upload"; '
+                b'filename="fake.bin"\r\n'
+                b'\r\n' + content + b'\r\n'
+                b'---123--\r\n')
+        environ = {
+            'CONTENT_LENGTH':   str(len(data)),
+            'CONTENT_TYPE':     'multipart/form-data; boundary=-123',
+            'REQUEST_METHOD':   'POST',
+        }
+        fs = cgi.FieldStorage(BytesIO(data), environ=environ)
+        self.assertEqual(fs['upload'].filename, 'fake.bin')
+        self.assertEqual(fs['upload'].value, content)
+        self.assertEqual(fs.bytes_read, len(data))
+
+    def test_multipart_parser(self):
+        data = POSTDATA_W3.replace('\n', '\r\n').encode('latin-1')
+        expected = [
+            ('headers', 'form-data; name="submit-name"'),
+            ('data', b'Larry'),
+            ('end', None),
+            ('headers', 'form-data; name="files"'),
+            ('data', data[data.index(b'--BbC04y'):data.index(b'\r\n--AaB03x--')]),
+            ('end', None),
+        ]
+        # The events don't depend on how the data is split
+        for size in 1, 2, 7, len(data):
+            parser = cgi.MultipartParser(BOUNDARY_W3)
+            events = []
+            for i in range(0, len(data), size):
+                parser.feed(data[i:i+size])
+                events.extend(parser.read_events())
+            self.assertTrue(parser.done)
+            parser.close()
+            result = []
+            for event, value in events:
+                if event == 'headers':
+                    value = value['content-disposition']
+                elif event == 'data' and result[-1][0] == 'data':
+                    result[-1] = ('data', result[-1][1] + value)
+                    continue
+                result.append((event, value))
+            self.assertEqual(result, expected)
+
+    def test_multipart_parser_incomplete(self):
+        parser = cgi.MultipartParser('-123')
+        parser.feed(b'---123\r\nContent-Type: text/plain\r\n\r\nabc\r\n---')
+        with self.assertRaises(ValueError):
+            parser.close()
+        events = list(parser.read_events())
+        self.assertEqual([event for event, value in events],
+                         ['headers', 'data', 'end'])
+        self.assertEqual(b''.join(value for event, value in events
+                                  if event == 'data'),
+                         b'abc\r\n---')
+        with self.assertRaises(ValueError):
+            parser.feed(b'123--')
+
+        self.assertRaises(ValueError, cgi.MultipartParser, 'spam ')
+
+    def test_iter_multipart(self):
+        content = b'x' * 1000
+        data = ('--AaB03x\r\n'
+                'Content-Disposition: form-data; name="small"\r\n'
+                '\r\n'
+                'Larry\r\n'
+                '--AaB03x\r\n'
+                'Content-Disposition: form-data; name="big"\r\n'
+                '\r\n' + 'x' * 1000 + '\r\n'
+                '--AaB03x--\r\n').encode('ascii')
+        fp = BytesIO(data + b'next request')
+        parts = cgi.iter_multipart(fp, 'AaB03x', len(data), max_size=100)
+        headers, file = next(parts)
+        self.assertEqual(headers['content-disposition'],
+                         'form-data; name="small"')
+        self.assertEqual(file.read(), b'Larry')
+        self.assertFalse(file._rolled)
+        headers, file = next(parts)
+        with file:
+            self.assertEqual(file.read(), content)
+            self.assertTrue(file._rolled)
+        self.assertRaises(StopIteration, next, parts)
+        self.assertEqual(fp.read(), b'next request')
+
+        fp = BytesIO(data[:-20])
+        with self.assertRaises(ValueError):
+            list(cgi.iter_multipart(fp, 'AaB03x'))
+
     def test_fieldstorage_as_context_manager(self):
         fp = BytesIO(b'x' * 10)
         env = {'REQUEST_METHOD': 'PUT'}
@@ -52,6 +52,10 @@ def sleep_and_raise(t):
     time.sleep(t)
     raise Exception('this is an exception')
 
+def sleep_and_return(t, value):
+    time.sleep(t)
+    return value
+
 def sleep_and_print(t, msg):
     time.sleep(t)
     print(msg)
@@ -372,7 +376,12 @@ class ProcessPoolShutdownTest(ExecutorShutdownTest):
         self.executor.submit(mul, 21, 2)
         self.executor.submit(mul, 6, 7)
         self.executor.submit(mul, 3, 14)
-        self.assertEqual(len(self.executor._processes), 5)
+        context = self.get_context()
+        if context.get_start_method(allow_none=False) == "fork":
+            self.assertEqual(len(self.executor._processes), 5)
+        else:
+            # Workers are started on demand: at most one per call.
+            self.assertLessEqual(len(self.executor._processes), 3)
         processes = self.executor._processes
         self.executor.shutdown()
 
@@ -658,6 +667,40 @@ class ExecutorTest:
 
         self.assertEqual([None, None], results)
 
+    def test_map_unordered(self):
+        self.assertEqual(
+                sorted(self.executor.map(pow, range(10), range(10),
+                                         ordered=False)),
+                sorted(map(pow, range(10), range(10))))
+
+        self.assertEqual(
+                sorted(self.executor.map(pow, range(10), range(10),
+                                         chunksize=3, ordered=False)),
+                sorted(map(pow, range(10), range(10))))
+
+    def test_map_unordered_yields_completed_first(self):
+        results = self.executor.map(sleep_and_return, [1.5, 0],
+                                    ['slow', 'fast'], ordered=False)
+        self.assertEqual(list(results), ['fast', 'slow'])
+
+    def test_map_unordered_exception(self):
+        i = self.executor.map(divmod, [1, 1], [0, 0], ordered=False)
+        self.assertRaises(ZeroDivisionError, i.__next__)
+
+    def test_map_unordered_timeout(self):
+        results = []
+        try:
+            for i in self.executor.map(time.sleep,
+                                       [6, 0, 0],
+                                       timeout=5, ordered=False):
+                results.append(i)
+        except futures.TimeoutError:
+            pass
+        else:
+            self.fail('expected TimeoutError')
+
+        self.assertEqual([None, None], results)
+
     def test_shutdown_race_issue12456(self):
         # Issue #12456: race condition at shutdown where trying to post a
         # sentinel in the call queue blocks (the queue is full while processes
@@ -778,6 +821,151 @@ class ProcessPoolExecutorTest(ExecutorTest):
 
         self.assertTrue(obj.event.wait(timeout=1))
 
+    def _skip_if_fork(self):
+        context = self.get_context()
+        if context.get_start_method(allow_none=False) == "fork":
+            self.skipTest("Incompatible with the fork start method.")
+
+    def test_idle_process_reuse_one(self):
+        self._skip_if_fork()
+        # Not using self.executor, which has already started its workers.
+        executor = self.executor_type(4, mp_context=self.get_context())
+        self.assertEqual(len(executor._processes), 0)
+        executor.submit(mul, 21, 2).result()
+        executor.submit(mul, 6, 7).result()
+        executor.submit(mul, 3, 14).result()
+        self.assertEqual(len(executor._processes), 1)
+        executor.shutdown()
+
+    def test_idle_process_reuse_multiple(self):
+        self._skip_if_fork()
+        executor = self.executor_type(5, mp_context=self.get_context())
+        executor.submit(mul, 12, 7).result()
+        executor.submit(mul, 33, 25)
+        executor.submit(mul, 25, 26).result()
+        executor.submit(mul, 18, 29)
+        executor.submit(mul, 1, 2).result()
+        executor.submit(mul, 0, 9)
+        self.assertLessEqual(len(executor._processes), 3)
+        executor.shutdown()
+
+    def test_fork_starts_all_workers(self):
+        context = self.get_context()
+        if context.get_start_method(allow_none=False) != "fork":
+            self.skipTest("Only relevant to the fork start method.")
+        executor = self.executor_type(3, mp_context=context)
+        executor.submit(mul, 2, 3).result()
+        self.assertEqual(len(executor._processes), 3)
+        executor.shutdown()
+
+    def test_max_tasks_per_child(self):
+        context = self.get_context()
+        if context.get_start_method(allow_none=False) == "fork":
+            with self.assertRaises(ValueError):
+                self.executor_type(1, mp_context=context,
+                                   max_tasks_per_child=3)
+            return
+        # Not using self.executor as we need to control construction.
+        executor = self.executor_type(
+                1, mp_context=context, max_tasks_per_child=3)
+        f1 = executor.submit(os.getpid)
+        original_pid = f1.result()
+        # The worker pid remains the same as the worker could be reused
+        f2 = executor.submit(os.getpid)
+        self.assertEqual(f2.result(), original_pid)
+        self.assertEqual(len(executor._processes), 1)
+        f3 = executor.submit(os.getpid)
+        self.assertEqual(f3.result(), original_pid)
+
+        # A new worker is spawned, with a statistically different pid,
+        # while the previous was reaped.
+        f4 = executor.submit(os.getpid)
+        new_pid = f4.result()
+        self.assertNotEqual(original_pid, new_pid)
+        self.assertEqual(len(executor._processes), 1)
+
+        executor.shutdown()
+
+    def test_max_tasks_per_child_replaces_busy_worker(self):
+        # The worker exits after sending back the results of calls queued
+        # together: it must be replaced even though the idle worker
+        # semaphore was released by its earlier results.
+        context = self.get_context()
+        if context.get_start_method(allow_none=False) == "fork":
+            self.skipTest("max_tasks_per_child is incompatible with fork")
+        executor = self.executor_type(
+                1, mp_context=context, max_tasks_per_child=2)
+        fs = [executor.submit(time.sleep, 0.2) for _ in range(2)]
+        futures.wait(fs)
+        time.sleep(0.2)
+        f = executor.submit(os.getpid)
+        self.assertIsInstance(f.result(timeout=30), int)
+        self.assertEqual(len(executor._processes), 1)
+        executor.shutdown()
+
+    def test_max_tasks_per_child_defaults_to_spawn_context(self):
+        executor = self.executor_type(1, max_tasks_per_child=3)
+        self.assertEqual(executor._mp_context.get_start_method(), "spawn")
+        executor.shutdown()
+
+    def test_result_batch_size(self):
+        executor = self.executor_type(
+                2, mp_context=self.get_context(), result_batch_size=8)
+        fs = [executor.submit(mul, i, 2) for i in range(100)]
+        self.assertEqual([f.result() for f in fs],
+                         [mul(i, 2) for i in range(100)])
+        self.assertEqual(
+                list(executor.map(divmod, range(50), range(1, 51),
+                                  chunksize=4)),
+                list(map(divmod, range(50), range(1, 51))))
+        executor.shutdown()
+
+    def test_result_batch_size_exception(self):
+        executor = self.executor_type(
+                1, mp_context=self.get_context(), result_batch_size=4)
+        fs = [executor.submit(divmod, 1, i) for i in (1, 0, 2)]
+        self.assertEqual(fs[0].result(), (1, 0))
+        with self.assertRaises(ZeroDivisionError):
+            fs[1].result()
+        self.assertEqual(fs[2].result(), (0, 1))
+        executor.shutdown()
+
+    def test_result_batch_size_invalid(self):
+        context = self.get_context()
+        with self.assertRaises(ValueError):
+            self.executor_type(1, mp_context=context, result_batch_size=0)
+        with self.assertRaises(TypeError):
+            self.executor_type(1, mp_context=context, result_batch_size=None)
+
+    def test_max_tasks_per_child_invalid(self):
+        context = self.get_context()
+        with self.assertRaises(ValueError):
+            self.executor_type(1, mp_context=context, max_tasks_per_child=0)
+        with self.assertRaises(TypeError):
+            self.executor_type(1, mp_context=context, max_tasks_per_child=1.5)
+
+    def test_max_tasks_early_shutdown(self):
+        self._skip_if_fork()
+        executor = self.executor_type(
+                3, mp_context=self.get_context(), max_tasks_per_child=1)
+        futures = []
+        for i in range(6):
+            futures.append(executor.submit(mul, i, i))
+        executor.shutdown()
+        for i, future in enumerate(futures):
+            self.assertEqual(future.result(), mul(i, i))
+
+    def test_max_tasks_per_child_exception(self):
+        self._skip_if_fork()
+        executor = self.executor_type(
+                2, mp_context=self.get_context(), max_tasks_per_child=1)
+        futures = [executor.submit(divmod, 1, i) for i in range(4)]
+        with self.assertRaises(ZeroDivisionError):
+            futures[0].result()
+        self.assertEqual([f.result() for f in futures[1:]],
+                         [(1, 0), (0, 1), (0, 1)])
+        executor.shutdown()
+
 
 create_executor_tests(ProcessPoolExecutorTest,
                       executor_mixins=(ProcessPoolForkMixin,
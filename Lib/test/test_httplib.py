@@ -1652,6 +1652,34 @@ class HTTPSTest(TestCase):
         self.addCleanup(resp.close)
         self.assertEqual(resp.status, 404)
 
+    def test_local_session_resumption(self):
+        # Connections sharing a context with a session cache resume the
+        # session of the previous connection to the same server
+        import ssl
+        server = self.make_server(CERT_localhost)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.load_verify_locations(CERT_localhost)
+        context.session_cache = ssl.SSLSessionCache()
+        sockets = []
+        def wrap_socket(*args, wrap_socket=context.wrap_socket, **kwargs):
+            sock = wrap_socket(*args, **kwargs)
+            sockets.append(sock)
+            return sock
+        context.wrap_socket = wrap_socket
+        for i in range(2):
+            h = client.HTTPSConnection('localhost', server.port,
+                                       context=context)
+            h.request('GET', '/nonexistent')
+            resp = h.getresponse()
+            self.assertEqual(resp.status, 404)
+            # The response keeps the socket open after the connection is
+            # closed
+            self.assertEqual(sockets[-1].session_reused, i > 0)
+            resp.read()
+            resp.close()
+            h.close()
+            self.assertEqual(len(context.session_cache), 1)
+
     def test_local_bad_hostname(self):
         # The (valid) cert doesn't validate the HTTP hostname
         import ssl
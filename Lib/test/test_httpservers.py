@@ -23,6 +23,7 @@ import tempfile
 import time
 import datetime
 import threading
+from functools import partial
 from unittest import mock
 from io import BytesIO
 
@@ -494,10 +495,103 @@ class SimpleHTTPServerTestCase(BaseTestCase):
 
         headers = email.message.Message()
         headers['If-Modified-Since'] = self.last_modif_header
-        headers['If-None-Match'] = "*"
+        headers['If-None-Match'] = '"not-the-etag"'
         response = self.request(self.base_url + '/test', headers=headers)
         self.check_status_and_reason(response, HTTPStatus.OK)
 
+    def test_etag(self):
+        response = self.request(self.base_url + '/test')
+        self.check_status_and_reason(response, HTTPStatus.OK, data=self.data)
+        etag = response.getheader('ETag')
+        self.assertTrue(etag.startswith('"'))
+        for value in (etag, 'W/' + etag, '"other", ' + etag, '*'):
+            with self.subTest(value=value):
+                response = self.request(self.base_url + '/test',
+                                        headers={'If-None-Match': value})
+                self.check_status_and_reason(response,
+                                             HTTPStatus.NOT_MODIFIED)
+                self.assertEqual(response.getheader('ETag'), etag)
+
+        # the entity tag changes with the file
+        with open(os.path.join(self.tempdir, 'test'), 'ab') as f:
+            f.write(b'!')
+        response = self.request(self.base_url + '/test',
+                                headers={'If-None-Match': etag})
+        self.check_status_and_reason(response, HTTPStatus.OK,
+                                     data=self.data + b'!')
+        self.assertNotEqual(response.getheader('ETag'), etag)
+
+    def check_range(self, value, first, last, headers={}):
+        headers = dict(headers, Range=value)
+        response = self.request(self.base_url + '/test', headers=headers)
+        self.check_status_and_reason(response, HTTPStatus.PARTIAL_CONTENT,
+                                     data=self.data[first:last + 1])
+        self.assertEqual(response.getheader('Content-Range'),
+                         'bytes %d-%d/%d' % (first, last, len(self.data)))
+        self.assertEqual(response.getheader('Content-Length'),
+                         str(last - first + 1))
+
+    def test_range(self):
+        size = len(self.data)
+        self.check_range('bytes=0-0', 0, 0)
+        self.check_range('bytes=3-9', 3, 9)
+        self.check_range('bytes=3-', 3, size - 1)
+        self.check_range('bytes=3-1000', 3, size - 1)
+        self.check_range('bytes=-5', size - 5, size - 1)
+        self.check_range('bytes=-1000', 0, size - 1)
+        self.check_range('BYTES = 2-4', 2, 4)
+
+    def test_range_ignored(self):
+        for value in ('bytes=0-1,3-4', 'bytes=5-3', 'bytes=a-b', 'bytes=-',
+                      'bytes=1', 'items=0-1', 'bytes=+1-2', 'bytes=\xb2-',
+                      'bytes=0-\xb2'):
+            with self.subTest(value=value):
+                response = self.request(self.base_url + '/test',
+                                        headers={'Range': value})
+                self.check_status_and_reason(response, HTTPStatus.OK,
+                                             data=self.data)
+        # Range only applies to GET
+        response = self.request(self.base_url + '/test', method='HEAD',
+                                headers={'Range': 'bytes=0-1'})
+        self.check_status_and_reason(response, HTTPStatus.OK)
+        self.assertEqual(response.getheader('Content-Length'),
+                         str(len(self.data)))
+
+    def test_range_copyfile_without_count(self):
+        # copyfile() overrides without the count parameter still send
+        # only the requested range
+        def copyfile(self, source, outputfile):
+            shutil.copyfileobj(source, outputfile)
+        with mock.patch.object(self.request_handler, 'copyfile', copyfile):
+            self.check_range('bytes=3-9', 3, 9)
+            self.check_range('bytes=-5', len(self.data) - 5,
+                             len(self.data) - 1)
+
+    def test_range_not_satisfiable(self):
+        size = len(self.data)
+        for value in ('bytes=%d-' % size, 'bytes=1000-2000', 'bytes=-0'):
+            with self.subTest(value=value):
+                response = self.request(self.base_url + '/test',
+                                        headers={'Range': value})
+                self.check_status_and_reason(
+                    response, HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.assertEqual(response.getheader('Content-Range'),
+                                 'bytes */%d' % size)
+
+    def test_if_range(self):
+        response = self.request(self.base_url + '/test')
+        self.check_status_and_reason(response, HTTPStatus.OK, data=self.data)
+        self.assertEqual(response.getheader('Accept-Ranges'), 'bytes')
+        etag = response.getheader('ETag')
+        self.check_range('bytes=1-2', 1, 2, {'If-Range': etag})
+        self.check_range('bytes=1-2', 1, 2,
+                         {'If-Range': self.last_modif_header})
+        # the file changed: send all of it
+        response = self.request(self.base_url + '/test',
+                                headers={'Range': 'bytes=1-2',
+                                         'If-Range': '"other"'})
+        self.check_status_and_reason(response, HTTPStatus.OK, data=self.data)
+
     def test_invalid_requests(self):
         response = self.request('/', method='FOO')
         self.check_status_and_reason(response, HTTPStatus.NOT_IMPLEMENTED)
@@ -554,6 +648,55 @@ class SimpleHTTPServerTestCase(BaseTestCase):
         self.assertIn(html_text.encode(enc), body)
 
 
+class SimpleHTTPServerKeepAliveTestCase(BaseTestCase):
+    class request_handler(NoLogRequestHandler, SimpleHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tempdir)
+        self.request_handler = partial(self.request_handler,
+                                       directory=self.tempdir)
+        BaseTestCase.setUp(self)
+        self.data = os.urandom(256 * 1024)
+        with open(os.path.join(self.tempdir, 'test'), 'wb') as f:
+            f.write(self.data)
+        os.mkdir(os.path.join(self.tempdir, 'dir'))
+
+    def test_persistent_connection(self):
+        conn = http.client.HTTPConnection(self.HOST, self.PORT)
+        try:
+            self.check_persistent_connection(conn)
+        finally:
+            # the server handles one connection at a time
+            conn.close()
+
+    def check_persistent_connection(self, conn):
+        requests = [
+            ('GET', '/test', HTTPStatus.OK, self.data),
+            ('HEAD', '/test', HTTPStatus.OK, b''),
+            ('GET', '/dir', HTTPStatus.MOVED_PERMANENTLY, b''),
+            ('GET', '/dir/', HTTPStatus.OK, None),
+        ]
+        for method, path, status, data in requests:
+            with self.subTest(method=method, path=path):
+                conn.request(method, path)
+                response = conn.getresponse()
+                body = response.read()
+                self.assertEqual(response.status, status)
+                self.assertEqual(response.version, 11)
+                if data is not None:
+                    self.assertEqual(body, data)
+                # the connection is still open
+                self.assertIsNotNone(conn.sock)
+
+        conn.request('GET', '/test', headers={'Range': 'bytes=1000-'})
+        response = conn.getresponse()
+        self.assertEqual(response.status, HTTPStatus.PARTIAL_CONTENT)
+        self.assertEqual(response.read(), self.data[1000:])
+        self.assertIsNotNone(conn.sock)
+
+
 cgi_file1 = """\
 #!%s
 
@@ -1124,6 +1267,7 @@ def test_main(verbose=None):
             BaseHTTPRequestHandlerTestCase,
             BaseHTTPServerTestCase,
             SimpleHTTPServerTestCase,
+            SimpleHTTPServerKeepAliveTestCase,
             CGIHTTPServerTestCase,
             SimpleHTTPRequestHandlerTestCase,
             MiscTestCase,
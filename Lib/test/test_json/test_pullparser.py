@@ -0,0 +1,181 @@
+from io import BytesIO, StringIO
+from collections import OrderedDict
+from test.test_json import PyTest, CTest
+
+
+DOC = '{"a": [1, -2.5e3, "x\\\\\\"\\u00e9y", {"b": null}], "c": true, "d": []}'
+EVENTS = [
+    ('start_object', None),
+    ('key', 'a'),
+    ('start_array', None),
+    ('value', 1),
+    ('value', -2500.0),
+    ('value', 'x\\"\xe9y'),
+    ('start_object', None),
+    ('key', 'b'),
+    ('value', None),
+    ('end_object', None),
+    ('end_array', None),
+    ('key', 'c'),
+    ('value', True),
+    ('key', 'd'),
+    ('start_array', None),
+    ('end_array', None),
+    ('end_object', None),
+]
+
+
+class TestPullParser:
+    def parse(self, data, depth=None, chunksize=None):
+        parser = self.json.JSONPullParser(depth)
+        events = []
+        if chunksize is None:
+            chunksize = len(data) or 1
+        for i in range(0, len(data), chunksize):
+            parser.feed(data[i:i + chunksize])
+            events.extend(parser.read_events())
+        parser.close()
+        events.extend(parser.read_events())
+        return events
+
+    def test_events(self):
+        self.assertEqual(self.parse(DOC), EVENTS)
+        self.assertEqual(self.parse(' 12 '), [('value', 12)])
+        self.assertEqual(self.parse('"abc"'), [('value', 'abc')])
+        self.assertEqual(self.parse('[]'),
+                         [('start_array', None), ('end_array', None)])
+
+    def test_depth(self):
+        self.assertEqual(self.parse(DOC, depth=0),
+                         [('value', self.loads(DOC))])
+        self.assertEqual(self.parse(DOC, depth=1), [
+            ('start_object', None),
+            ('key', 'a'),
+            ('value', [1, -2500.0, 'x\\"\xe9y', {'b': None}]),
+            ('key', 'c'),
+            ('value', True),
+            ('key', 'd'),
+            ('value', []),
+            ('end_object', None),
+        ])
+        self.assertEqual(self.parse('[{"x": [1]}, [2, [3]], 4]', depth=1), [
+            ('start_array', None),
+            ('value', {'x': [1]}),
+            ('value', [2, [3]]),
+            ('value', 4),
+            ('end_array', None),
+        ])
+        self.assertRaises(ValueError, self.json.JSONPullParser, -1)
+
+    def test_chunks(self):
+        for chunksize in range(1, 8):
+            with self.subTest(chunksize=chunksize):
+                self.assertEqual(self.parse(DOC, chunksize=chunksize), EVENTS)
+                self.assertEqual(self.parse(DOC, 1, chunksize),
+                                 self.parse(DOC, 1))
+                self.assertEqual(self.parse(DOC.encode(), chunksize=chunksize),
+                                 EVENTS)
+
+    def test_incremental_events(self):
+        parser = self.json.JSONPullParser(1)
+        parser.feed('[{"a": 1}, {"b"')
+        self.assertEqual(list(parser.read_events()),
+                         [('start_array', None), ('value', {'a': 1})])
+        parser.feed(': 2}, 12')
+        self.assertEqual(list(parser.read_events()), [('value', {'b': 2})])
+        # The number may not be complete yet
+        parser.feed('3')
+        self.assertEqual(list(parser.read_events()), [])
+        parser.feed(']')
+        self.assertEqual(list(parser.read_events()),
+                         [('value', 123), ('end_array', None)])
+        parser.close()
+        self.assertEqual(list(parser.read_events()), [])
+        self.assertRaises(ValueError, parser.feed, '')
+
+    def test_encodings(self):
+        for encoding in ('utf-8', 'utf-8-sig', 'utf-16', 'utf-16-le',
+                         'utf-16-be', 'utf-32', 'utf-32-le', 'utf-32-be'):
+            data = DOC.encode(encoding)
+            for chunksize in (1, 3, None):
+                with self.subTest(encoding=encoding, chunksize=chunksize):
+                    self.assertEqual(self.parse(data, chunksize=chunksize),
+                                     EVENTS)
+        self.assertEqual(self.parse(b'1'), [('value', 1)])
+        self.assertEqual(self.parse(bytearray(b'[2]'), depth=0),
+                         [('value', [2])])
+
+    def test_bad_input(self):
+        parser = self.json.JSONPullParser()
+        self.assertRaises(TypeError, parser.feed, 1)
+        parser.feed('[')
+        self.assertRaises(TypeError, parser.feed, b'1')
+        parser = self.json.JSONPullParser()
+        parser.feed(b'[')
+        self.assertRaises(TypeError, parser.feed, '1')
+        with self.assertRaisesRegex(self.JSONDecodeError, 'BOM'):
+            self.json.JSONPullParser().feed('\ufeff[]')
+
+    def test_errors(self):
+        docs = [
+            '', '  ', '[', '[1,', '[1,]', '[1 2]', '[-]', '1 2', 'tru',
+            '{', '{"a"', '{"a":', '{"a":1', '{"a":1,}', '{\n "a" 1}', '{1: 2}',
+            '[\n  "abc', '[1,\n2,\n  "\\x"]', '{"a": [1, 2}',
+        ]
+        for doc in docs:
+            with self.assertRaises(self.JSONDecodeError) as cm:
+                self.loads(doc)
+            expected = cm.exception
+            for chunksize in (1, 3, None):
+                with self.subTest(doc=doc, chunksize=chunksize):
+                    with self.assertRaises(self.JSONDecodeError) as cm:
+                        self.parse(doc, chunksize=chunksize)
+                    err = cm.exception
+                    self.assertEqual(err.msg, expected.msg)
+                    self.assertEqual(err.pos, expected.pos)
+                    self.assertEqual(err.lineno, expected.lineno)
+                    self.assertEqual(err.colno, expected.colno)
+                    self.assertEqual(str(err), str(expected))
+
+    def test_decoder(self):
+        decoder = self.json.JSONDecoder(object_pairs_hook=OrderedDict,
+                                        parse_int=str)
+        parser = self.json.JSONPullParser(1, decoder=decoder)
+        parser.feed('{"a": {"c": 1, "b": 2}, "d": 3}')
+        parser.close()
+        events = list(parser.read_events())
+        self.assertEqual(events, [
+            ('start_object', None),
+            ('key', 'a'),
+            ('value', OrderedDict([('c', '1'), ('b', '2')])),
+            ('key', 'd'),
+            ('value', '3'),
+            ('end_object', None),
+        ])
+        self.assertIs(type(events[2][1]), OrderedDict)
+
+    def test_iterload(self):
+        doc = '[{"x": 1}, [2, 3], 4.5]'
+        expected = [
+            ('start_array', None),
+            ('value', {'x': 1}),
+            ('value', [2, 3]),
+            ('value', 4.5),
+            ('end_array', None),
+        ]
+        self.assertEqual(list(self.json.iterload(StringIO(doc))), expected)
+        self.assertEqual(list(self.json.iterload(BytesIO(doc.encode()))),
+                         expected)
+        self.assertEqual(
+            list(self.json.iterload(StringIO(doc), depth=0, parse_float=str)),
+            [('value', [{'x': 1}, [2, 3], '4.5'])])
+        self.assertEqual(list(self.json.iterload(StringIO(doc), depth=None)),
+                         self.parse(doc))
+        it = self.json.iterload(StringIO('[1, 2'))
+        self.assertEqual(next(it), ('start_array', None))
+        self.assertEqual(next(it), ('value', 1))
+        self.assertRaises(self.JSONDecodeError, next, it)
+
+
+class TestPyPullParser(TestPullParser, PyTest): pass
+class TestCPullParser(TestPullParser, CTest): pass
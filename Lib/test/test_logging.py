@@ -2615,6 +2615,42 @@ class ConfigDictTest(BaseTest):
         }
     }
 
+    # config_queue_handler sends the records to its target handlers
+    # through a queue; 'queue' sorts before its targets, so it is deferred.
+    config_queue_handler = {
+        'version': 1,
+        'formatters': {
+            'form1' : {
+                'format' : '%(levelname)s ++ %(message)s',
+            },
+        },
+        'handlers' : {
+            'hand1' : {
+                'class' : 'logging.StreamHandler',
+                'formatter' : 'form1',
+                'level' : 'NOTSET',
+                'stream'  : 'ext://sys.stdout',
+            },
+            'hand2' : {
+                'class' : 'logging.StreamHandler',
+                'formatter' : 'form1',
+                'level' : 'CRITICAL',
+                'stream'  : 'ext://sys.stdout',
+            },
+            'queue' : {
+                'class' : 'logging.handlers.QueueHandler',
+                'handlers' : ['hand1', 'hand2'],
+                'queue' : 'ext://queue.Queue',
+                'respect_handler_level' : True,
+                'batch_size' : 10,
+            },
+        },
+        'root' : {
+            'level' : 'WARNING',
+            'handlers' : ['queue'],
+        },
+    }
+
     def apply_config(self, conf):
         logging.config.dictConfig(conf)
 
@@ -2990,6 +3026,96 @@ class ConfigDictTest(BaseTest):
         self.assertIsInstance(handler.formatter._style,
                               logging.StringTemplateStyle)
 
+    def test_config_queue_handler(self):
+        with support.captured_stdout() as output:
+            self.apply_config(self.config_queue_handler)
+            handler = logging.getLogger().handlers[0]
+            self.assertIsInstance(handler, logging.handlers.QueueHandler)
+            self.assertIsInstance(handler.queue, queue.Queue)
+            listener = handler.listener
+            self.assertIsInstance(listener, logging.handlers.QueueListener)
+            self.assertEqual([h.name for h in listener.handlers],
+                             ['hand1', 'hand2'])
+            self.assertTrue(listener.respect_handler_level)
+            self.assertEqual(listener.batch_size, 10)
+            logger = logging.getLogger()
+            logger.info(self.next_message())
+            logger.error(self.next_message())
+            logger.critical(self.next_message())
+            # Closing the handler stops the listener, after the records
+            # in the queue are handled
+            handler.close()
+            self.assertIsNone(handler.listener)
+            self.assertIsNone(listener._thread)
+            self.assert_log_lines([
+                ('ERROR', '2'),
+                ('CRITICAL', '3'),
+                ('CRITICAL', '3'),
+            ], stream=output)
+
+    def test_config_queue_handler_defaults(self):
+        config = {
+            'version': 1,
+            'handlers' : {
+                'hand1' : {
+                    'class' : 'logging.handlers.BufferingHandler',
+                    'capacity' : 100,
+                },
+                'queue' : {
+                    'class' : 'logging.handlers.QueueHandler',
+                    'handlers' : ['hand1'],
+                },
+            },
+            'root' : {
+                'level' : 'WARNING',
+                'handlers' : ['queue'],
+            },
+        }
+        self.apply_config(config)
+        handler = logging.getLogger().handlers[0]
+        self.addCleanup(handler.close)
+        self.assertIsInstance(handler.queue, queue.Queue)
+        self.assertFalse(handler.listener.respect_handler_level)
+        self.assertEqual(handler.listener.batch_size, 100)
+        target = handler.listener.handlers[0]
+        logging.warning('spam')
+        handler.queue.join()
+        self.assertEqual([r.msg for r in target.buffer], ['spam'])
+
+    def test_config_queue_handler_reconfigure(self):
+        config = {
+            'version': 1,
+            'handlers' : {
+                'hand1' : {
+                    'class' : 'logging.handlers.BufferingHandler',
+                    'capacity' : 100,
+                },
+                'queue' : {
+                    'class' : 'logging.handlers.QueueHandler',
+                    'handlers' : ['hand1'],
+                },
+            },
+            'root' : {
+                'level' : 'WARNING',
+                'handlers' : ['queue'],
+            },
+        }
+        self.apply_config(config)
+        handler = logging.getLogger().handlers[0]
+        listener = handler.listener
+        target = listener.handlers[0]
+        logging.warning('spam')
+        # Reconfiguring stops the previous listener, once the records in its
+        # queue are handled
+        self.apply_config(config)
+        new_handler = logging.getLogger().handlers[0]
+        self.addCleanup(new_handler.close)
+        self.assertIsNot(new_handler, handler)
+        self.assertIsNone(handler.listener)
+        self.assertIsNone(listener._thread)
+        self.assertEqual([r.msg for r in target.buffer], ['spam'])
+        self.assertIsNotNone(new_handler.listener._thread)
+
     def test_baseconfig(self):
         d = {
             'atuple': (1, 2, 3),
@@ -3166,6 +3292,103 @@ class QueueHandlerTest(BaseTest):
         self.assertFalse(handler.matches(levelno=logging.WARNING, message='4'))
         self.assertFalse(handler.matches(levelno=logging.ERROR, message='5'))
         self.assertTrue(handler.matches(levelno=logging.CRITICAL, message='6'))
+        handler.close()
+
+    @unittest.skipUnless(hasattr(logging.handlers, 'QueueListener'),
+                         'logging.handlers.QueueListener required for this test')
+    def test_queue_listener_batch(self):
+        handler = support.TestHandler(support.Matcher())
+        handler2 = support.TestHandler(support.Matcher())
+        handler2.setLevel(logging.CRITICAL)
+        listener = logging.handlers.QueueListener(self.queue, handler,
+                                                  handler2,
+                                                  respect_handler_level=True,
+                                                  batch_size=2)
+        batches = []
+        def handle_batch(records, handle_batch=listener.handle_batch):
+            batches.append(len(records))
+            handle_batch(records)
+        listener.handle_batch = handle_batch
+        # The records already in the queue are handled in batches
+        self.que_logger.warning(self.next_message())
+        self.que_logger.error(self.next_message())
+        self.que_logger.critical(self.next_message())
+        listener.start()
+        listener.stop()
+        # Stopping twice is harmless
+        listener.stop()
+        self.assertEqual(batches, [2, 1])
+        self.assertEqual([r['msg'] for r in handler.buffer], ['1', '2', '3'])
+        self.assertEqual([r['msg'] for r in handler2.buffer], ['3'])
+        self.assertRaises(queue.Empty, self.queue.get_nowait)
+        handler.close()
+        handler2.close()
+
+    def test_queue_listener_batch_flush(self):
+        class Stream(io.StringIO):
+            flushes = 0
+            def flush(self):
+                self.flushes += 1
+                super().flush()
+        stream = Stream()
+        handler = logging.StreamHandler(stream)
+        handler.addFilter(lambda record: record.msg != '2')
+        listener = logging.handlers.QueueListener(self.queue, handler,
+                                                  batch_size=10)
+        for i in range(3):
+            self.que_logger.warning(self.next_message())
+        listener.start()
+        listener.stop()
+        # The records are filtered, and the stream is flushed once per batch
+        self.assertEqual(stream.getvalue(), '1\n3\n')
+        self.assertEqual(stream.flushes, 1)
+        self.assertFalse(handler._deferFlush)
+        handler.close()
+
+    def test_queue_listener_batch_handle_overridden(self):
+        handled = []
+        class Listener(logging.handlers.QueueListener):
+            def handle(self, record):
+                handled.append(record.msg)
+                super().handle(record)
+        handler = support.TestHandler(support.Matcher())
+        listener = Listener(self.queue, handler, batch_size=10)
+        for i in range(3):
+            self.que_logger.warning(self.next_message())
+        listener.start()
+        listener.stop()
+        self.assertEqual(handled, ['1', '2', '3'])
+        self.assertEqual([r['msg'] for r in handler.buffer], ['1', '2', '3'])
+        handler.close()
+
+    def test_queue_listener_batch_handler_handle_overridden(self):
+        handled = []
+        class Handler(support.TestHandler):
+            def handle(self, record):
+                handled.append(record.msg)
+                return super().handle(record)
+        handler = Handler(support.Matcher())
+        listener = logging.handlers.QueueListener(self.queue, handler,
+                                                  batch_size=10)
+        for i in range(3):
+            self.que_logger.warning(self.next_message())
+        listener.start()
+        listener.stop()
+        self.assertEqual(handled, ['1', '2', '3'])
+        self.assertEqual([r['msg'] for r in handler.buffer], ['1', '2', '3'])
+        handler.close()
+
+    def test_close_stops_listener(self):
+        handler = support.TestHandler(support.Matcher())
+        listener = logging.handlers.QueueListener(self.queue, handler)
+        self.que_hdlr.listener = listener
+        listener.start()
+        self.que_logger.warning(self.next_message())
+        self.que_hdlr.close()
+        self.assertIsNone(self.que_hdlr.listener)
+        self.assertIsNone(listener._thread)
+        self.assertTrue(handler.matches(levelno=logging.WARNING, message='1'))
+        handler.close()
 
 if hasattr(logging.handlers, 'QueueListener'):
     import multiprocessing
@@ -3341,6 +3564,18 @@ class FormatterTest(unittest.TestCase):
         self.assertTrue(f.usesTime())
         f = logging.Formatter('asctime', style='$')
         self.assertFalse(f.usesTime())
+        # The template is applied as a %-format string
+        f = logging.Formatter('100% $name ${lineno}s $$', style='$')
+        self.assertEqual(f.format(r), '100% formatter.test 42s $')
+        # Invalid placeholders are still reported by the template
+        f = logging.Formatter('$message $', style='$')
+        self.assertRaises(ValueError, f.format, r)
+
+    def test_uses_time_changed_format(self):
+        f = logging.Formatter('%(message)s')
+        self.assertFalse(f.usesTime())
+        f._style._fmt = '%(asctime)s %(message)s'
+        self.assertTrue(f.usesTime())
 
     def test_invalid_style(self):
         self.assertRaises(ValueError, logging.Formatter, None, None, 'x')
@@ -3359,6 +3594,28 @@ class FormatterTest(unittest.TestCase):
         f.format(r)
         self.assertEqual(r.asctime, '1993-04-21 08:03:00,123')
 
+    def test_time_cache(self):
+        r = self.get_record()
+        dt = datetime.datetime(1993, 4, 21, 8, 3, 0, 0, utc)
+        created = dt.timestamp()
+        f = logging.Formatter('%(asctime)s %(message)s')
+        f.converter = time.gmtime
+        # Records of the same second share the formatted time, but not the
+        # milliseconds
+        r.created, r.msecs = created + 0.123, 123
+        self.assertEqual(f.formatTime(r), '1993-04-21 08:03:00,123')
+        r.created, r.msecs = created + 0.456, 456
+        self.assertEqual(f.formatTime(r), '1993-04-21 08:03:00,456')
+        self.assertEqual(f.formatTime(r, '%H:%M:%S'), '08:03:00')
+        r.created, r.msecs = created + 1, 0
+        self.assertEqual(f.formatTime(r, '%H:%M:%S'), '08:03:01')
+        self.assertEqual(f.formatTime(r), '1993-04-21 08:03:01,000')
+        # Changing the converter or the default format is taken into account
+        f.converter = lambda t: time.gmtime(t + 3600)
+        self.assertEqual(f.formatTime(r), '1993-04-21 09:03:01,000')
+        f.default_time_format = '%H:%M:%S'
+        self.assertEqual(f.formatTime(r), '09:03:01,000')
+
 class TestBufferingFormatter(logging.BufferingFormatter):
     def formatHeader(self, records):
         return '[(%d)' % len(records)
@@ -3701,6 +3958,61 @@ class LogRecordTest(BaseTest):
             logging.logProcesses = log_processes
             logging.logMultiprocessing = log_multiprocessing
 
+    def test_attributes(self):
+        r = logging.LogRecord('n', logging.INFO, 'p', 1, 'msg', None, None,
+                              attributes={'threadName', 'process'})
+        self.assertIsNone(r.thread)
+        self.assertEqual(r.threadName, threading.current_thread().name)
+        self.assertIsNone(r.processName)
+        self.assertEqual(r.process, os.getpid())
+
+    def test_record_attributes(self):
+        from unittest.mock import patch
+        h = RecordingHandler()
+        root = logging.getLogger()
+        root.addHandler(h)
+        self.addCleanup(root.removeHandler, h)
+        self.addCleanup(root.setRecordAttributes, None)
+        logger = logging.getLogger('compiler.parser')
+        self.assertIsNone(logger.getRecordAttributes())
+
+        root.setRecordAttributes(['message', 'lineno'])
+        self.assertEqual(logger.getRecordAttributes(), {'message', 'lineno'})
+        logger.warning('spam')
+        r = h.records[-1]
+        self.assertEqual(r.pathname, __file__)
+        self.assertEqual(r.funcName, 'test_record_attributes')
+        self.assertIsNone(r.thread)
+        self.assertIsNone(r.threadName)
+        self.assertIsNone(r.process)
+        self.assertIsNone(r.processName)
+
+        # Child loggers can declare their own attributes, findCaller() is
+        # only called if caller attributes are needed
+        logging.getLogger('compiler').setRecordAttributes(['thread'])
+        self.assertEqual(logger.getRecordAttributes(), {'thread'})
+        with patch.object(logger, 'findCaller') as findCaller:
+            logger.warning('eggs')
+        self.assertFalse(findCaller.called)
+        r = h.records[-1]
+        self.assertEqual(r.getMessage(), 'eggs')
+        self.assertEqual(r.pathname, '(unknown file)')
+        self.assertEqual(r.lineno, 0)
+        self.assertEqual(r.thread, threading.get_ident())
+        self.assertIsNone(r.threadName)
+        # ...or the stack is requested
+        logger.warning('ham', stack_info=True)
+        self.assertEqual(h.records[-1].funcName, 'test_record_attributes')
+        self.assertIsNotNone(h.records[-1].stack_info)
+
+        logging.getLogger('compiler').setRecordAttributes(None)
+        root.setRecordAttributes(None)
+        self.assertIsNone(logger.getRecordAttributes())
+        logger.warning('spam')
+        r = h.records[-1]
+        self.assertIsNotNone(r.thread)
+        self.assertIsNotNone(r.processName)
+
 class BasicConfigTest(unittest.TestCase):
 
     """Test suite for logging.basicConfig."""
@@ -4303,6 +4615,66 @@ class RotatingFileHandlerTest(BaseFileTest):
         self.assertFalse(os.path.exists(namer(self.fn + ".3")))
         rh.close()
 
+    def test_size_tracking(self):
+        class CountingFormatter(logging.Formatter):
+            calls = 0
+            def format(self, record):
+                self.calls += 1
+                return logging.Formatter.format(self, record)
+        # Each record takes 3 bytes with the line separator
+        size = len('1' + os.linesep)
+        rh = logging.handlers.RotatingFileHandler(
+            self.fn, backupCount=1, maxBytes=4 * size)
+        formatter = CountingFormatter()
+        rh.setFormatter(formatter)
+        for i in range(5):
+            rh.emit(logging.makeLogRecord({'msg': str(i)}))
+        # The records are formatted once each
+        self.assertEqual(formatter.calls, 5)
+        rh.close()
+        self.assertLogFile(self.fn + ".1")
+        with open(self.fn + ".1") as f:
+            self.assertEqual(f.read(), "0\n1\n2\n")
+        with open(self.fn) as f:
+            self.assertEqual(f.read(), "3\n4\n")
+
+        # The size of an existing file is taken into account
+        rh = logging.handlers.RotatingFileHandler(
+            self.fn, backupCount=1, maxBytes=4 * size)
+        rh.setFormatter(formatter)
+        rh.emit(logging.makeLogRecord({'msg': '5'}))
+        rh.emit(logging.makeLogRecord({'msg': '6'}))
+        rh.close()
+        with open(self.fn) as f:
+            self.assertEqual(f.read(), "6\n")
+
+    @support.requires_gzip
+    def test_compression(self):
+        import gzip
+        rh = logging.handlers.RotatingFileHandler(
+            self.fn, backupCount=2, maxBytes=1, compression='gzip')
+        m1 = self.next_rec()
+        rh.emit(m1)
+        m2 = self.next_rec()
+        rh.emit(m2)
+        rh.emit(self.next_rec())
+        rh.close()
+        newline = os.linesep.encode('ascii')
+        fn = self.fn + ".1.gz"
+        self.assertLogFile(fn)
+        with gzip.open(fn) as f:
+            self.assertEqual(f.read(), m2.msg.encode('ascii') + newline)
+        fn = self.fn + ".2.gz"
+        self.assertLogFile(fn)
+        with gzip.open(fn) as f:
+            self.assertEqual(f.read(), m1.msg.encode('ascii') + newline)
+        self.assertFalse(os.path.exists(self.fn + ".rotating"))
+        self.assertFalse(os.path.exists(self.fn + ".3.gz"))
+
+    def test_invalid_compression(self):
+        with self.assertRaises(ValueError):
+            logging.handlers.RotatingFileHandler(self.fn, compression='zip')
+
 class TimedRotatingFileHandlerTest(BaseFileTest):
     # other test methods added below
     def test_rollover(self):
@@ -2125,6 +2125,69 @@ class BasicUDPTest(ThreadedUDPSocketTest):
     def _testRecvFromNegative(self):
         self.cli.sendto(MSG, 0, (HOST, self.port))
 
+
+@unittest.skipUnless(hasattr(socket.socket, 'recvmmsg') and
+                     hasattr(socket.socket, 'sendmmsg'),
+                     'need socket.recvmmsg() and socket.sendmmsg()')
+class MultiMessageUDPTest(SocketUDPTest):
+    # Tests for sendmmsg() and recvmmsg()
+
+    def setUp(self):
+        super().setUp()
+        self.cli = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.addCleanup(self.cli.close)
+        self.cli.bind((HOST, 0))
+        self.serv_addr = self.serv.getsockname()
+        self.cli_addr = self.cli.getsockname()
+
+    def testSendmmsgAndRecvmmsg(self):
+        messages = [(b'first', self.serv_addr),
+                    (bytearray(b'second'), self.serv_addr),
+                    (memoryview(b'third'), self.serv_addr)]
+        self.assertEqual(self.cli.sendmmsg(messages), 3)
+        received = []
+        while len(received) < 3:
+            received.extend(self.serv.recvmmsg(10, 1024))
+        self.assertEqual(received, [(b'first', self.cli_addr),
+                                    (b'second', self.cli_addr),
+                                    (b'third', self.cli_addr)])
+
+    def testRecvmmsgCount(self):
+        self.cli.sendmmsg([(MSG, self.serv_addr)] * 3)
+        received = self.serv.recvmmsg(2, 1024)
+        self.assertLessEqual(len(received), 2)
+        self.assertGreaterEqual(len(received), 1)
+
+    def testRecvmmsgTruncated(self):
+        self.cli.sendmmsg([(MSG, self.serv_addr)])
+        [(data, addr)] = self.serv.recvmmsg(1, 3)
+        self.assertEqual(data, MSG[:3])
+
+    def testRecvmmsgNonBlocking(self):
+        self.serv.setblocking(False)
+        self.assertRaises(BlockingIOError, self.serv.recvmmsg, 10, 1024)
+
+    def testRecvmmsgBadArgs(self):
+        self.assertRaises(ValueError, self.serv.recvmmsg, 0, 1024)
+        self.assertRaises(ValueError, self.serv.recvmmsg, 1, -1)
+        self.assertRaises(TypeError, self.serv.recvmmsg, 1)
+
+    def testSendmmsgConnected(self):
+        self.cli.connect(self.serv_addr)
+        self.assertEqual(self.cli.sendmmsg([(MSG, None), (MSG, None)]), 2)
+        self.assertEqual(self.serv.recvfrom(1024), (MSG, self.cli_addr))
+
+    def testSendmmsgEmpty(self):
+        self.assertEqual(self.cli.sendmmsg([]), 0)
+        self.assertEqual(self.cli.sendmmsg(iter([])), 0)
+
+    def testSendmmsgBadArgs(self):
+        self.assertRaises(TypeError, self.cli.sendmmsg, 1)
+        self.assertRaises(TypeError, self.cli.sendmmsg, [MSG])
+        self.assertRaises(TypeError, self.cli.sendmmsg, [(MSG,)])
+        self.assertRaises(TypeError, self.cli.sendmmsg,
+                          [('str', self.serv_addr)])
+
 # Tests for the sendmsg()/recvmsg() interface.  Where possible, the
 # same test code is used with different families and types of socket
 # (e.g. stream, datagram), and tests using recvmsg() are repeated
@@ -5740,7 +5803,8 @@ class LinuxKernelCryptoAPI(unittest.TestCase):
 
 def test_main():
     tests = [GeneralModuleTests, BasicTCPTest, TCPCloserTest, TCPTimeoutTest,
-             TestExceptions, BufferIOTest, BasicTCPTest2, BasicUDPTest, UDPTimeoutTest ]
+             TestExceptions, BufferIOTest, BasicTCPTest2, BasicUDPTest, UDPTimeoutTest,
+             MultiMessageUDPTest ]
 
     tests.extend([
         NonBlockingTCPTests,
@@ -10,6 +10,7 @@ import signal
 import socket
 import tempfile
 import threading
+import time
 import unittest
 import socketserver
 
@@ -154,6 +155,9 @@ class SocketServerTest(unittest.TestCase):
             # bpo-31151: Check that ForkingMixIn.server_close() waits until
             # all children completed
             self.assertFalse(server.active_children)
+        if HAVE_FORKING and isinstance(server, socketserver.PreforkMixIn):
+            # Check that shutdown() waits until all workers completed
+            self.assertFalse(server.worker_pids)
         if verbose: print("done")
 
     def stream_examine(self, proto, addr):
@@ -233,6 +237,50 @@ class SocketServerTest(unittest.TestCase):
                             socketserver.DatagramRequestHandler,
                             self.dgram_examine)
 
+    def test_ThreadPoolTCPServer(self):
+        self.run_server(socketserver.ThreadPoolTCPServer,
+                        socketserver.StreamRequestHandler,
+                        self.stream_examine)
+
+    def test_ThreadPoolUDPServer(self):
+        self.run_server(socketserver.ThreadPoolUDPServer,
+                        socketserver.DatagramRequestHandler,
+                        self.dgram_examine)
+
+    @requires_forking
+    def test_PreforkTCPServer(self):
+        with simple_subprocess(self):
+            self.run_server(socketserver.PreforkTCPServer,
+                            socketserver.StreamRequestHandler,
+                            self.stream_examine)
+
+    @requires_forking
+    def test_PreforkUDPServer(self):
+        with simple_subprocess(self):
+            self.run_server(socketserver.PreforkUDPServer,
+                            socketserver.DatagramRequestHandler,
+                            self.dgram_examine)
+
+    @requires_forking
+    @unittest.skipUnless(hasattr(socket, 'SO_REUSEPORT'),
+                         'requires SO_REUSEPORT')
+    def test_PreforkTCPServer_reuse_port(self):
+        class ReusePortTCPServer(socketserver.PreforkTCPServer):
+            reuse_port = True
+        self.run_server(ReusePortTCPServer,
+                        socketserver.StreamRequestHandler,
+                        self.stream_examine)
+
+    @requires_forking
+    @unittest.skipUnless(hasattr(socket, 'SO_REUSEPORT'),
+                         'requires SO_REUSEPORT')
+    def test_PreforkUDPServer_reuse_port(self):
+        class ReusePortUDPServer(socketserver.PreforkUDPServer):
+            reuse_port = True
+        self.run_server(ReusePortUDPServer,
+                        socketserver.DatagramRequestHandler,
+                        self.dgram_examine)
+
     @requires_unix_sockets
     def test_UnixDatagramServer(self):
         self.run_server(socketserver.UnixDatagramServer,
@@ -295,6 +343,99 @@ class SocketServerTest(unittest.TestCase):
         self.assertEqual(-1, server.socket.fileno())
 
 
+class ThreadPoolTest(unittest.TestCase):
+
+    @reap_threads
+    def test_reuse_threads(self):
+        handler_threads = set()
+
+        class MyHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                handler_threads.add(threading.get_ident())
+                self.wfile.write(self.rfile.readline())
+
+        class MyServer(socketserver.ThreadPoolTCPServer):
+            pool_size = 2
+            pool_queue_size = 1
+
+        with MyServer((HOST, 0), MyHandler) as server:
+            t = threading.Thread(target=server.serve_forever,
+                                 kwargs={'poll_interval': 0.01})
+            t.start()
+            try:
+                for i in range(10):
+                    with socket.create_connection(server.server_address) as s:
+                        s.sendall(TEST_STR)
+                        self.assertEqual(receive(s, 100), TEST_STR)
+            finally:
+                server.shutdown()
+                t.join()
+        self.assertLessEqual(len(handler_threads), 2)
+
+    @reap_threads
+    def test_server_close_handles_queued_requests(self):
+        handled = []
+        release = threading.Event()
+
+        class MyServer(socketserver.ThreadPoolMixIn, socketserver.BaseServer):
+            pool_size = 1
+
+            def finish_request(self, request, client_address):
+                release.wait()
+                handled.append(request)
+
+        server = MyServer(None, None)
+        for i in range(3):
+            server.process_request(i, None)
+        release.set()
+        server.server_close()
+        self.assertEqual(handled, [0, 1, 2])
+
+
+@requires_forking
+class PreforkTest(unittest.TestCase):
+
+    def setUp(self):
+        signal_alarm(60)  # Kill deadlocks after 60 seconds.
+
+    def tearDown(self):
+        signal_alarm(0)  # Didn't deadlock.
+        reap_children()
+
+    @reap_threads
+    def test_restart_workers(self):
+        class MyHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                self.wfile.write(b'%d\n' % os.getpid())
+
+        class MyServer(socketserver.PreforkTCPServer):
+            workers = 2
+
+        def request():
+            with socket.create_connection(server.server_address) as s:
+                return int(receive(s, 100))
+
+        with MyServer((HOST, 0), MyHandler) as server:
+            t = threading.Thread(target=server.serve_forever,
+                                 kwargs={'poll_interval': 0.01})
+            t.start()
+            try:
+                pid = request()
+                self.assertIn(pid, server.worker_pids)
+                os.kill(pid, signal.SIGKILL)
+                # Wait until the worker is restarted
+                deadline = time.monotonic() + 10
+                while pid in server.worker_pids or \
+                        len(server.worker_pids) < 2:
+                    self.assertLess(time.monotonic(), deadline)
+                    time.sleep(0.01)
+                self.assertNotEqual(request(), pid)
+            finally:
+                server.shutdown()
+                t.join()
+            self.assertFalse(server.worker_pids)
+
+
 class ErrorHandlerTest(unittest.TestCase):
     """Test that the servers pass normal exceptions from the handler to
     handle_error(), and that exiting exceptions like SystemExit and
@@ -458,6 +599,34 @@ class SocketWriterTest(unittest.TestCase):
         self.assertEqual(server.sent2, test.support.SOCK_MAX_SIZE)
         self.assertEqual(received2, test.support.SOCK_MAX_SIZE - 100)
 
+    def test_writelines(self):
+        # wfile.writelines() has to send all the buffers, even if the first
+        # sendmsg() call sends only a part of them
+        big_chunk = b'x' * test.support.SOCK_MAX_SIZE
+        lines = [b'head\n', b'', bytearray(b'body\n'), big_chunk, b'tail\n']
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                self.wfile.writelines(lines)
+
+        server = socketserver.TCPServer((HOST, 0), Handler)
+        self.addCleanup(server.server_close)
+        received = None
+
+        def run_client():
+            s = socket.socket(server.address_family, socket.SOCK_STREAM,
+                socket.IPPROTO_TCP)
+            with s, s.makefile('rb') as reader:
+                s.connect(server.server_address)
+                nonlocal received
+                received = reader.read()
+
+        background = threading.Thread(target=run_client)
+        background.start()
+        server.handle_request()
+        background.join()
+        self.assertEqual(received, b''.join(lines))
+
 
 class MiscTestCase(unittest.TestCase):
 
@@ -1335,6 +1335,43 @@ class ContextTests(unittest.TestCase):
         self.assertEqual(ctx.protocol, ssl.PROTOCOL_TLS)
         self.assertEqual(ctx.verify_mode, ssl.CERT_NONE)
         self._assert_context_options(ctx)
+        self.assertIsNone(ctx.session_cache)
+
+    def test_session_cache(self):
+        ctx = ssl.create_default_context()
+        self.assertIsInstance(ctx.session_cache, ssl.SSLSessionCache)
+        self.assertIsNone(ssl.SSLContext(ssl.PROTOCOL_TLS).session_cache)
+
+        class Session:
+            def __init__(self, timeout=300):
+                self.time = int(time.time())
+                self.timeout = timeout
+
+        cache = ssl.SSLSessionCache(maxsize=2)
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get('example.com', 443))
+        cache.put('example.com', 443, None)
+        self.assertEqual(len(cache), 0)
+
+        s1, s2, s3 = Session(), Session(), Session()
+        cache.put('example.com', 443, s1)
+        cache.put('example.org', 443, s2)
+        self.assertIs(cache.get('example.com', 443), s1)
+        self.assertIsNone(cache.get('example.com', 8443))
+        # example.org is now the least recently used entry
+        cache.put('example.net', 443, s3)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('example.org', 443))
+        self.assertIs(cache.get('example.com', 443), s1)
+        self.assertIs(cache.get('example.net', 443), s3)
+
+        # expired sessions are dropped
+        cache.put('example.com', 443, Session(timeout=0))
+        self.assertIsNone(cache.get('example.com', 443))
+        self.assertEqual(len(cache), 1)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
 
     def test__create_stdlib_context(self):
         ctx = ssl._create_stdlib_context()
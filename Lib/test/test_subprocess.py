@@ -1614,6 +1614,45 @@ class POSIXProcessTestCase(BaseTestCase):
             child_pgid = int(output)
             self.assertNotEqual(parent_pgid, child_pgid)
 
+    @mock.patch("subprocess._posixsubprocess.fork_exec")
+    def test_use_vfork_passed_to_fork_exec(self, fork_exec):
+        fork_exec.side_effect = RuntimeError
+        for use_vfork in (True, False):
+            fork_exec.reset_mock()
+            with mock.patch("subprocess._USE_VFORK", use_vfork):
+                with self.assertRaises(RuntimeError):
+                    subprocess.Popen([sys.executable, "-c", "pass"])
+            self.assertIs(fork_exec.call_args[0][-1], use_vfork)
+
+    def test_use_vfork_disabled(self):
+        with mock.patch("subprocess._USE_VFORK", False):
+            output = subprocess.check_output(
+                [sys.executable, "-c", "print('spam')"])
+        self.assertEqual(output.rstrip(), b"spam")
+
+    @unittest.skipUnless(hasattr(signal, 'pthread_sigmask'),
+                         'need signal.pthread_sigmask()')
+    def test_child_signal_state(self):
+        # The vfork() path blocks all signals and resets the handlers in
+        # the child: the parent's handlers and mask must not leak into it.
+        code = ("import signal; "
+                "print(signal.getsignal(signal.SIGUSR1) == signal.SIG_DFL, "
+                "signal.getsignal(signal.SIGUSR2) == signal.SIG_IGN, "
+                "sorted(signal.pthread_sigmask(signal.SIG_BLOCK, [])))")
+        old_usr1 = signal.signal(signal.SIGUSR1, lambda *args: None)
+        self.addCleanup(signal.signal, signal.SIGUSR1, old_usr1)
+        old_usr2 = signal.signal(signal.SIGUSR2, signal.SIG_IGN)
+        self.addCleanup(signal.signal, signal.SIGUSR2, old_usr2)
+        old_mask = signal.pthread_sigmask(signal.SIG_BLOCK, [])
+        for use_vfork in (True, False):
+            with mock.patch("subprocess._USE_VFORK", use_vfork):
+                output = subprocess.check_output([sys.executable, "-c", code],
+                                                 restore_signals=False)
+            self.assertEqual(output.rstrip(),
+                             f"True True {sorted(old_mask)}".encode())
+            self.assertEqual(signal.pthread_sigmask(signal.SIG_BLOCK, []),
+                             old_mask)
+
     def test_run_abort(self):
         # returncode handles signal termination
         with support.SuppressCrashReport():
@@ -1039,6 +1039,34 @@ class HandlerTests(unittest.TestCase):
         o.open("https://www.example.com")
         self.assertEqual(h._debuglevel, 1)
 
+    @unittest.skipUnless(hasattr(urllib.request, 'HTTPSHandler'), 'need ssl')
+    def test_https_handler_default_context(self):
+        import ssl
+        contexts = []
+        def create_context():
+            contexts.append(object())
+            return contexts[-1]
+
+        class Handler(urllib.request.HTTPSHandler):
+            def do_open(self, http_class, req, **http_conn_args):
+                return http_conn_args['context']
+
+        # The default context is created by the first request only, and
+        # then shared by the connections of the handler
+        with support.swap_attr(ssl, '_create_default_https_context',
+                               create_context):
+            h = Handler()
+            self.assertEqual(contexts, [])
+            req = Request("https://www.example.com")
+            self.assertIs(h.https_open(req), contexts[0])
+            self.assertIs(h.https_open(req), contexts[0])
+            self.assertEqual(len(contexts), 1)
+
+            context = object()
+            h = Handler(context=context)
+            self.assertIs(h.https_open(req), context)
+            self.assertEqual(len(contexts), 1)
+
     def test_http_doubleslash(self):
         # Checks the presence of any unnecessary double slash in url does not
         # break anything. Previously, a double slash directly after the host
@@ -1829,6 +1857,64 @@ class MiscTests(unittest.TestCase):
         )
 
 
+class HTTPConnectionPoolTests(unittest.TestCase):
+
+    class FakeConnection:
+        def __init__(self):
+            self.sock, self.peer = socket.socketpair()
+        def close(self):
+            if self.sock is not None:
+                self.sock.close()
+                self.sock = None
+            self.peer.close()
+
+    def make_conn(self):
+        conn = self.FakeConnection()
+        self.addCleanup(conn.close)
+        return conn
+
+    def test_get_put(self):
+        pool = urllib.request.HTTPConnectionPool()
+        self.assertIsNone(pool.get('key'))
+        conn = self.make_conn()
+        pool.put('key', conn)
+        self.assertIsNone(pool.get('other'))
+        self.assertIs(pool.get('key'), conn)
+        self.assertIsNone(pool.get('key'))
+
+    def test_maxsize(self):
+        pool = urllib.request.HTTPConnectionPool(maxsize=1)
+        first, second = self.make_conn(), self.make_conn()
+        pool.put('key', first)
+        pool.put('key', second)
+        self.assertIsNone(second.sock)
+        self.assertIs(pool.get('key'), first)
+        self.assertRaises(ValueError, urllib.request.HTTPConnectionPool, 0)
+
+    def test_idle_timeout(self):
+        pool = urllib.request.HTTPConnectionPool(idle_timeout=-1)
+        conn = self.make_conn()
+        pool.put('key', conn)
+        self.assertIsNone(pool.get('key'))
+        self.assertIsNone(conn.sock)
+
+    def test_dropped_connection(self):
+        pool = urllib.request.HTTPConnectionPool()
+        conn = self.make_conn()
+        pool.put('key', conn)
+        conn.peer.close()
+        self.assertIsNone(pool.get('key'))
+        self.assertIsNone(conn.sock)
+
+    def test_close(self):
+        pool = urllib.request.HTTPConnectionPool()
+        conn = self.make_conn()
+        pool.put('key', conn)
+        pool.close()
+        self.assertIsNone(conn.sock)
+        self.assertIsNone(pool.get('key'))
+
+
 class RequestTests(unittest.TestCase):
     class PutRequest(Request):
         method = 'PUT'
@@ -6,7 +6,9 @@ import urllib.request
 import http.server
 import threading
 import unittest
+import unittest.mock
 import hashlib
+import socketserver
 
 from test import support
 
@@ -659,6 +661,192 @@ class TestUrlopen(unittest.TestCase):
         self.assertEqual(index + 1, len(lines))
 
 
+class KeepAliveRequestHandler(http.server.BaseHTTPRequestHandler):
+    """HTTP/1.1 handler recording the client address of every request."""
+
+    protocol_version = "HTTP/1.1"
+    # set by the tests: close the connection after this many requests
+    close_after = None
+
+    def do_GET(self):
+        self.server.clients.append(self.client_address)
+        body = self.path.encode('ascii') * 100
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if (self.close_after is not None and
+                len(self.server.clients) % self.close_after == 0):
+            # Drop the connection without announcing it.
+            self.close_connection = True
+
+    def do_HEAD(self):
+        self.server.clients.append(self.client_address)
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+class KeepAliveServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, handler):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.clients = []
+
+
+class PooledHTTPHandlerTests(unittest.TestCase):
+
+    def setUp(self):
+        handler = type('Handler', (KeepAliveRequestHandler,), {})
+        self.handler = handler
+        self.server = KeepAliveServer(handler)
+        self.addCleanup(self.server.server_close)
+        thread = threading.Thread(target=self.server.serve_forever,
+                                  kwargs={'poll_interval': 0.01})
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.shutdown)
+        self.url = "http://127.0.0.1:%d" % self.server.server_port
+        self.pooled = urllib.request.PooledHTTPHandler()
+        self.opener = urllib.request.build_opener(
+            urllib.request.ProxyHandler({}), self.pooled)
+        self.addCleanup(self.pooled.close)
+
+    def fetch(self, path):
+        with self.opener.open(self.url + path) as f:
+            return f.read()
+
+    def test_replaces_default_handler(self):
+        handlers = [h for h in self.opener.handlers
+                    if isinstance(h, urllib.request.HTTPHandler)]
+        self.assertEqual(handlers, [self.pooled])
+
+    def test_connection_reused(self):
+        self.assertEqual(self.fetch('/a'), b'/a' * 100)
+        self.assertEqual(self.fetch('/b'), b'/b' * 100)
+        self.assertEqual(self.fetch('/c'), b'/c' * 100)
+        self.assertEqual(len(self.server.clients), 3)
+        self.assertEqual(len(set(self.server.clients)), 1)
+
+    def test_head_reused(self):
+        request = urllib.request.Request(self.url + '/', method='HEAD')
+        self.opener.open(request).close()
+        self.opener.open(request).close()
+        self.assertEqual(len(set(self.server.clients)), 1)
+
+    def test_partial_read_not_reused(self):
+        with self.opener.open(self.url + '/a') as f:
+            f.read(10)
+        self.assertEqual(self.fetch('/b'), b'/b' * 100)
+        self.assertEqual(len(set(self.server.clients)), 2)
+
+    def test_dropped_idle_connection(self):
+        self.handler.close_after = 1
+        self.assertEqual(self.fetch('/a'), b'/a' * 100)
+        self.assertEqual(self.fetch('/b'), b'/b' * 100)
+        self.assertEqual(len(set(self.server.clients)), 2)
+
+    def test_stale_connection_retried(self):
+        # The server drops the connection, but the pool cannot notice it
+        # before the request is sent: the request is retried once.
+        self.handler.close_after = 1
+        self.assertEqual(self.fetch('/a'), b'/a' * 100)
+        with unittest.mock.patch('urllib.request._connection_dropped',
+                                 return_value=False):
+            self.assertEqual(self.fetch('/b'), b'/b' * 100)
+        self.assertEqual(len(set(self.server.clients)), 2)
+
+    def test_stale_connection_post_not_retried(self):
+        # The server may have processed a request which was sent before
+        # the connection was dropped: it is not repeated unless its method
+        # is idempotent.
+        self.handler.close_after = 1
+        self.assertEqual(self.fetch('/a'), b'/a' * 100)
+        request = urllib.request.Request(self.url + '/b', method='POST')
+        with unittest.mock.patch('urllib.request._connection_dropped',
+                                 return_value=False):
+            with self.assertRaises(ConnectionResetError):
+                self.opener.open(request)
+        self.assertEqual(len(self.server.clients), 1)
+
+        request = urllib.request.Request(self.url + '/c', data=b'data',
+                                         method='PUT')
+        self.handler.do_PUT = self.handler.do_POST
+        with unittest.mock.patch('urllib.request._connection_dropped',
+                                 return_value=False):
+            with self.opener.open(request) as f:
+                self.assertEqual(f.read(), b'/c' * 100)
+
+    def test_close_empties_pool(self):
+        self.fetch('/a')
+        self.pooled.close()
+        self.fetch('/b')
+        self.assertEqual(len(set(self.server.clients)), 2)
+
+    def test_concurrent_requests(self):
+        errors = []
+        def worker(n):
+            try:
+                for i in range(5):
+                    path = '/%d-%d' % (n, i)
+                    self.assertEqual(self.fetch(path),
+                                     path.encode('ascii') * 100)
+            except Exception as exc:
+                errors.append(exc)
+        threads = [threading.Thread(target=worker, args=(n,))
+                   for n in range(4)]
+        with support.start_threads(threads):
+            pass
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.server.clients), 20)
+        self.assertLessEqual(len(set(self.server.clients)), 4)
+
+
+class HTTPConnectionPoolTests(unittest.TestCase):
+
+    class Connection:
+        sock = True
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    def test_idle_timeout(self):
+        pool = urllib.request.HTTPConnectionPool(idle_timeout=10)
+        conns = [self.Connection() for i in range(4)]
+        with unittest.mock.patch('time.monotonic', return_value=100):
+            pool.put('a', conns[0])
+            pool.put('a', conns[1])
+        with unittest.mock.patch('time.monotonic', return_value=105):
+            pool.put('a', conns[2])
+        # Expired connections are closed for all keys, not only the one
+        # which is used.
+        with unittest.mock.patch('time.monotonic', return_value=112):
+            pool.put('b', conns[3])
+        self.assertEqual([conn.closed for conn in conns],
+                         [True, True, False, False])
+        with unittest.mock.patch('time.monotonic', return_value=130):
+            self.assertIsNone(pool.get('c'))
+        self.assertTrue(all(conn.closed for conn in conns))
+
+    def test_maxsize(self):
+        pool = urllib.request.HTTPConnectionPool(maxsize=1)
+        conns = [self.Connection() for i in range(2)]
+        pool.put('a', conns[0])
+        pool.put('a', conns[1])
+        self.assertEqual([conn.closed for conn in conns], [False, True])
+        pool.close()
+        self.assertTrue(conns[0].closed)
+
+
 threads_key = None
 
 def setUpModule():
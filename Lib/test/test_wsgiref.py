@@ -17,6 +17,7 @@ from platform import python_implementation
 import os
 import re
 import signal
+import socket
 import sys
 import threading
 import unittest
@@ -299,6 +300,45 @@ class IntegrationTests(TestCase):
         background.join()
         self.assertEqual(received, support.SOCK_MAX_SIZE - 100)
 
+    def test_file_wrapper_sendfile(self):
+        # A regular file returned through wsgi.file_wrapper is sent with
+        # socket.sendfile(), starting from the current file position
+        data = b'0123456789' * 10000
+        with open(support.TESTFN, 'wb') as f:
+            f.write(data)
+        self.addCleanup(support.unlink, support.TESTFN)
+
+        def app(environ, start_response):
+            start_response("200 OK", [('Content-Type', 'text/plain')])
+            f = open(support.TESTFN, 'rb')
+            f.seek(10)
+            return environ['wsgi.file_wrapper'](f)
+
+        class WsgiHandler(NoLogRequestHandler, WSGIRequestHandler):
+            pass
+
+        server = make_server(support.HOST, 0, app, handler_class=WsgiHandler)
+        self.addCleanup(server.server_close)
+        response = None
+
+        def run_client():
+            nonlocal response
+            http = HTTPConnection(*server.server_address)
+            http.request("GET", "/")
+            with http.getresponse() as r:
+                response = r.getheader('Content-Length'), r.read()
+            http.close()
+
+        background = threading.Thread(target=run_client)
+        background.start()
+        with mock.patch('socket.socket.sendfile',
+                        autospec=True,
+                        side_effect=socket.socket.sendfile) as sendfile:
+            server.handle_request()
+        background.join()
+        self.assertEqual(sendfile.call_count, 1)
+        self.assertEqual(response, (str(len(data) - 10), data[10:]))
+
 
 class UtilityTests(TestCase):
 
@@ -780,6 +820,78 @@ class HandlerTests(TestCase):
             b"Hello, world!",
             written)
 
+    def testCoalescedWrites(self):
+        # The headers and the blocks of a list are written with a single
+        # writelines() call
+        class Writer(BytesIO):
+            def write(self, b):
+                calls.append('write')
+                return super().write(b)
+
+            def writelines(self, lines):
+                calls.append('writelines')
+                super().writelines(lines)
+
+        def app(e, s):
+            s('200 OK', [('Content-Type', 'text/plain')])
+            return [b'Hello, ', b'world!']
+
+        calls = []
+        environ = {"SERVER_PROTOCOL": "HTTP/1.0"}
+        h = SimpleHandler(BytesIO(), Writer(), sys.stderr, environ)
+        h.origin_server = False
+        h.run(app)
+        self.assertEqual(calls, ['writelines'])
+        self.assertEqual(b"Status: 200 OK\r\n"
+            b"Content-Type: text/plain\r\n"
+            b"\r\n"
+            b"Hello, world!",
+            h.stdout.getvalue())
+
+    def testSendfile(self):
+        sent = []
+
+        class SendfileWriter(BytesIO):
+            def sendfile(self, file, offset=0, count=None):
+                sent.append((offset, count))
+                file.seek(offset)
+                return self.write(file.read(count))
+
+        def app(e, s):
+            s('200 OK', [])
+            f = open(support.TESTFN, 'rb')
+            f.seek(2)
+            return e['wsgi.file_wrapper'](f)
+
+        with open(support.TESTFN, 'wb') as f:
+            f.write(b'xxdata')
+        self.addCleanup(support.unlink, support.TESTFN)
+
+        environ = {"SERVER_PROTOCOL": "HTTP/1.0"}
+        h = SimpleHandler(BytesIO(), SendfileWriter(), sys.stderr, environ)
+        h.origin_server = False
+        h.run(app)
+        self.assertEqual(sent, [(2, 4)])
+        self.assertEqual(b"Status: 200 OK\r\n"
+            b"Content-Length: 4\r\n"
+            b"\r\n"
+            b"data",
+            h.stdout.getvalue())
+
+        # Files which are not regular files are iterated over
+        def app(e, s):
+            s('200 OK', [])
+            return e['wsgi.file_wrapper'](BytesIO(b'data'))
+
+        h = SimpleHandler(BytesIO(), SendfileWriter(), sys.stderr, environ)
+        h.origin_server = False
+        h.run(app)
+        self.assertEqual(sent, [(2, 4)])
+        self.assertEqual(b"Status: 200 OK\r\n"
+            b"\r\n"
+            b"data",
+            h.stdout.getvalue())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -90,9 +90,11 @@ import io
 import os
 import posixpath
 import re
+import select
 import socket
 import string
 import sys
+import threading
 import time
 import tempfile
 import contextlib
@@ -123,6 +125,7 @@ __all__ = [
     'HTTPPasswordMgrWithPriorAuth', 'AbstractBasicAuthHandler',
     'HTTPBasicAuthHandler', 'ProxyBasicAuthHandler', 'AbstractDigestAuthHandler',
     'HTTPDigestAuthHandler', 'ProxyDigestAuthHandler', 'HTTPHandler',
+    'HTTPConnectionPool', 'AbstractPooledHTTPHandler', 'PooledHTTPHandler',
     'FileHandler', 'FTPHandler', 'CacheFTPHandler', 'DataHandler',
     'UnknownHandler', 'HTTPErrorProcessor',
     # Functions
@@ -1355,6 +1358,11 @@ if hasattr(http.client, 'HTTPSConnection'):
             self._check_hostname = check_hostname
 
         def https_open(self, req):
+            if self._context is None:
+                # Share the context, and so its session cache, between the
+                # connections of the handler.  Create it on first use:
+                # loading the CA certificates is expensive.
+                self._context = ssl._create_default_https_context()
             return self.do_open(http.client.HTTPSConnection, req,
                 context=self._context, check_hostname=self._check_hostname)
 
@@ -1362,6 +1370,266 @@ if hasattr(http.client, 'HTTPSConnection'):
 
     __all__.append('HTTPSHandler')
 
+
+def _connection_dropped(sock):
+    """Return True if an idle socket is readable, i.e. the peer closed it.
+
+    A persistent connection that is waiting for its next request should
+    never have pending data, so readability means EOF (or garbage) and
+    the connection must not be reused.
+    """
+    if hasattr(select, 'poll'):
+        poller = select.poll()
+        poller.register(sock, select.POLLIN)
+        return bool(poller.poll(0))
+    readable, _, _ = select.select([sock], [], [], 0)
+    return bool(readable)
+
+
+class _PooledHTTPResponse(http.client.HTTPResponse):
+    """HTTPResponse that hands its connection back once fully consumed."""
+
+    _pool_release = None
+    _body_complete = False
+
+    def _read_and_discard_trailer(self):
+        # Only reached once the last chunk of a chunked body has been read.
+        self._body_complete = True
+        super()._read_and_discard_trailer()
+
+    def _close_conn(self):
+        super()._close_conn()
+        release = self._pool_release
+        if release is not None:
+            self._pool_release = None
+            # The connection can only carry another request if the body was
+            # read up to its end; closing the response early leaves unread
+            # data on the socket.
+            release(self._body_complete or
+                    (not self.chunked and self.length == 0))
+
+
+class HTTPConnectionPool:
+    """Thread-safe pool of idle persistent HTTP connections.
+
+    Idle connections are kept per key (connection class, host, port and
+    tunnel), at most *maxsize* of them per key.  Connections which have
+    been idle for more than *idle_timeout* seconds are closed the next time
+    the pool is used.
+    """
+
+    def __init__(self, maxsize=10, idle_timeout=60.0):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _remove_expired(self):
+        # Called with the lock held, return the connections to close.  The
+        # connections of every key are checked, not only the requested
+        # one, so that hosts which are not requested anymore do not keep
+        # their sockets open.
+        expired = []
+        deadline = time.monotonic() - self.idle_timeout
+        for key, idle in list(self._idle.items()):
+            # The connections are ordered from the least recently used.
+            count = 0
+            while count < len(idle) and idle[count][1] < deadline:
+                count += 1
+            if count:
+                expired.extend(conn for conn, since in idle[:count])
+                del idle[:count]
+            if not idle:
+                del self._idle[key]
+        return expired
+
+    def get(self, key):
+        """Return an idle connection for key, or None."""
+        conn = None
+        with self._lock:
+            expired = self._remove_expired()
+            idle = self._idle.get(key)
+            while idle:
+                candidate, since = idle.pop()
+                if candidate.sock is None:
+                    expired.append(candidate)
+                    continue
+                conn = candidate
+                break
+            if idle is not None and not idle:
+                del self._idle[key]
+        for candidate in expired:
+            candidate.close()
+        if conn is not None and _connection_dropped(conn.sock):
+            conn.close()
+            return self.get(key)
+        return conn
+
+    def put(self, key, conn):
+        """Return conn to the pool; it is closed if the pool is full."""
+        if conn.sock is None:
+            return
+        with self._lock:
+            expired = self._remove_expired()
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.maxsize:
+                idle.append((conn, time.monotonic()))
+            else:
+                expired.append(conn)
+        for candidate in expired:
+            candidate.close()
+
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn, since in conns:
+                conn.close()
+
+
+class AbstractPooledHTTPHandler:
+    """Mix-in class reusing persistent connections across requests.
+
+    Instead of closing the connection after every request, connections
+    are returned to an HTTPConnectionPool once their response has been
+    read to the end, and later requests to the same host, port and proxy
+    reuse them, saving the TCP (and TLS) handshake.
+    """
+
+    # exceptions meaning a reused connection was closed by the server
+    # while it was sitting in the pool
+    _stale_errors = (http.client.RemoteDisconnected, ConnectionResetError,
+                     BrokenPipeError, ConnectionAbortedError)
+
+    # methods which may be sent again once the server may have received
+    # them (RFC 7230, section 6.3.1)
+    _idempotent_methods = frozenset(
+        ['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE'])
+
+    def __init__(self, pool=None):
+        if pool is None:
+            pool = HTTPConnectionPool()
+        self.pool = pool
+
+    def close(self):
+        self.pool.close()
+
+    def do_open(self, http_class, req, **http_conn_args):
+        """Return an HTTPResponse object for the request, using http_class.
+
+        http_class must implement the HTTPConnection API from http.client.
+        """
+        host = req.host
+        if not host:
+            raise URLError('no host given')
+
+        key = (http_class, host, req._tunnel_host,
+               tuple(sorted((k, id(v)) for k, v in http_conn_args.items())))
+
+        headers = dict(req.unredirected_hdrs)
+        headers.update((k, v) for k, v in req.headers.items() if k not in headers)
+        headers = {name.title(): val for name, val in headers.items()}
+
+        tunnel_headers = {}
+        if req._tunnel_host:
+            proxy_auth_hdr = "Proxy-Authorization"
+            if proxy_auth_hdr in headers:
+                tunnel_headers[proxy_auth_hdr] = headers[proxy_auth_hdr]
+                # Proxy-Authorization should not be sent to origin
+                # server.
+                del headers[proxy_auth_hdr]
+
+        # A request body that is not a bytes-like object may be an iterable
+        # or a file, which cannot be sent a second time.
+        replayable = req.data is None or isinstance(
+            req.data, (bytes, bytearray, memoryview))
+        idempotent = req.get_method() in self._idempotent_methods
+
+        h = self.pool.get(key)
+        while True:
+            reused = h is not None
+            if reused:
+                h.timeout = req.timeout
+                if req.timeout is socket._GLOBAL_DEFAULT_TIMEOUT:
+                    h.sock.settimeout(socket.getdefaulttimeout())
+                else:
+                    h.sock.settimeout(req.timeout)
+            else:
+                h = http_class(host, timeout=req.timeout, **http_conn_args)
+                if req._tunnel_host:
+                    h.set_tunnel(req._tunnel_host, headers=tunnel_headers)
+            h.set_debuglevel(self._debuglevel)
+            h.response_class = _PooledHTTPResponse
+
+            sent = False
+            try:
+                try:
+                    h.request(req.get_method(), req.selector, req.data, headers,
+                              encode_chunked=req.has_header('Transfer-encoding'))
+                except OSError as err:
+                    if reused and replayable and isinstance(
+                            err, self._stale_errors):
+                        raise
+                    raise URLError(err) # timeout error
+                sent = True
+                r = h.getresponse()
+            except self._stale_errors:
+                h.close()
+                if reused and replayable and (idempotent or not sent):
+                    # The server dropped the idle connection; retry once
+                    # on a fresh one.  Once the request has been sent, the
+                    # server may have processed it: only idempotent
+                    # requests can be repeated.
+                    h = None
+                    continue
+                raise
+            except:
+                h.close()
+                raise
+            break
+
+        if h.sock is not None:
+            pool = self.pool
+            def release(reusable):
+                if reusable:
+                    pool.put(key, h)
+                else:
+                    h.close()
+            r._pool_release = release
+            # A response without a body is complete right away.
+            if r.length == 0 and not r.chunked:
+                r._close_conn()
+
+        r.url = req.get_full_url()
+        # This line replaces the .msg attribute of the HTTPResponse
+        # with .headers, because urllib clients expect the response to
+        # have the reason in .msg.  It would be good to mark this
+        # attribute is deprecated and get then to use info() or
+        # .headers.
+        r.msg = r.reason
+        return r
+
+
+class PooledHTTPHandler(AbstractPooledHTTPHandler, HTTPHandler):
+
+    def __init__(self, debuglevel=0, pool=None):
+        HTTPHandler.__init__(self, debuglevel)
+        AbstractPooledHTTPHandler.__init__(self, pool)
+
+if hasattr(http.client, 'HTTPSConnection'):
+
+    class PooledHTTPSHandler(AbstractPooledHTTPHandler, HTTPSHandler):
+
+        def __init__(self, debuglevel=0, context=None, check_hostname=None,
+                     pool=None):
+            HTTPSHandler.__init__(self, debuglevel, context, check_hostname)
+            AbstractPooledHTTPHandler.__init__(self, pool)
+
+    __all__.append('PooledHTTPSHandler')
+
 class HTTPCookieProcessor(BaseHandler):
     def __init__(self, cookiejar=None):
         import http.cookiejar
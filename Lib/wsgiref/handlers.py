@@ -3,7 +3,8 @@
 from .util import FileWrapper, guess_scheme, is_hop_by_hop
 from .headers import Headers
 
-import sys, os, time
+from io import BufferedIOBase
+import sys, os, stat, time
 
 __all__ = [
     'BaseHandler', 'SimpleHandler', 'BaseCGIHandler', 'CGIHandler',
@@ -124,6 +125,7 @@ class BaseHandler:
     headers_sent = False
     headers = None
     bytes_sent = 0
+    _defer_flush = False
 
     def run(self, application):
         """Invoke the application"""
@@ -176,8 +178,14 @@ class BaseHandler:
         """
         try:
             if not self.result_is_file() or not self.sendfile():
-                for data in self.result:
-                    self.write(data)
+                # All the blocks of a list are already available: write
+                # them together instead of flushing the output for each.
+                self._defer_flush = type(self.result) in (list, tuple)
+                try:
+                    for data in self.result:
+                        self.write(data)
+                finally:
+                    self._defer_flush = False
                 self.finish_content()
         finally:
             self.close()
@@ -277,7 +285,8 @@ class BaseHandler:
 
         # XXX check Content-Length and truncate if too many bytes written?
         self._write(data)
-        self._flush()
+        if not self._defer_flush:
+            self._flush()
 
 
     def sendfile(self):
@@ -310,6 +319,7 @@ class BaseHandler:
             self.send_headers()
         else:
             pass # XXX check if content-length was too short?
+        self._flush()
 
     def close(self):
         """Close the iterable (if needed) and reset all instance vars
@@ -449,7 +459,32 @@ class SimpleHandler(BaseHandler):
     def add_cgi_vars(self):
         self.environ.update(self.base_env)
 
+    _pending = None
+
     def _write(self,data):
+        # Hold the data until _flush(), so that the status line, the headers
+        # and the first blocks of the body leave in as few system calls as
+        # possible.
+        if self._pending is None:
+            self._pending = [data]
+        else:
+            self._pending.append(data)
+
+    def _flush(self):
+        pending = self._pending
+        if pending:
+            self._pending = None
+            if len(pending) > 1 and isinstance(self.stdout, BufferedIOBase):
+                # Buffered streams don't do partial writes, and the writer
+                # of a socketserver.StreamRequestHandler sends all the
+                # buffers with a single sendmsg() call.
+                self.stdout.writelines(pending)
+            else:
+                for data in pending:
+                    self._write_all(data)
+        self.stdout.flush()
+
+    def _write_all(self,data):
         result = self.stdout.write(data)
         if result is None or result == len(data):
             return
@@ -462,9 +497,38 @@ class SimpleHandler(BaseHandler):
                 break
             result = self.stdout.write(data)
 
-    def _flush(self):
-        self.stdout.flush()
-        self._flush = self.stdout.flush
+    def sendfile(self):
+        """Transmit a regular file with the sendfile() method of stdout
+
+        This is done if 'self.stdout' has a sendfile() method with the
+        signature of socket.socket.sendfile(), like the output stream of a
+        socketserver.StreamRequestHandler, and if the wrapped file is a
+        regular file opened in binary mode.  If the application did not set
+        it, Content-Length is set to the remaining size of the file.
+        """
+        sendfile = getattr(self.stdout, 'sendfile', None)
+        filelike = self.result.filelike
+        if sendfile is None or 'b' not in getattr(filelike, 'mode', 'b'):
+            return False
+        try:
+            st = os.fstat(filelike.fileno())
+        except (AttributeError, OSError):
+            return False
+        if not stat.S_ISREG(st.st_mode):
+            return False
+        offset = filelike.tell()
+        count = max(st.st_size - offset, 0)
+        if not self.headers_sent:
+            self.headers.setdefault('Content-Length', str(count))
+            self.send_headers()
+        self._flush()
+        if count:
+            self.bytes_sent += sendfile(filelike, offset, count)
+        return True
+
+    def close(self):
+        self._pending = None
+        BaseHandler.close(self)
 
 
 class BaseCGIHandler(SimpleHandler):
@@ -79,6 +79,7 @@ typedef struct {
     PyObject *task_coro;
     int task_must_cancel;
     int task_log_destroy_pending;
+    int task_num_cancels_requested;
 } TaskObj;
 
 typedef struct {
@@ -1579,6 +1580,7 @@ _asyncio_Task___init___impl(TaskObj *self, PyObject *coro, PyObject *loop)
     self->task_fut_waiter = NULL;
     self->task_must_cancel = 0;
     self->task_log_destroy_pending = 1;
+    self->task_num_cancels_requested = 0;
     Py_INCREF(coro);
     self->task_coro = coro;
 
@@ -1790,6 +1792,8 @@ _asyncio_Task_cancel_impl(TaskObj *self)
         Py_RETURN_FALSE;
     }
 
+    self->task_num_cancels_requested += 1;
+
     if (self->task_fut_waiter) {
         PyObject *res;
         int is_true;
@@ -1815,6 +1819,43 @@ _asyncio_Task_cancel_impl(TaskObj *self)
     Py_RETURN_TRUE;
 }
 
+/*[clinic input]
+_asyncio.Task.cancelling
+
+Return the count of the task's cancellation requests.
+
+This count is incremented when .cancel() is called
+and may be decremented using .uncancel().
+[clinic start generated code]*/
+
+static PyObject *
+_asyncio_Task_cancelling_impl(TaskObj *self)
+/*[clinic end generated code: output=803b3af96f917d7e input=b625224d310cbb17]*/
+{
+    return PyLong_FromLong(self->task_num_cancels_requested);
+}
+
+/*[clinic input]
+_asyncio.Task.uncancel
+
+Decrement the task's count of cancellation requests.
+
+This should be called by the party that called `cancel()` on the task
+beforehand.
+
+Returns the remaining number of cancellation requests.
+[clinic start generated code]*/
+
+static PyObject *
+_asyncio_Task_uncancel_impl(TaskObj *self)
+/*[clinic end generated code: output=58184d236a817d3c input=9614fa59b2416f3e]*/
+{
+    if (self->task_num_cancels_requested > 0) {
+        self->task_num_cancels_requested -= 1;
+    }
+    return PyLong_FromLong(self->task_num_cancels_requested);
+}
+
 /*[clinic input]
 _asyncio.Task.get_stack
 
@@ -1982,6 +2023,8 @@ static PyMethodDef TaskType_methods[] = {
     _ASYNCIO_TASK_CURRENT_TASK_METHODDEF
     _ASYNCIO_TASK_ALL_TASKS_METHODDEF
     _ASYNCIO_TASK_CANCEL_METHODDEF
+    _ASYNCIO_TASK_CANCELLING_METHODDEF
+    _ASYNCIO_TASK_UNCANCEL_METHODDEF
     _ASYNCIO_TASK_GET_STACK_METHODDEF
     _ASYNCIO_TASK_PRINT_STACK_METHODDEF
     _ASYNCIO_TASK__WAKEUP_METHODDEF
@@ -0,0 +1,914 @@
+/*
+ * Support for Linux io_uring
+ *
+ * Only what asyncio's IoUringProactor needs is exposed: a Ring object
+ * on which socket and file operations are queued, each one identified
+ * by an integer key chosen by the caller, and a wait() method which
+ * submits the queued operations and returns the completed ones.
+ *
+ * The system calls are used directly, liburing is not required.
+ */
+
+#include "Python.h"
+
+#include <endian.h>
+#include <errno.h>
+#include <poll.h>
+#include <string.h>
+#include <sys/mman.h>
+#include <sys/socket.h>
+#include <sys/syscall.h>
+#include <unistd.h>
+#include <linux/io_uring.h>
+#include <linux/swab.h>
+
+/* IORING_OP_SEND, IORING_OP_RECV, IORING_OP_READ and IORING_OP_WRITE
+   appeared in Linux 5.6, fast poll for sockets in Linux 5.7. */
+#ifndef IORING_FEAT_FAST_POLL
+#  error "_uring requires the io_uring headers of Linux 5.7 or newer"
+#endif
+
+#define LOAD_ACQUIRE(p) __atomic_load_n((p), __ATOMIC_ACQUIRE)
+#define STORE_RELEASE(p, v) __atomic_store_n((p), (v), __ATOMIC_RELEASE)
+
+/* What to do with the buffer of an operation once it completes */
+enum {TYPE_NONE, TYPE_READ, TYPE_READINTO, TYPE_WRITE};
+
+typedef struct {
+    PyObject_HEAD
+    int fd;
+    unsigned int features;
+    /* Submission queue */
+    void *sq_ring;
+    size_t sq_ring_size;
+    unsigned int *sq_head;
+    unsigned int *sq_tail;
+    unsigned int sq_mask;
+    unsigned int sq_entries;
+    unsigned int *sq_array;
+    struct io_uring_sqe *sqes;
+    size_t sqes_size;
+    unsigned int sq_local_tail;
+    unsigned int to_submit;
+    /* Completion queue */
+    void *cq_ring;
+    size_t cq_ring_size;
+    unsigned int *cq_head;
+    unsigned int *cq_tail;
+    unsigned int cq_mask;
+    struct io_uring_cqe *cqes;
+    /* key -> (type, buffer) for every operation handed to the kernel
+       which has not completed yet: the buffers must stay alive until
+       the kernel is done with them. */
+    PyObject *pending;
+} RingObject;
+
+static PyTypeObject RingType;
+
+static int
+io_uring_setup(unsigned int entries, struct io_uring_params *p)
+{
+    return (int)syscall(__NR_io_uring_setup, entries, p);
+}
+
+static int
+io_uring_enter(int fd, unsigned int to_submit, unsigned int min_complete,
+               unsigned int flags)
+{
+    return (int)syscall(__NR_io_uring_enter, fd, to_submit, min_complete,
+                        flags, NULL, 0);
+}
+
+static void
+Ring_unmap(RingObject *self)
+{
+    if (self->sqes != NULL) {
+        munmap(self->sqes, self->sqes_size);
+        self->sqes = NULL;
+    }
+    if (self->cq_ring != NULL && self->cq_ring != self->sq_ring)
+        munmap(self->cq_ring, self->cq_ring_size);
+    self->cq_ring = NULL;
+    if (self->sq_ring != NULL) {
+        munmap(self->sq_ring, self->sq_ring_size);
+        self->sq_ring = NULL;
+    }
+}
+
+static int
+Ring_map(RingObject *self, struct io_uring_params *p)
+{
+    char *sq, *cq;
+
+    self->sq_ring_size = p->sq_off.array + p->sq_entries * sizeof(unsigned);
+    self->cq_ring_size = (p->cq_off.cqes +
+                          p->cq_entries * sizeof(struct io_uring_cqe));
+    if (p->features & IORING_FEAT_SINGLE_MMAP) {
+        if (self->cq_ring_size > self->sq_ring_size)
+            self->sq_ring_size = self->cq_ring_size;
+        self->cq_ring_size = self->sq_ring_size;
+    }
+
+    sq = mmap(NULL, self->sq_ring_size, PROT_READ | PROT_WRITE,
+              MAP_SHARED | MAP_POPULATE, self->fd, IORING_OFF_SQ_RING);
+    if (sq == MAP_FAILED)
+        return -1;
+    self->sq_ring = sq;
+
+    if (p->features & IORING_FEAT_SINGLE_MMAP) {
+        cq = sq;
+    }
+    else {
+        cq = mmap(NULL, self->cq_ring_size, PROT_READ | PROT_WRITE,
+                  MAP_SHARED | MAP_POPULATE, self->fd, IORING_OFF_CQ_RING);
+        if (cq == MAP_FAILED)
+            return -1;
+    }
+    self->cq_ring = cq;
+
+    self->sqes_size = p->sq_entries * sizeof(struct io_uring_sqe);
+    self->sqes = mmap(NULL, self->sqes_size, PROT_READ | PROT_WRITE,
+                      MAP_SHARED | MAP_POPULATE, self->fd, IORING_OFF_SQES);
+    if (self->sqes == MAP_FAILED) {
+        self->sqes = NULL;
+        return -1;
+    }
+
+    self->sq_head = (unsigned int *)(sq + p->sq_off.head);
+    self->sq_tail = (unsigned int *)(sq + p->sq_off.tail);
+    self->sq_mask = *(unsigned int *)(sq + p->sq_off.ring_mask);
+    self->sq_entries = *(unsigned int *)(sq + p->sq_off.ring_entries);
+    self->sq_array = (unsigned int *)(sq + p->sq_off.array);
+    self->sq_local_tail = *self->sq_tail;
+
+    self->cq_head = (unsigned int *)(cq + p->cq_off.head);
+    self->cq_tail = (unsigned int *)(cq + p->cq_off.tail);
+    self->cq_mask = *(unsigned int *)(cq + p->cq_off.ring_mask);
+    self->cqes = (struct io_uring_cqe *)(cq + p->cq_off.cqes);
+    return 0;
+}
+
+static PyObject *
+Ring_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"entries", NULL};
+    unsigned int entries = 256;
+    struct io_uring_params params;
+    RingObject *self;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|I:Ring", kwlist,
+                                     &entries))
+        return NULL;
+
+    self = (RingObject *) type->tp_alloc(type, 0);
+    if (self == NULL)
+        return NULL;
+    self->fd = -1;
+
+    self->pending = PyDict_New();
+    if (self->pending == NULL) {
+        Py_DECREF(self);
+        return NULL;
+    }
+
+    memset(&params, 0, sizeof(params));
+    self->fd = io_uring_setup(entries, &params);
+    if (self->fd < 0) {
+        self->fd = -1;
+        PyErr_SetFromErrno(PyExc_OSError);
+        Py_DECREF(self);
+        return NULL;
+    }
+    if (_Py_set_inheritable(self->fd, 0, NULL) < 0) {
+        Py_DECREF(self);
+        return NULL;
+    }
+    self->features = params.features;
+    if (Ring_map(self, &params) < 0) {
+        PyErr_SetFromErrno(PyExc_OSError);
+        Py_DECREF(self);
+        return NULL;
+    }
+    return (PyObject *)self;
+}
+
+/* Release the ring.  The buffers of operations which are still pending
+   are leaked: after the ring fd is closed, the kernel may still write
+   into them while the operations are torn down. */
+static Py_ssize_t
+Ring_close_internal(RingObject *self)
+{
+    Py_ssize_t npending = 0;
+
+    if (self->fd >= 0 && self->pending != NULL) {
+        npending = PyDict_GET_SIZE(self->pending);
+        if (npending)
+            Py_INCREF(self->pending);
+    }
+    Ring_unmap(self);
+    if (self->fd >= 0) {
+        close(self->fd);
+        self->fd = -1;
+    }
+    return npending;
+}
+
+static void
+Ring_dealloc(RingObject *self)
+{
+    Ring_close_internal(self);
+    Py_CLEAR(self->pending);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+static int
+Ring_check_open(RingObject *self)
+{
+    if (self->fd < 0) {
+        PyErr_SetString(PyExc_ValueError, "I/O operation on closed ring");
+        return -1;
+    }
+    return 0;
+}
+
+/* Hand the queued submission entries to the kernel */
+static int
+Ring_submit_internal(RingObject *self)
+{
+    int ret;
+
+    while (self->to_submit > 0) {
+        ret = io_uring_enter(self->fd, self->to_submit, 0, 0);
+        if (ret < 0) {
+            if (errno == EINTR)
+                continue;
+            /* The completion queue is overflowing or the kernel is short
+               of memory: try again once completions have been reaped. */
+            if (errno == EAGAIN || errno == EBUSY)
+                return 0;
+            PyErr_SetFromErrno(PyExc_OSError);
+            return -1;
+        }
+        if (ret == 0)
+            break;
+        self->to_submit -= ret;
+    }
+    return 0;
+}
+
+static struct io_uring_sqe *
+Ring_get_sqe(RingObject *self)
+{
+    struct io_uring_sqe *sqe;
+    unsigned int index;
+
+    if (Ring_check_open(self) < 0)
+        return NULL;
+    if (self->sq_local_tail - LOAD_ACQUIRE(self->sq_head) >=
+            self->sq_entries) {
+        if (Ring_submit_internal(self) < 0)
+            return NULL;
+        if (self->sq_local_tail - LOAD_ACQUIRE(self->sq_head) >=
+                self->sq_entries) {
+            PyErr_SetString(PyExc_BlockingIOError,
+                            "io_uring submission queue is full");
+            return NULL;
+        }
+    }
+    index = self->sq_local_tail & self->sq_mask;
+    sqe = &self->sqes[index];
+    memset(sqe, 0, sizeof(*sqe));
+    self->sq_array[index] = index;
+    return sqe;
+}
+
+/* Queue the entry returned by the last Ring_get_sqe() call.  buffer is
+   kept alive until the operation completes. */
+static PyObject *
+Ring_queue_sqe(RingObject *self, struct io_uring_sqe *sqe,
+               unsigned long long key, int type, PyObject *buffer)
+{
+    PyObject *keyobj, *entry;
+    int contained;
+
+    keyobj = PyLong_FromUnsignedLongLong(key);
+    if (keyobj == NULL)
+        return NULL;
+    contained = PyDict_Contains(self->pending, keyobj);
+    if (contained) {
+        if (contained > 0)
+            PyErr_Format(PyExc_ValueError,
+                         "an operation with key %llu is already pending",
+                         key);
+        Py_DECREF(keyobj);
+        return NULL;
+    }
+    entry = Py_BuildValue("(iO)", type, buffer);
+    if (entry == NULL || PyDict_SetItem(self->pending, keyobj, entry) < 0) {
+        Py_XDECREF(entry);
+        Py_DECREF(keyobj);
+        return NULL;
+    }
+    Py_DECREF(entry);
+    Py_DECREF(keyobj);
+
+    sqe->user_data = key;
+    self->sq_local_tail++;
+    STORE_RELEASE(self->sq_tail, self->sq_local_tail);
+    self->to_submit++;
+    Py_RETURN_NONE;
+}
+
+static int
+Ring_check_length(Py_ssize_t len)
+{
+    if (len < 0) {
+        PyErr_SetString(PyExc_ValueError, "negative buffer size");
+        return -1;
+    }
+    if ((size_t)len > UINT_MAX) {
+        PyErr_SetString(PyExc_OverflowError, "buffer size too large");
+        return -1;
+    }
+    return 0;
+}
+
+/* Queue a read-like operation into a freshly allocated bytes object */
+static PyObject *
+Ring_queue_read(RingObject *self, int opcode, unsigned long long key, int fd,
+                Py_ssize_t nbytes, unsigned long long offset, int flags)
+{
+    struct io_uring_sqe *sqe;
+    PyObject *buf, *res;
+
+    if (Ring_check_length(nbytes) < 0)
+        return NULL;
+    sqe = Ring_get_sqe(self);
+    if (sqe == NULL)
+        return NULL;
+    buf = PyBytes_FromStringAndSize(NULL, nbytes);
+    if (buf == NULL)
+        return NULL;
+    sqe->opcode = opcode;
+    sqe->fd = fd;
+    sqe->addr = (unsigned long long)(uintptr_t)PyBytes_AS_STRING(buf);
+    sqe->len = (unsigned int)nbytes;
+    sqe->off = offset;
+    sqe->msg_flags = flags;
+    res = Ring_queue_sqe(self, sqe, key, TYPE_READ, buf);
+    Py_DECREF(buf);
+    return res;
+}
+
+/* Queue an operation on a buffer supplied by the caller.  A memoryview
+   keeps the buffer exported, so it cannot be resized meanwhile. */
+static PyObject *
+Ring_queue_buffer(RingObject *self, int opcode, unsigned long long key,
+                  int fd, PyObject *bufobj, int writable,
+                  unsigned long long offset, int flags)
+{
+    struct io_uring_sqe *sqe;
+    Py_buffer *view;
+    PyObject *mv, *res;
+
+    mv = PyMemoryView_GetContiguous(bufobj,
+                                    writable ? PyBUF_WRITE : PyBUF_READ, 'C');
+    if (mv == NULL)
+        return NULL;
+    view = PyMemoryView_GET_BUFFER(mv);
+    if (Ring_check_length(view->len) < 0) {
+        Py_DECREF(mv);
+        return NULL;
+    }
+    sqe = Ring_get_sqe(self);
+    if (sqe == NULL) {
+        Py_DECREF(mv);
+        return NULL;
+    }
+    sqe->opcode = opcode;
+    sqe->fd = fd;
+    sqe->addr = (unsigned long long)(uintptr_t)view->buf;
+    sqe->len = (unsigned int)view->len;
+    sqe->off = offset;
+    sqe->msg_flags = flags;
+    res = Ring_queue_sqe(self, sqe, key,
+                         writable ? TYPE_READINTO : TYPE_WRITE, mv);
+    Py_DECREF(mv);
+    return res;
+}
+
+PyDoc_STRVAR(
+    Ring_recv_doc,
+    "recv(key, fd, nbytes, flags=0) -> None\n\n"
+    "Queue the reception of up to nbytes bytes from the socket fd.\n"
+    "The data is returned by wait() as a bytes object.");
+
+static PyObject *
+Ring_recv(RingObject *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"key", "fd", "nbytes", "flags", NULL};
+    unsigned long long key;
+    int fd, flags = 0;
+    Py_ssize_t nbytes;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "Kin|i:recv", kwlist,
+                                     &key, &fd, &nbytes, &flags))
+        return NULL;
+    return Ring_queue_read(self, IORING_OP_RECV, key, fd, nbytes, 0, flags);
+}
+
+PyDoc_STRVAR(
+    Ring_recv_into_doc,
+    "recv_into(key, fd, buf, flags=0) -> None\n\n"
+    "Queue the reception of data from the socket fd into buf.");
+
+static PyObject *
+Ring_recv_into(RingObject *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"key", "fd", "buf", "flags", NULL};
+    unsigned long long key;
+    int fd, flags = 0;
+    PyObject *buf;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "KiO|i:recv_into", kwlist,
+                                     &key, &fd, &buf, &flags))
+        return NULL;
+    return Ring_queue_buffer(self, IORING_OP_RECV, key, fd, buf, 1, 0, flags);
+}
+
+PyDoc_STRVAR(
+    Ring_send_doc,
+    "send(key, fd, buf, flags=0) -> None\n\n"
+    "Queue the sending of buf on the socket fd.  Like socket.send(),\n"
+    "the operation may send only part of the data.");
+
+static PyObject *
+Ring_send(RingObject *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"key", "fd", "buf", "flags", NULL};
+    unsigned long long key;
+    int fd, flags = 0;
+    PyObject *buf;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "KiO|i:send", kwlist,
+                                     &key, &fd, &buf, &flags))
+        return NULL;
+    return Ring_queue_buffer(self, IORING_OP_SEND, key, fd, buf, 0, 0, flags);
+}
+
+PyDoc_STRVAR(
+    Ring_read_doc,
+    "read(key, fd, nbytes, offset=-1) -> None\n\n"
+    "Queue the reading of up to nbytes bytes from the file descriptor fd\n"
+    "at offset, or at the current file position if offset is -1.\n"
+    "The data is returned by wait() as a bytes object.");
+
+static PyObject *
+Ring_read(RingObject *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"key", "fd", "nbytes", "offset", NULL};
+    unsigned long long key;
+    int fd;
+    Py_ssize_t nbytes;
+    long long offset = -1;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "Kin|L:read", kwlist,
+                                     &key, &fd, &nbytes, &offset))
+        return NULL;
+    return Ring_queue_read(self, IORING_OP_READ, key, fd, nbytes,
+                           (unsigned long long)offset, 0);
+}
+
+PyDoc_STRVAR(
+    Ring_readinto_doc,
+    "readinto(key, fd, buf, offset=-1) -> None\n\n"
+    "Queue the reading of data from the file descriptor fd into buf.");
+
+static PyObject *
+Ring_readinto(RingObject *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"key", "fd", "buf", "offset", NULL};
+    unsigned long long key;
+    int fd;
+    PyObject *buf;
+    long long offset = -1;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "KiO|L:readinto", kwlist,
+                                     &key, &fd, &buf, &offset))
+        return NULL;
+    return Ring_queue_buffer(self, IORING_OP_READ, key, fd, buf, 1,
+                             (unsigned long long)offset, 0);
+}
+
+PyDoc_STRVAR(
+    Ring_write_doc,
+    "write(key, fd, buf, offset=-1) -> None\n\n"
+    "Queue the writing of buf to the file descriptor fd at offset, or at\n"
+    "the current file position if offset is -1.");
+
+static PyObject *
+Ring_write(RingObject *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"key", "fd", "buf", "offset", NULL};
+    unsigned long long key;
+    int fd;
+    PyObject *buf;
+    long long offset = -1;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "KiO|L:write", kwlist,
+                                     &key, &fd, &buf, &offset))
+        return NULL;
+    return Ring_queue_buffer(self, IORING_OP_WRITE, key, fd, buf, 0,
+                             (unsigned long long)offset, 0);
+}
+
+PyDoc_STRVAR(
+    Ring_accept_doc,
+    "accept(key, fd, flags=SOCK_CLOEXEC) -> None\n\n"
+    "Queue the acceptance of a connection on the listening socket fd.\n"
+    "The result is the file descriptor of the new connection.");
+
+static PyObject *
+Ring_accept(RingObject *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"key", "fd", "flags", NULL};
+    unsigned long long key;
+    int fd, flags = SOCK_CLOEXEC;
+    struct io_uring_sqe *sqe;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "Ki|i:accept", kwlist,
+                                     &key, &fd, &flags))
+        return NULL;
+    sqe = Ring_get_sqe(self);
+    if (sqe == NULL)
+        return NULL;
+    sqe->opcode = IORING_OP_ACCEPT;
+    sqe->fd = fd;
+    sqe->accept_flags = flags;
+    return Ring_queue_sqe(self, sqe, key, TYPE_NONE, Py_None);
+}
+
+PyDoc_STRVAR(
+    Ring_poll_doc,
+    "poll(key, fd, events) -> None\n\n"
+    "Queue a one-shot wait for the poll events on fd.  The result is the\n"
+    "mask of the events which occurred.");
+
+static PyObject *
+Ring_poll(RingObject *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"key", "fd", "events", NULL};
+    unsigned long long key;
+    int fd;
+    unsigned int events;
+    struct io_uring_sqe *sqe;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "KiI:poll", kwlist,
+                                     &key, &fd, &events))
+        return NULL;
+    sqe = Ring_get_sqe(self);
+    if (sqe == NULL)
+        return NULL;
+    sqe->opcode = IORING_OP_POLL_ADD;
+    sqe->fd = fd;
+#if __BYTE_ORDER == __BIG_ENDIAN
+    events = __swahw32(events);
+#endif
+    sqe->poll32_events = events;
+    return Ring_queue_sqe(self, sqe, key, TYPE_NONE, Py_None);
+}
+
+PyDoc_STRVAR(
+    Ring_cancel_doc,
+    "cancel(key, target) -> None\n\n"
+    "Queue the cancellation of the pending operation with key target.\n"
+    "If it is cancelled, the target operation completes with -ECANCELED.");
+
+static PyObject *
+Ring_cancel(RingObject *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"key", "target", NULL};
+    unsigned long long key, target;
+    struct io_uring_sqe *sqe;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "KK:cancel", kwlist,
+                                     &key, &target))
+        return NULL;
+    sqe = Ring_get_sqe(self);
+    if (sqe == NULL)
+        return NULL;
+    sqe->opcode = IORING_OP_ASYNC_CANCEL;
+    sqe->fd = -1;
+    sqe->addr = target;
+    return Ring_queue_sqe(self, sqe, key, TYPE_NONE, Py_None);
+}
+
+PyDoc_STRVAR(
+    Ring_submit_doc,
+    "submit() -> None\n\n"
+    "Hand the queued operations to the kernel without waiting.");
+
+static PyObject *
+Ring_submit(RingObject *self, PyObject *Py_UNUSED(ignored))
+{
+    if (Ring_check_open(self) < 0 || Ring_submit_internal(self) < 0)
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+/* Convert a completion queue entry to a (key, res, data) tuple */
+static PyObject *
+Ring_completion(RingObject *self, struct io_uring_cqe *cqe)
+{
+    PyObject *keyobj, *entry, *buffer, *data, *res;
+    int type;
+
+    keyobj = PyLong_FromUnsignedLongLong(cqe->user_data);
+    if (keyobj == NULL)
+        return NULL;
+    entry = PyDict_GetItemWithError(self->pending, keyobj);
+    if (entry == NULL) {
+        Py_DECREF(keyobj);
+        if (PyErr_Occurred())
+            return NULL;
+        PyErr_Format(PyExc_RuntimeError,
+                     "completion for unknown key %llu", cqe->user_data);
+        return NULL;
+    }
+    Py_INCREF(entry);
+    type = (int)PyLong_AsLong(PyTuple_GET_ITEM(entry, 0));
+    buffer = PyTuple_GET_ITEM(entry, 1);
+
+    if (type == TYPE_READ && cqe->res >= 0) {
+        if (cqe->res == PyBytes_GET_SIZE(buffer)) {
+            data = buffer;
+            Py_INCREF(data);
+        }
+        else {
+            data = PyBytes_FromStringAndSize(PyBytes_AS_STRING(buffer),
+                                             cqe->res);
+        }
+    }
+    else {
+        data = Py_None;
+        Py_INCREF(data);
+    }
+    if (data == NULL)
+        res = NULL;
+    else
+        res = Py_BuildValue("(OiO)", keyobj, cqe->res, data);
+    Py_DECREF(entry);
+    Py_DECREF(keyobj);
+    Py_XDECREF(data);
+    return res;
+}
+
+PyDoc_STRVAR(
+    Ring_wait_doc,
+    "wait(timeout=None) -> list\n\n"
+    "Submit the queued operations and wait at most timeout seconds for\n"
+    "at least one of them to complete; None means wait forever.\n"
+    "Return a list of (key, res, data) tuples, where res is the result of\n"
+    "the operation (a negative errno value on failure) and data is the\n"
+    "bytes object filled by a recv() or read() operation, otherwise None.");
+
+static PyObject *
+Ring_wait(RingObject *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"timeout", NULL};
+    PyObject *timeout_obj = Py_None, *result, *item;
+    _PyTime_t timeout;
+    int ms = -1, ret, failed = 0;
+    unsigned int head, tail;
+    struct pollfd pfd;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O:wait", kwlist,
+                                     &timeout_obj))
+        return NULL;
+    if (timeout_obj != Py_None) {
+        if (_PyTime_FromSecondsObject(&timeout, timeout_obj,
+                                      _PyTime_ROUND_TIMEOUT) < 0)
+            return NULL;
+        ms = _PyTime_AsMilliseconds(timeout, _PyTime_ROUND_TIMEOUT);
+        if (ms < 0)
+            ms = 0;
+    }
+    if (Ring_check_open(self) < 0 || Ring_submit_internal(self) < 0)
+        return NULL;
+
+    head = *self->cq_head;
+    if (head == LOAD_ACQUIRE(self->cq_tail) && ms != 0) {
+        /* The ring fd becomes readable when completions are posted */
+        pfd.fd = self->fd;
+        pfd.events = POLLIN;
+        pfd.revents = 0;
+        Py_BEGIN_ALLOW_THREADS
+        ret = poll(&pfd, 1, ms);
+        Py_END_ALLOW_THREADS
+        if (ret < 0) {
+            if (errno != EINTR)
+                return PyErr_SetFromErrno(PyExc_OSError);
+            /* Return early, the caller checks for signals and waits again */
+            if (PyErr_CheckSignals())
+                return NULL;
+        }
+    }
+
+    result = PyList_New(0);
+    if (result == NULL)
+        return NULL;
+    tail = LOAD_ACQUIRE(self->cq_tail);
+    while (head != tail) {
+        item = Ring_completion(self, &self->cqes[head & self->cq_mask]);
+        if (item == NULL || PyList_Append(result, item) < 0) {
+            /* Leave the completion in the queue to retry it next time */
+            Py_XDECREF(item);
+            failed = 1;
+            break;
+        }
+        /* Only forget the operation once its completion is returned */
+        ret = PyDict_DelItem(self->pending, PyTuple_GET_ITEM(item, 0));
+        Py_DECREF(item);
+        head++;
+        if (ret < 0) {
+            failed = 1;
+            break;
+        }
+    }
+    STORE_RELEASE(self->cq_head, head);
+    if (failed) {
+        /* The completions converted so far have been consumed: return
+           them rather than losing them, and report the error once none
+           are left. */
+        if (PyList_GET_SIZE(result) == 0)
+            Py_CLEAR(result);
+        else
+            PyErr_Clear();
+    }
+    return result;
+}
+
+PyDoc_STRVAR(
+    Ring_fileno_doc,
+    "fileno() -> int\n\n"
+    "Return the file descriptor of the ring.");
+
+static PyObject *
+Ring_fileno(RingObject *self, PyObject *Py_UNUSED(ignored))
+{
+    if (Ring_check_open(self) < 0)
+        return NULL;
+    return PyLong_FromLong(self->fd);
+}
+
+PyDoc_STRVAR(
+    Ring_close_doc,
+    "close() -> None\n\n"
+    "Close the ring.  The buffers of pending operations are leaked.");
+
+static PyObject *
+Ring_close(RingObject *self, PyObject *Py_UNUSED(ignored))
+{
+    Py_ssize_t npending;
+
+    if (self->fd < 0)
+        Py_RETURN_NONE;
+    npending = Ring_close_internal(self);
+    if (npending) {
+        if (PyErr_WarnFormat(PyExc_RuntimeWarning, 1,
+                             "io_uring ring closed with %zd pending "
+                             "operations, their buffers are leaked",
+                             npending) < 0)
+            return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject*
+Ring_getclosed(RingObject *self, void *closure)
+{
+    return PyBool_FromLong(self->fd < 0);
+}
+
+static PyObject*
+Ring_getpending(RingObject *self, void *closure)
+{
+    if (self->pending == NULL)
+        return PyLong_FromLong(0);
+    return PyLong_FromSsize_t(PyDict_GET_SIZE(self->pending));
+}
+
+static PyMethodDef Ring_methods[] = {
+    {"recv", (PyCFunction) Ring_recv,
+     METH_VARARGS | METH_KEYWORDS, Ring_recv_doc},
+    {"recv_into", (PyCFunction) Ring_recv_into,
+     METH_VARARGS | METH_KEYWORDS, Ring_recv_into_doc},
+    {"send", (PyCFunction) Ring_send,
+     METH_VARARGS | METH_KEYWORDS, Ring_send_doc},
+    {"read", (PyCFunction) Ring_read,
+     METH_VARARGS | METH_KEYWORDS, Ring_read_doc},
+    {"readinto", (PyCFunction) Ring_readinto,
+     METH_VARARGS | METH_KEYWORDS, Ring_readinto_doc},
+    {"write", (PyCFunction) Ring_write,
+     METH_VARARGS | METH_KEYWORDS, Ring_write_doc},
+    {"accept", (PyCFunction) Ring_accept,
+     METH_VARARGS | METH_KEYWORDS, Ring_accept_doc},
+    {"poll", (PyCFunction) Ring_poll,
+     METH_VARARGS | METH_KEYWORDS, Ring_poll_doc},
+    {"cancel", (PyCFunction) Ring_cancel,
+     METH_VARARGS | METH_KEYWORDS, Ring_cancel_doc},
+    {"submit", (PyCFunction) Ring_submit,
+     METH_NOARGS, Ring_submit_doc},
+    {"wait", (PyCFunction) Ring_wait,
+     METH_VARARGS | METH_KEYWORDS, Ring_wait_doc},
+    {"fileno", (PyCFunction) Ring_fileno,
+     METH_NOARGS, Ring_fileno_doc},
+    {"close", (PyCFunction) Ring_close,
+     METH_NOARGS, Ring_close_doc},
+    {NULL}
+};
+
+static PyGetSetDef Ring_getsets[] = {
+    {"closed", (getter)Ring_getclosed, NULL,
+     "True if the ring is closed"},
+    {"pending", (getter)Ring_getpending, NULL,
+     "Number of operations which have not completed yet"},
+    {NULL},
+};
+
+PyDoc_STRVAR(
+    Ring_doc,
+    "Ring(entries=256)\n\n"
+    "io_uring instance with a submission queue of entries entries.");
+
+static PyTypeObject RingType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    /* tp_name           */ "_uring.Ring",
+    /* tp_basicsize      */ sizeof(RingObject),
+    /* tp_itemsize       */ 0,
+    /* tp_dealloc        */ (destructor) Ring_dealloc,
+    /* tp_print          */ 0,
+    /* tp_getattr        */ 0,
+    /* tp_setattr        */ 0,
+    /* tp_reserved       */ 0,
+    /* tp_repr           */ 0,
+    /* tp_as_number      */ 0,
+    /* tp_as_sequence    */ 0,
+    /* tp_as_mapping     */ 0,
+    /* tp_hash           */ 0,
+    /* tp_call           */ 0,
+    /* tp_str            */ 0,
+    /* tp_getattro       */ 0,
+    /* tp_setattro       */ 0,
+    /* tp_as_buffer      */ 0,
+    /* tp_flags          */ Py_TPFLAGS_DEFAULT,
+    /* tp_doc            */ Ring_doc,
+    /* tp_traverse       */ 0,
+    /* tp_clear          */ 0,
+    /* tp_richcompare    */ 0,
+    /* tp_weaklistoffset */ 0,
+    /* tp_iter           */ 0,
+    /* tp_iternext       */ 0,
+    /* tp_methods        */ Ring_methods,
+    /* tp_members        */ 0,
+    /* tp_getset         */ Ring_getsets,
+    /* tp_base           */ 0,
+    /* tp_dict           */ 0,
+    /* tp_descr_get      */ 0,
+    /* tp_descr_set      */ 0,
+    /* tp_dictoffset     */ 0,
+    /* tp_init           */ 0,
+    /* tp_alloc          */ 0,
+    /* tp_new            */ Ring_new,
+};
+
+static struct PyModuleDef uring_module = {
+    PyModuleDef_HEAD_INIT,
+    "_uring",
+    "Low-level interface to the Linux io_uring API.",
+    -1,
+    NULL,
+    NULL,
+    NULL,
+    NULL,
+    NULL
+};
+
+PyMODINIT_FUNC
+PyInit__uring(void)
+{
+    PyObject *m;
+
+    if (PyType_Ready(&RingType) < 0)
+        return NULL;
+
+    m = PyModule_Create(&uring_module);
+    if (m == NULL)
+        return NULL;
+    Py_INCREF(&RingType);
+    if (PyModule_AddObject(m, "Ring", (PyObject *)&RingType) < 0) {
+        Py_DECREF(m);
+        return NULL;
+    }
+    return m;
+}
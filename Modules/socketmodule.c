@@ -3442,6 +3442,135 @@ PyDoc_STRVAR(recvfrom_into_doc,
 \n\
 Like recv_into(buffer[, nbytes[, flags]]) but also return the sender's address info.");
 
+#ifdef HAVE_RECVMMSG
+struct sock_recvmmsg {
+    struct mmsghdr *msgvec;
+    unsigned int vlen;
+    int flags;
+    int result;
+};
+
+static int
+sock_recvmmsg_impl(PySocketSockObject *s, void *data)
+{
+    struct sock_recvmmsg *ctx = data;
+
+    ctx->result = recvmmsg(s->sock_fd, ctx->msgvec, ctx->vlen, ctx->flags,
+                           NULL);
+    return (ctx->result >= 0);
+}
+
+/* s.recvmmsg(count, buffersize[, flags]) method */
+
+static PyObject *
+sock_recvmmsg(PySocketSockObject *s, PyObject *args)
+{
+    int count, flags = 0;
+    Py_ssize_t bufsize;
+    socklen_t addrlen;
+    struct mmsghdr *msgvec = NULL;
+    struct iovec *iovs = NULL;
+    sock_addr_t *addrbufs = NULL;
+    char *buf = NULL;
+    PyObject *retval = NULL, *data, *addr, *item;
+    struct sock_recvmmsg ctx;
+    int i;
+
+    if (!PyArg_ParseTuple(args, "in|i:recvmmsg", &count, &bufsize, &flags))
+        return NULL;
+
+    if (count <= 0) {
+        PyErr_SetString(PyExc_ValueError,
+                        "recvmmsg() count must be positive");
+        return NULL;
+    }
+    if (bufsize < 0) {
+        PyErr_SetString(PyExc_ValueError,
+                        "negative buffersize in recvmmsg");
+        return NULL;
+    }
+    if (bufsize > PY_SSIZE_T_MAX / count) {
+        PyErr_SetString(PyExc_OverflowError,
+                        "recvmmsg() count * buffersize is too large");
+        return NULL;
+    }
+    if (!getsockaddrlen(s, &addrlen))
+        return NULL;
+    if (!IS_SELECTABLE(s))
+        return select_error();
+
+    /* The messages are received in a single buffer: only the messages
+       actually received are then copied to bytes objects. */
+    msgvec = PyMem_New(struct mmsghdr, count);
+    iovs = PyMem_New(struct iovec, count);
+    addrbufs = PyMem_New(sock_addr_t, count);
+    buf = PyMem_Malloc(count * bufsize + 1);
+    if (msgvec == NULL || iovs == NULL || addrbufs == NULL || buf == NULL) {
+        PyErr_NoMemory();
+        goto finally;
+    }
+    memset(msgvec, 0, count * sizeof(struct mmsghdr));
+    for (i = 0; i < count; i++) {
+        iovs[i].iov_base = buf + i * bufsize;
+        iovs[i].iov_len = bufsize;
+        memset(&addrbufs[i], 0, addrlen);
+        msgvec[i].msg_hdr.msg_name = SAS2SA(&addrbufs[i]);
+        msgvec[i].msg_hdr.msg_namelen = addrlen;
+        msgvec[i].msg_hdr.msg_iov = &iovs[i];
+        msgvec[i].msg_hdr.msg_iovlen = 1;
+    }
+
+    ctx.msgvec = msgvec;
+    ctx.vlen = (unsigned int)count;
+    /* Return as soon as one message was received, even on a blocking
+       socket, with the messages which are already queued. */
+    ctx.flags = flags | MSG_WAITFORONE;
+    if (sock_call(s, 0, sock_recvmmsg_impl, &ctx) < 0)
+        goto finally;
+
+    retval = PyList_New(ctx.result);
+    if (retval == NULL)
+        goto finally;
+    for (i = 0; i < ctx.result; i++) {
+        data = PyBytes_FromStringAndSize(iovs[i].iov_base,
+                                         msgvec[i].msg_len);
+        if (data == NULL)
+            goto error;
+        addr = makesockaddr(s->sock_fd, SAS2SA(&addrbufs[i]),
+                            msgvec[i].msg_hdr.msg_namelen, s->sock_proto);
+        if (addr == NULL) {
+            Py_DECREF(data);
+            goto error;
+        }
+        item = PyTuple_Pack(2, data, addr);
+        Py_DECREF(data);
+        Py_DECREF(addr);
+        if (item == NULL)
+            goto error;
+        PyList_SET_ITEM(retval, i, item);
+    }
+    goto finally;
+
+error:
+    Py_CLEAR(retval);
+finally:
+    PyMem_Free(buf);
+    PyMem_Free(addrbufs);
+    PyMem_Free(iovs);
+    PyMem_Free(msgvec);
+    return retval;
+}
+
+PyDoc_STRVAR(recvmmsg_doc,
+"recvmmsg(count, buffersize[, flags]) -> [(data, address info), ...]\n\
+\n\
+Receive up to count messages with a single system call.  Wait until at\n\
+least one message is available, like recvfrom(), then also return the\n\
+messages which are already queued, without blocking.  Each message is\n\
+truncated to buffersize bytes.  See recv() for documentation about the\n\
+flags.");
+#endif /* HAVE_RECVMMSG */
+
 /* The sendmsg() and recvmsg[_into]() methods require a working
    CMSG_LEN().  See the comment near get_CMSG_LEN(). */
 #ifdef CMSG_LEN
@@ -3996,6 +4125,129 @@ PyDoc_STRVAR(sendto_doc,
 Like send(data, flags) but allows specifying the destination address.\n\
 For IP sockets, the address is a pair (hostaddr, port).");
 
+#ifdef HAVE_SENDMMSG
+/* UIO_MAXIOV of the Linux kernel */
+#define SENDMMSG_MAX 1024
+
+struct sock_sendmmsg {
+    struct mmsghdr *msgvec;
+    unsigned int vlen;
+    int flags;
+    int result;
+};
+
+static int
+sock_sendmmsg_impl(PySocketSockObject *s, void *data)
+{
+    struct sock_sendmmsg *ctx = data;
+
+    ctx->result = sendmmsg(s->sock_fd, ctx->msgvec, ctx->vlen, ctx->flags);
+    return (ctx->result >= 0);
+}
+
+/* s.sendmmsg(messages[, flags]) method */
+
+static PyObject *
+sock_sendmmsg(PySocketSockObject *s, PyObject *args)
+{
+    PyObject *messages_arg, *messages_fast = NULL, *item, *addro;
+    int flags = 0, addrlen;
+    Py_ssize_t nmessages, i, nbufs = 0;
+    struct mmsghdr *msgvec = NULL;
+    struct iovec *iovs = NULL;
+    sock_addr_t *addrbufs = NULL;
+    Py_buffer *databufs = NULL;
+    PyObject *retval = NULL;
+    struct sock_sendmmsg ctx;
+
+    if (!PyArg_ParseTuple(args, "O|i:sendmmsg", &messages_arg, &flags))
+        return NULL;
+
+    messages_fast = PySequence_Fast(messages_arg,
+                                    "sendmmsg() argument 1 must be an "
+                                    "iterable");
+    if (messages_fast == NULL)
+        return NULL;
+    nmessages = PySequence_Fast_GET_SIZE(messages_fast);
+    if (nmessages == 0) {
+        Py_DECREF(messages_fast);
+        return PyLong_FromLong(0);
+    }
+    /* The kernel sends at most SENDMMSG_MAX messages per call */
+    if (nmessages > SENDMMSG_MAX)
+        nmessages = SENDMMSG_MAX;
+
+    if (!IS_SELECTABLE(s)) {
+        select_error();
+        goto finally;
+    }
+
+    msgvec = PyMem_New(struct mmsghdr, nmessages);
+    iovs = PyMem_New(struct iovec, nmessages);
+    addrbufs = PyMem_New(sock_addr_t, nmessages);
+    databufs = PyMem_New(Py_buffer, nmessages);
+    if (msgvec == NULL || iovs == NULL || addrbufs == NULL ||
+        databufs == NULL) {
+        PyErr_NoMemory();
+        goto finally;
+    }
+    memset(msgvec, 0, nmessages * sizeof(struct mmsghdr));
+
+    for (i = 0; i < nmessages; i++) {
+        item = PySequence_Fast_GET_ITEM(messages_fast, i);
+        if (!PyTuple_Check(item) || PyTuple_GET_SIZE(item) != 2) {
+            PyErr_SetString(PyExc_TypeError,
+                            "sendmmsg() messages must be "
+                            "(data, address) tuples");
+            goto finally;
+        }
+        if (PyObject_GetBuffer(PyTuple_GET_ITEM(item, 0), &databufs[i],
+                               PyBUF_SIMPLE) < 0)
+            goto finally;
+        nbufs++;
+        iovs[i].iov_base = databufs[i].buf;
+        iovs[i].iov_len = databufs[i].len;
+        msgvec[i].msg_hdr.msg_iov = &iovs[i];
+        msgvec[i].msg_hdr.msg_iovlen = 1;
+
+        addro = PyTuple_GET_ITEM(item, 1);
+        if (addro != Py_None) {
+            if (!getsockaddrarg(s, addro, SAS2SA(&addrbufs[i]), &addrlen))
+                goto finally;
+            msgvec[i].msg_hdr.msg_name = SAS2SA(&addrbufs[i]);
+            msgvec[i].msg_hdr.msg_namelen = addrlen;
+        }
+    }
+
+    ctx.msgvec = msgvec;
+    ctx.vlen = (unsigned int)nmessages;
+    ctx.flags = flags;
+    if (sock_call(s, 1, sock_sendmmsg_impl, &ctx) < 0)
+        goto finally;
+
+    retval = PyLong_FromLong(ctx.result);
+
+finally:
+    for (i = 0; i < nbufs; i++)
+        PyBuffer_Release(&databufs[i]);
+    PyMem_Free(databufs);
+    PyMem_Free(addrbufs);
+    PyMem_Free(iovs);
+    PyMem_Free(msgvec);
+    Py_DECREF(messages_fast);
+    return retval;
+}
+
+PyDoc_STRVAR(sendmmsg_doc,
+"sendmmsg(messages[, flags]) -> count\n\
+\n\
+Send several messages with a single system call.  messages is an\n\
+iterable of (data, address) tuples, where data is a bytes-like object\n\
+and address the destination address, or None for a connected socket.\n\
+Return the number of messages sent, which may be less than the number\n\
+of messages given.  See send() for documentation about the flags.");
+#endif /* HAVE_SENDMMSG */
+
 
 /* The sendmsg() and recvmsg[_into]() methods require a working
    CMSG_LEN().  See the comment near get_CMSG_LEN(). */
@@ -4586,12 +4838,20 @@ static PyMethodDef sock_methods[] = {
                       recvfrom_doc},
     {"recvfrom_into",  (PyCFunction)sock_recvfrom_into, METH_VARARGS | METH_KEYWORDS,
                       recvfrom_into_doc},
+#ifdef HAVE_RECVMMSG
+    {"recvmmsg",          (PyCFunction)sock_recvmmsg, METH_VARARGS,
+                      recvmmsg_doc},
+#endif
     {"send",              (PyCFunction)sock_send, METH_VARARGS,
                       send_doc},
     {"sendall",           (PyCFunction)sock_sendall, METH_VARARGS,
                       sendall_doc},
     {"sendto",            (PyCFunction)sock_sendto, METH_VARARGS,
                       sendto_doc},
+#ifdef HAVE_SENDMMSG
+    {"sendmmsg",          (PyCFunction)sock_sendmmsg, METH_VARARGS,
+                      sendmmsg_doc},
+#endif
     {"setblocking",       (PyCFunction)sock_setblocking, METH_O,
                       setblocking_doc},
     {"settimeout",    (PyCFunction)sock_settimeout, METH_O,
@@ -854,6 +854,20 @@ class PyBuildExt(build_ext):
         # POSIX subprocess module helper.
         exts.append( Extension('_posixsubprocess', ['_posixsubprocess.c']) )
 
+        # io_uring(7) support for asyncio, needs the Linux 5.7+ API.
+        uring_available = False
+        if host_platform.startswith('linux'):
+            for d in inc_dirs:
+                uring_h = os.path.join(d, 'linux', 'io_uring.h')
+                if os.path.exists(uring_h):
+                    with open(uring_h) as fp:
+                        uring_available = 'IORING_FEAT_FAST_POLL' in fp.read()
+                    break
+        if uring_available:
+            exts.append( Extension('_uring', ['_uringmodule.c']) )
+        else:
+            missing.append('_uring')
+
         # socket(2)
         exts.append( Extension('_socket', ['socketmodule.c'],
                                depends = ['socketmodule.h']) )
@@ -1654,6 +1668,13 @@ class PyBuildExt(build_ext):
         exts.append ( Extension('_multiprocessing', multiprocessing_srcs,
                                 define_macros=list(macros.items()),
                                 include_dirs=["Modules/_multiprocessing"]))
+
+        if (sysconfig.get_config_var('HAVE_SHM_OPEN') and
+            sysconfig.get_config_var('HAVE_SHM_UNLINK')):
+            exts.append ( Extension('_posixshmem',
+                                    ['_multiprocessing/posixshmem.c'],
+                                    libraries=libraries,
+                                    include_dirs=["Modules/_multiprocessing"]))
         # End multiprocessing
 
         # Platform-specific libraries